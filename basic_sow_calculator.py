@@ -1,70 +1,7 @@
 import streamlit as st
-import pandas as pd
 
-# -------------------------------
-# Sow Rotation Simulator
-# -------------------------------
-def sow_rotation_simulator(
-    total_sows=30,
-    piglets_per_cycle=8,
-    piglet_mortality=0.03,
-    abortion_rate=0.00,
-    sow_feed_price=32,
-    sow_feed_intake=2.8,
-    grower_feed_price=28,
-    fcr=3.1,
-    sale_price=130,
-    sow_cost=25000,
-    shed_cost=500000,
-    medicines_cost=5000,
-    simulation_months=12
-):
-    monthly_records = []
-    cumulative_cash_flow = 0
-
-    for month in range(1, simulation_months + 1):
-        # --- Breeding & Piglet production ---
-        sows_crossed = int(round(total_sows / 5.5))   # approx monthly cycles
-        piglets_born = sows_crossed * piglets_per_cycle
-        piglets_born_alive = int(round(piglets_born * (1 - abortion_rate)))
-        growers = int(round(piglets_born_alive * (1 - piglet_mortality)))
-        sold_pigs = int(round(growers * 0.9))  # assume 90% reach sale stage
-
-        # --- Economics ---
-        revenue = sold_pigs * 100 * sale_price   # assume 100 kg market weight
-        feed_cost_sow = total_sows * sow_feed_intake * 30 * sow_feed_price
-        feed_cost_grower = sold_pigs * fcr * 100 * grower_feed_price
-        other_costs = medicines_cost  # only medicines, no land/electricity
-        total_operating_cost = feed_cost_sow + feed_cost_grower + other_costs
-
-        monthly_profit = revenue - total_operating_cost
-        cumulative_cash_flow += monthly_profit
-
-        monthly_records.append({
-            "Month": month,
-            "Sows_Crossed": sows_crossed,
-            "Piglets_Born_Alive": piglets_born_alive,
-            "Growers": growers,
-            "Sold_Pigs": sold_pigs,
-            "Revenue": revenue,
-            "Total_Operating_Cost": total_operating_cost,
-            "Monthly_Profit": monthly_profit,
-            "Cumulative_Cash_Flow": cumulative_cash_flow
-        })
-
-    # Build DataFrames
-    df_month = pd.DataFrame(monthly_records)
-
-    df_year = pd.DataFrame([{
-        "Total_Crossings": df_month["Sows_Crossed"].sum(),
-        "Piglets_Born_Alive": df_month["Piglets_Born_Alive"].sum(),
-        "Sold_Pigs": df_month["Sold_Pigs"].sum(),
-        "Revenue": df_month["Revenue"].sum(),
-        "Total_Operating_Cost": df_month["Total_Operating_Cost"].sum(),
-        "Profit": df_month["Monthly_Profit"].sum()   # plain profit, no dep
-    }])
-
-    return df_month, df_year
+from sow_engine.basic import sow_rotation_simulator
+from sow_engine.frames import display_frame
 
 # -------------------------------
 # Streamlit UI
@@ -118,7 +55,7 @@ cols_to_show = [
     'Monthly_Profit',
     'Cumulative_Cash_Flow'
 ]
-st.dataframe(df_month[[c for c in cols_to_show if c in df_month.columns]])
+st.dataframe(display_frame(df_month[[c for c in cols_to_show if c in df_month.columns]]))
 
 # --- Yearly Summary ---
 st.subheader("Yearly Summary")
@@ -130,4 +67,4 @@ cols_to_show_year = [
     'Total_Operating_Cost',
     'Profit'
 ]
-st.dataframe(df_year[[c for c in cols_to_show_year if c in df_year.columns]])
+st.dataframe(display_frame(df_year[[c for c in cols_to_show_year if c in df_year.columns]]))
@@ -0,0 +1,193 @@
+# -------------------------------
+# Benchmark suite for the sow rotation simulators
+# -------------------------------
+"""Time and memory-profile every simulator variant over a months x total_sows grid.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_simulators --out bench.json
+    python -m benchmarks.bench_simulators --quick --compare bench.json
+
+Each case is timed with ``time.perf_counter`` (repeated until ``--min-time``
+is reached) and then run once more under ``tracemalloc`` for the peak Python
+allocation. Once a variant takes longer than ``--max-seconds`` for some horizon,
+longer horizons of that variant are recorded as skipped instead of run. Results
+are written as JSON, and ``--compare`` prints the ratio against an earlier file.
+"""
+
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from sow_engine import basic, bimonthly, cohort, monthly, monthly_kpi
+
+MONTHS_GRID = [12, 60, 120, 600, 1200]
+SOWS_GRID = [10, 100, 1_000, 10_000, 100_000]
+QUICK_MONTHS_GRID = [12, 120]
+QUICK_SOWS_GRID = [30, 10_000]
+
+
+def _variant_calls():
+    return {
+        'basic': lambda months, sows: basic.sow_rotation_simulator(total_sows=sows, simulation_months=months),
+        'bimonthly': lambda months, sows: bimonthly.sow_rotation_simulator(total_sows=sows, months=months),
+        'monthly': lambda months, sows: monthly.sow_rotation_simulator(total_sows=sows, months=months),
+        'monthly_kpi': lambda months, sows: monthly_kpi.sow_rotation_simulator(total_sows=sows, months=months),
+        'cohort': lambda months, sows: cohort.sow_rotation_simulator(total_sows=sows, months=months),
+    }
+
+
+def _post_processing_calls(months, sows):
+    """Stages of ``sowcalcmonthly_withgraphs.py`` timed on their own, fed from one real run."""
+    df_month = monthly_kpi.sow_rotation_simulator(total_sows=sows, months=months)[0]
+    columns = {name: df_month[name].to_numpy() for name in monthly_kpi.MONTHLY_COLUMNS}
+    initial_investment = 1_500_000 + 35_000 * sows
+    first_sale_cash_needed = 1_000_000
+    return {
+        'frame_build': lambda: monthly_kpi.monthly_frames(columns),
+        'kpi_post_processing': lambda: monthly_kpi.cash_flow_kpis(
+            df_month.copy(), initial_investment, first_sale_cash_needed, months),
+    }
+
+
+def _time_call(fn, min_time, max_repeats):
+    timings = []
+    start = time.perf_counter()
+    while True:
+        t0 = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - t0)
+        if len(timings) >= max_repeats or time.perf_counter() - start >= min_time:
+            break
+    return timings
+
+
+def _peak_memory(fn):
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def run_case(benchmark, variant, months, sows, fn, args):
+    timings = _time_call(fn, args.min_time, args.max_repeats)
+    result = {
+        'benchmark': benchmark,
+        'variant': variant,
+        'months': months,
+        'total_sows': sows,
+        'status': 'ok',
+        'repeats': len(timings),
+        'min_s': min(timings),
+        'median_s': statistics.median(timings),
+        'peak_mem_bytes': None if args.no_memory else _peak_memory(fn),
+    }
+    print(f"{benchmark:>20} {variant:>20} months={months:>5} sows={sows:>7} "
+          f"median={result['median_s'] * 1e3:10.2f} ms", file=sys.stderr)
+    return result
+
+
+def run_suite(args):
+    months_grid = QUICK_MONTHS_GRID if args.quick else args.months
+    sows_grid = QUICK_SOWS_GRID if args.quick else args.sows
+    variants = _variant_calls()
+    selected = args.variants or list(variants)
+    results = []
+
+    for variant in selected:
+        too_slow_from = None
+        for months in sorted(months_grid):
+            for sows in sows_grid:
+                if too_slow_from is not None:
+                    results.append({'benchmark': 'simulator', 'variant': variant, 'months': months,
+                                    'total_sows': sows, 'status': f'skipped (> {args.max_seconds}s at {too_slow_from} months)'})
+                    continue
+                fn = lambda months=months, sows=sows: variants[variant](months, sows)
+                result = run_case('simulator', variant, months, sows, fn, args)
+                results.append(result)
+                if result['median_s'] > args.max_seconds:
+                    too_slow_from = months
+
+    if not args.variants or 'monthly_kpi' in args.variants:
+        for months in sorted(months_grid):
+            for sows in sows_grid:
+                for stage, fn in _post_processing_calls(months, sows).items():
+                    results.append(run_case('post_processing', stage, months, sows, fn, args))
+    return results
+
+
+def _metadata():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'git_commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+    }
+
+
+def compare(results, baseline_path, threshold):
+    """Print current/baseline median ratios; return the number of regressions."""
+    with open(baseline_path) as f:
+        baseline = {(r['benchmark'], r['variant'], r['months'], r['total_sows']): r
+                    for r in json.load(f)['results'] if r['status'] == 'ok'}
+    regressions = 0
+    for r in results:
+        old = baseline.get((r['benchmark'], r['variant'], r['months'], r['total_sows']))
+        if r['status'] != 'ok' or old is None:
+            continue
+        ratio = r['median_s'] / old['median_s']
+        flag = 'REGRESSION' if ratio > threshold else ''
+        regressions += bool(flag)
+        print(f"{r['benchmark']:>20} {r['variant']:>20} months={r['months']:>5} sows={r['total_sows']:>7} "
+              f"{ratio:6.2f}x {flag}", file=sys.stderr)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--out', help='write results JSON to this path (default: stdout)')
+    parser.add_argument('--compare', help='baseline results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=1.2, help='ratio flagged as a regression')
+    parser.add_argument('--variants', nargs='+', choices=list(_variant_calls()))
+    parser.add_argument('--months', nargs='+', type=int, default=MONTHS_GRID)
+    parser.add_argument('--sows', nargs='+', type=int, default=SOWS_GRID)
+    parser.add_argument('--quick', action='store_true', help='small grid for a smoke run')
+    parser.add_argument('--min-time', type=float, default=0.2, help='seconds of repeats per case')
+    parser.add_argument('--max-repeats', type=int, default=20)
+    parser.add_argument('--max-seconds', type=float, default=5.0,
+                        help='skip longer horizons of a variant once one call takes longer than this')
+    parser.add_argument('--no-memory', action='store_true', help='skip the tracemalloc pass')
+    args = parser.parse_args(argv)
+
+    results = run_suite(args)
+    payload = json.dumps({'metadata': _metadata(), 'results': results}, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(payload + '\n')
+    else:
+        print(payload)
+
+    if args.compare:
+        return 1 if compare(results, args.compare, args.threshold) else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,174 @@
+# -------------------------------
+# Load test for the HTTP simulation service
+# -------------------------------
+"""Measure latency percentiles and throughput of the simulation service.
+
+Run from the repository root:
+
+    python -m benchmarks.load_service --requests 2000 --concurrency 32 --distinct 50
+    python -m benchmarks.load_service --url http://127.0.0.1:8765 --out load.json
+
+Without ``--url`` a service is started on a free port (``--workers`` processes,
+stopped afterwards). ``--concurrency`` keep-alive connections then send
+``--requests`` ``POST /simulate`` requests between them, drawn at random from
+``--distinct`` parameter sets (a sale price and FCR sweep), so a small
+``--distinct`` exercises the cache and request coalescing and
+``--distinct`` >= ``--requests`` measures cold simulations. Latency is from
+sending a request to reading its whole response.
+"""
+
+import argparse
+import asyncio
+import datetime
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import urllib.parse
+
+
+def scenario_bodies(distinct, months, columns, seed=0):
+    rng = random.Random(seed)
+    bodies = []
+    for i in range(distinct):
+        params = {'sale_price': 150 + i % 60, 'fcr': round(2.8 + 0.1 * (i // 60 % 5), 2),
+                  'total_sows': rng.choice([20, 30, 60, 120])}
+        request = {'params': params, 'months': months}
+        if columns is not None:
+            request['columns'] = columns
+        bodies.append(json.dumps(request).encode())
+    return bodies
+
+
+async def _request(reader, writer, host, path, body=None):
+    method = 'POST' if body is not None else 'GET'
+    body = body or b''
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: {host}\r\nContent-Type: application/json\r\n"
+                 f"Content-Length: {len(body)}\r\n\r\n".encode() + body)
+    await writer.drain()
+    head = await reader.readuntil(b'\r\n\r\n')
+    lines = head.decode('latin-1').split('\r\n')
+    status = int(lines[0].split(' ', 2)[1])
+    length = next(int(line.split(':', 1)[1]) for line in lines[1:] if line.lower().startswith('content-length:'))
+    return status, await reader.readexactly(length)
+
+
+async def _client(host, port, bodies, remaining, latencies, statuses):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        while remaining:
+            body = bodies[remaining.pop()]
+            t0 = time.perf_counter()
+            status, _ = await _request(reader, writer, host, '/simulate', body)
+            latencies.append(time.perf_counter() - t0)
+            statuses[status] = statuses.get(status, 0) + 1
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+async def _get_json(host, port, path):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        status, body = await _request(reader, writer, host, path)
+        return json.loads(body)
+    finally:
+        writer.close()
+        await writer.wait_closed()
+
+
+def _percentile(sorted_values, pct):
+    index = min(int(round(pct / 100 * (len(sorted_values) - 1))), len(sorted_values) - 1)
+    return sorted_values[index]
+
+
+async def run_load(url, requests, concurrency, bodies, seed=0):
+    target = urllib.parse.urlsplit(url)
+    host, port = target.hostname, target.port
+    rng = random.Random(seed)
+    remaining = [rng.randrange(len(bodies)) for _ in range(requests)]
+    latencies, statuses = [], {}
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_client(host, port, bodies, remaining, latencies, statuses)
+                           for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'concurrency': concurrency,
+        'distinct': len(bodies),
+        'statuses': {str(k): v for k, v in sorted(statuses.items())},
+        'elapsed_s': elapsed,
+        'throughput_rps': len(latencies) / elapsed,
+        'p50_ms': _percentile(latencies, 50) * 1e3,
+        'p90_ms': _percentile(latencies, 90) * 1e3,
+        'p99_ms': _percentile(latencies, 99) * 1e3,
+        'max_ms': latencies[-1] * 1e3,
+        'mean_ms': statistics.fmean(latencies) * 1e3,
+        'service': await _get_json(host, port, '/stats'),
+    }
+
+
+def _start_service(workers, cache_size):
+    command = [sys.executable, '-m', 'sow_engine.service', '--port', '0', '--cache-size', str(cache_size)]
+    if workers:
+        command += ['--workers', str(workers)]
+    proc = subprocess.Popen(command, stderr=subprocess.PIPE, text=True)
+    line = proc.stderr.readline()
+    if not line.startswith('listening on '):
+        proc.kill()
+        raise RuntimeError(f"service did not start: {line}{proc.stderr.read()}")
+    return proc, line.split()[-1]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', help='running service to test (default: start one)')
+    parser.add_argument('--workers', type=int, help='worker processes of a started service')
+    parser.add_argument('--cache-size', type=int, default=256, help='cache size of a started service')
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=32, help='open connections')
+    parser.add_argument('--distinct', type=int, default=50, help='distinct parameter sets requested')
+    parser.add_argument('--months', type=int, default=60)
+    parser.add_argument('--columns', nargs='*', help='monthly columns per response (default: all)')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--out', help='write results JSON to this path (default: stdout)')
+    args = parser.parse_args(argv)
+
+    proc = None
+    url = args.url
+    if url is None:
+        proc, url = _start_service(args.workers, args.cache_size)
+    try:
+        bodies = scenario_bodies(args.distinct, args.months, args.columns, args.seed)
+        result = asyncio.run(run_load(url, args.requests, args.concurrency, bodies, args.seed))
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    print(f"{result['requests']} requests in {result['elapsed_s']:.2f}s: {result['throughput_rps']:,.0f} req/s, "
+          f"p50 {result['p50_ms']:.1f} ms, p99 {result['p99_ms']:.1f} ms, "
+          f"computed {result['service']['computed']}, coalesced {result['service']['coalesced']}",
+          file=sys.stderr)
+    payload = json.dumps({'metadata': {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'url': url,
+    }, 'results': result}, indent=2)
+    if args.out:
+        with open(args.out, 'w') as f:
+            f.write(payload + '\n')
+    else:
+        print(payload)
+    return 0 if set(result['statuses']) == {'200'} else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,213 +1,10 @@
 import streamlit as st
 import pandas as pd
 
-# -------------------------------
-# Sow Rotation Simulator with realistic monthly sales
-# -------------------------------
-def sow_rotation_simulator(
-    total_sows=30,
-    piglets_per_cycle=10,
-    piglet_mortality=0.07,
-    abortion_rate=0.0,
-    sow_feed_price=30,
-    sow_feed_intake=2.8,
-    grower_feed_price=30,
-    fcr=3.1,
-    final_weight=105,
-    sale_price=180,
-    management_fee=0,
-    management_commission=0.0,
-    supervisor_salary=25000,
-    worker_salary=18000,
-    n_workers=2,
-    shed_cost=1_500_000,
-    shed_life_years=10,
-    sow_cost=35000,
-    sow_life_years=4,
-    loan_amount=0,
-    interest_rate=0.1,
-    loan_tenure_years=5,
-    moratorium_months=0,
-    medicine_cost=10000,
-    electricity_cost=5000,
-    land_lease=10000,
-    months=60
-):
-    current_sows = total_sows
-    monthly_data = []
-
-    shed_dep_rate = 1 / (shed_life_years * 12)
-    sow_dep_rate = 1 / (sow_life_years * 12)
-
-    total_months = loan_tenure_years * 12
-    monthly_rate = interest_rate / 12
-    emi = 0
-    if loan_amount > 0 and total_months > 0:
-        emi = loan_amount * monthly_rate * (1 + monthly_rate)**total_months / ((1 + monthly_rate)**total_months - 1)
-    loan_balance = loan_amount
-
-    average_cycle_length = 3.8 + 1.3 + 0.33
-    sows_to_mate_per_month = total_sows / average_cycle_length
-
-    batches = []
-    ready_for_sale_batches = []
-    total_sow_cost = sow_cost * total_sows
-    total_capital_invested = shed_cost + total_sow_cost
-    cumulative_cash_flow = -total_capital_invested
-    total_pigs_born = 0
-    total_pigs_sold = 0
-
-    first_sale_cash_needed = 0
-    first_sale_done = False
-
-    for month in range(1, months + 1):
-        sow_feed_cost = current_sows * sow_feed_intake * 30 * sow_feed_price
-        staff_cost = supervisor_salary + n_workers * worker_salary
-        mgmt_fixed = management_fee
-
-        sows_crossed = 0
-        if month >= 2:
-            sows_to_mate = sows_to_mate_per_month
-            sows_pregnant = sows_to_mate * (1 - abortion_rate)
-            sows_crossed = sows_to_mate  # track how many sows were crossed this month
-            if sows_pregnant > 0:
-                farrow_month = month + 4
-                wean_month = farrow_month + 1
-                grower_start_month = wean_month
-                grower_end_month = grower_start_month + 6
-                piglets = sows_pregnant * piglets_per_cycle * (1 - piglet_mortality)
-                total_pigs_born += piglets
-                batches.append({
-                    'batch_id': len(batches) + 1,
-                    'farrow_month': farrow_month,
-                    'wean_month': wean_month,
-                    'grower_start_month': grower_start_month,
-                    'grower_end_month': grower_end_month,
-                    'piglets': piglets,
-                    'grower_feed_per_month': (piglets * fcr * final_weight) / 6,
-                    'sold': False
-                })
-      
-
-        # Count piglets in lactation
-        piglets_with_sow = sum(batch['piglets'] for batch in batches if batch['farrow_month'] <= month < batch['wean_month'])
-        # Count growers
-        current_growers = sum(batch['piglets'] for batch in batches if batch['grower_start_month'] <= month < batch['grower_end_month'])
-        # Calculate grower feed
-        grower_feed_cost = sum(batch['grower_feed_per_month'] * grower_feed_price for batch in batches if batch['grower_start_month'] <= month < batch['grower_end_month'])
-
-        # Identify batches ready for sale
-        for batch in batches:
-            if batch['grower_end_month'] <= month and not batch['sold'] and batch not in ready_for_sale_batches:
-                ready_for_sale_batches.append(batch)
-
-        sold_pigs = 0
-        revenue = 0
-        # Monthly sale logic (sell all ready batches)
-        if ready_for_sale_batches:
-            pigs_sold_this_month = 0
-            batches_sold_ids = []
-            for batch in ready_for_sale_batches:
-                pigs_sold_batch = batch['piglets']
-                pigs_sold_this_month += pigs_sold_batch
-                batch['sold'] = True
-                batches_sold_ids.append(batch['batch_id'])
-            revenue += pigs_sold_this_month * final_weight * sale_price
-            sold_pigs = pigs_sold_this_month
-            total_pigs_sold += sold_pigs
-            current_growers -= sold_pigs
-
-            # Remove sold batches from ready list
-            ready_for_sale_batches = [b for b in ready_for_sale_batches if b['batch_id'] not in batches_sold_ids]
-
-        # Track first sale working capital
-        if not first_sale_done:
-            first_sale_cash_needed += sow_feed_cost + grower_feed_cost + staff_cost + mgmt_fixed + medicine_cost + electricity_cost + land_lease
-        if sold_pigs > 0 and not first_sale_done:
-            first_sale_done = True
-
-        mgmt_comm_cost = revenue * management_commission
-        other_fixed = medicine_cost + electricity_cost + land_lease
-        total_operating_cost = sow_feed_cost + grower_feed_cost + staff_cost + mgmt_fixed + mgmt_comm_cost + other_fixed
-        dep = shed_cost * shed_dep_rate + total_sow_cost * sow_dep_rate
-
-        if month <= moratorium_months:
-            loan_payment = loan_balance * monthly_rate
-        elif month <= total_months:
-            interest = loan_balance * monthly_rate
-            principal = emi - interest
-            loan_balance -= principal
-            loan_payment = emi
-        else:
-            loan_payment = 0
-
-        monthly_profit = revenue - total_operating_cost - dep - loan_payment
-        monthly_cash_flow = revenue - total_operating_cost - loan_payment
-        cumulative_cash_flow += monthly_cash_flow
-
-        monthly_data.append({
-            'Month': month,
-            'Sows_Crossed': round(sows_crossed),
-            'Piglets_Born_Alive': piglets_with_sow,
-            'Growers': current_growers,
-            'Sold_Pigs': sold_pigs,
-            'Sow_Feed_Cost': round(sow_feed_cost),
-            'Grower_Feed_Cost': round(grower_feed_cost),
-            'Staff_Cost': round(staff_cost),
-            'Other_Fixed_Costs': round(other_fixed),
-            'Mgmt_Fee': round(mgmt_fixed),
-            'Mgmt_Comm': round(mgmt_comm_cost),
-            'Total_Operating_Cost': round(total_operating_cost),
-            'Revenue': round(revenue),
-            'Loan_EMI': round(loan_payment),
-            'Depreciation': round(dep),
-            'Monthly_Cash_Flow': round(monthly_cash_flow),
-            'Monthly_Profit': round(monthly_profit),
-            'Cumulative_Cash_Flow': round(cumulative_cash_flow)
-        })
-
-    df_month = pd.DataFrame(monthly_data)
-
-    # Yearly summary
-    df_year = df_month.groupby(((df_month['Month']-1)//12)*12).sum()
-    df_year.index = [f"Year {i+1}" for i in range(len(df_year))]
-
-    df_year['Cash_Profit'] = df_year['Revenue'] - df_year['Total_Operating_Cost']
-    df_year['Profit_After_Dep_Loan'] = df_year['Cash_Profit'] - df_year['Depreciation'] - df_year['Loan_EMI']
-
-    df_year['Total_Crossings'] = df_month.groupby(((df_month['Month']-1)//12)*12)['Sows_Crossed'].sum().values
-
-    # Total animals left in shed
-    animals_left = sum(batch['piglets'] for batch in batches if not batch['sold'] and batch['grower_end_month'] > months)
-    total_interest_paid = 0
-
-    loan_balance = loan_amount
-    total_interest_paid = 0
-    
-    for month in range(1, months + 1):
-        monthly_interest = loan_balance * monthly_rate
-    
-        if month <= moratorium_months:
-            # Interest accrues but no EMI paid
-            loan_balance += monthly_interest  # capitalize interest
-            loan_payment = 0
-        elif month <= total_months:
-            # EMI payment starts
-            principal = emi - monthly_interest
-            loan_balance -= principal
-            loan_payment = emi
-        else:
-            loan_payment = 0
-            monthly_interest = 0
-    
-        total_interest_paid += monthly_interest
-        
-    return df_month, df_year, total_sow_cost, shed_cost, first_sale_cash_needed, total_pigs_sold, total_pigs_born, animals_left, cumulative_cash_flow, total_interest_paid
-
-import streamlit as st
-import pandas as pd
-
-# (keep your sow_rotation_simulator function as-is above...)
+from sow_engine import cohort
+from sow_engine.frames import display_frame
+from sow_engine.monthly import sow_rotation_simulator
+from sow_engine.sales import Capacity, EveryNMonths, MinimumLot, PriceTriggered, TargetWeight, seasonal_price_index
 
 # -------------------------------
 # Streamlit UI
@@ -260,16 +57,58 @@ land_lease = st.sidebar.slider("Land Lease (Monthly)", 0, 100_000, 10_000, 1000)
 # Simulation Duration
 months = st.sidebar.slider("Simulation Duration (Months)", 12, 120, 60, 12)
 
+# Sale Policy
+st.sidebar.subheader("Sale Policy")
+sale_policy_label = st.sidebar.selectbox("When to Sell", [
+    "All ready pigs every month",
+    "Every N months",
+    "At a target weight",
+    "Minimum lot size",
+    "Pen capacity",
+    "When the price peaks",
+])
+if sale_policy_label != "All ready pigs every month":
+    # Held pigs gain weight (and eat grower feed) up to 130 kg; off by default so
+    # timing policies are not credited with extra kilos
+    held_growth = st.sidebar.slider("Growth While Held (kg/day)", 0.0, 1.0,
+                                    0.7 if sale_policy_label == "At a target weight" else 0.0, 0.05)
+if sale_policy_label == "Every N months":
+    sale_every = st.sidebar.slider("Sell Every (Months)", 1, 6, 2, 1)
+    sale_first_month = st.sidebar.slider("First Sale Month", 1, 24, 13, 1)
+    sale_policy = EveryNMonths(sale_every, sale_first_month, growth_kg_per_day=held_growth)
+elif sale_policy_label == "At a target weight":
+    target_kg = st.sidebar.slider("Target Weight (kg)", 80, 200, max(final_weight, 110), 5)
+    sale_policy = TargetWeight(target_kg, growth_kg_per_day=held_growth)
+elif sale_policy_label == "Minimum lot size":
+    lot_size = st.sidebar.slider("Minimum Lot (Pigs)", 10, 500, 50, 10)
+    sale_policy = MinimumLot(lot_size, growth_kg_per_day=held_growth)
+elif sale_policy_label == "Pen capacity":
+    pen_capacity = st.sidebar.slider("Grower Pen Capacity (Pigs)", 50, 5000, 400, 50)
+    sale_policy = Capacity(pen_capacity, growth_kg_per_day=held_growth)
+elif sale_policy_label == "When the price peaks":
+    price_swing_pct = st.sidebar.slider("Seasonal Price Swing (±%)", 0, 30, 10, 1)
+    price_peak_month = st.sidebar.slider("Price Peak (Month of Year)", 1, 12, 12, 1)
+    sale_threshold_pct = st.sidebar.slider("Sell When Price Is Above Average By (%)", 0, 30, 5, 1)
+    sale_policy = PriceTriggered(1 + sale_threshold_pct / 100,
+                                 seasonal_price_index(months, price_swing_pct / 100, price_peak_month),
+                                 growth_kg_per_day=held_growth)
+else:
+    sale_policy = None
+
 # -------------------------------
 # Run Simulator
 # -------------------------------
-df_month, df_year, total_sow_cost, shed_cost_val, first_sale_wc, total_pigs_sold, total_pigs_born, animals_left, cumulative_cash_flow, total_interest_paid = sow_rotation_simulator(
+# Other sale policies run on the cohort engine, which applies them as array masks
+simulator = sow_rotation_simulator if sale_policy is None else cohort.sow_rotation_simulator
+policy_args = {} if sale_policy is None else {"sale_policy": sale_policy}
+df_month, df_year, total_sow_cost, shed_cost_val, first_sale_wc, total_pigs_sold, total_pigs_born, animals_left, cumulative_cash_flow, total_interest_paid = simulator(
     total_sows, piglets_per_cycle, piglet_mortality, abortion_rate,
     sow_feed_price, sow_feed_intake, grower_feed_price, fcr,
     final_weight, sale_price, management_fee, management_commission,
     supervisor_salary, worker_salary, n_workers, shed_cost, shed_life_years,
     sow_cost, sow_life_years, loan_amount, interest_rate, loan_tenure_years,
-    moratorium_months, medicine_cost, electricity_cost, land_lease, months
+    moratorium_months, medicine_cost, electricity_cost, land_lease, months,
+    **policy_args
 )
 
 # (keep your display/financial summary code unchanged below…)
@@ -317,10 +156,10 @@ for year in df_year.index:
 # Display Monthly & Yearly Summaries
 # -------------------------------
 st.subheader("Monthly Summary")
-st.dataframe(df_month.drop(columns=['Month']))
+st.dataframe(display_frame(df_month.drop(columns=['Month'])))
 
 st.subheader("Yearly Summary")
-st.dataframe(df_year)
+st.dataframe(display_frame(df_year))
 
 # -------------------------------
 # Financial Summary at the end
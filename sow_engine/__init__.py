@@ -0,0 +1,45 @@
+"""Simulation engine for the House of Supreme Ham sow calculators.
+
+The engine never imports Streamlit or Altair, and submodules (with numpy and
+pandas behind them) are only loaded when one of the names below is first used,
+so ``import sow_engine`` stays cheap in batch workers. The Streamlit apps are
+thin clients of these modules:
+
+* ``sow_engine.basic``        - ``basic_sow_calculator.py``
+* ``sow_engine.bimonthly``    - ``Hosh_Sow_rotation_simulator_streamlit.py``
+* ``sow_engine.monthly``      - ``hosh_sow_calculator_monthly.py``
+* ``sow_engine.monthly_kpi``  - ``sowcalcmonthly_withgraphs.py``
+* ``sow_engine.cohort``       - vectorized equivalent of ``monthly``
+* ``sow_engine.timestep``     - ``cohort`` in weekly or daily steps, rolled up to months
+* ``sow_engine.parity``       - ``cohort`` with a parity-structured herd (culling, replacement)
+
+``python -m sow_engine`` runs a CSV/Parquet file of scenarios from the command
+line (``sow_engine.runner``) and ``python -m sow_engine.service`` serves
+simulations over local HTTP.
+"""
+
+import importlib
+
+_EXPORTS = {
+    'sow_rotation_simulator': 'cohort',
+    'simulate_arrays': 'cohort',
+    'parameter_grid': 'batch',
+    'simulate_batch': 'batch',
+    'monte_carlo': 'montecarlo',
+    'simulate_portfolio': 'portfolio',
+    'ResultStore': 'store',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        value = getattr(importlib.import_module(f'.{_EXPORTS[name]}', __name__), name)
+        globals()[name] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
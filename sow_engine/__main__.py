@@ -0,0 +1,7 @@
+"""``python -m sow_engine`` runs the command-line batch runner (see ``sow_engine.runner``)."""
+
+import sys
+
+from .runner import main
+
+sys.exit(main())
@@ -0,0 +1,71 @@
+"""Basic steady-state sow calculator (from ``basic_sow_calculator.py``).
+
+Every month crosses a fixed share of the herd and sells 90% of the surviving
+growers the same month; there is no gestation or growing delay.
+"""
+
+import numpy as np
+
+# -------------------------------
+# Sow Rotation Simulator
+# -------------------------------
+def sow_rotation_simulator(
+    total_sows=30,
+    piglets_per_cycle=8,
+    piglet_mortality=0.03,
+    abortion_rate=0.00,
+    sow_feed_price=32,
+    sow_feed_intake=2.8,
+    grower_feed_price=28,
+    fcr=3.1,
+    sale_price=130,
+    sow_cost=25000,
+    shed_cost=500000,
+    medicines_cost=5000,
+    simulation_months=12
+):
+    import pandas as pd
+
+    # --- Breeding & Piglet production ---
+    sows_crossed = int(round(total_sows / 5.5))   # approx monthly cycles
+    piglets_born = sows_crossed * piglets_per_cycle
+    piglets_born_alive = int(round(piglets_born * (1 - abortion_rate)))
+    growers = int(round(piglets_born_alive * (1 - piglet_mortality)))
+    sold_pigs = int(round(growers * 0.9))  # assume 90% reach sale stage
+
+    # --- Economics ---
+    revenue = sold_pigs * 100 * sale_price   # assume 100 kg market weight
+    feed_cost_sow = total_sows * sow_feed_intake * 30 * sow_feed_price
+    feed_cost_grower = sold_pigs * fcr * 100 * grower_feed_price
+    other_costs = medicines_cost  # only medicines, no land/electricity
+    total_operating_cost = feed_cost_sow + feed_cost_grower + other_costs
+
+    monthly_profit = revenue - total_operating_cost
+
+    # Every month is the same steady state, so the columns are built whole
+    n = simulation_months
+    monthly_columns = {
+        "Month": np.arange(1, n + 1),
+        "Sows_Crossed": np.full(n, sows_crossed),
+        "Piglets_Born_Alive": np.full(n, piglets_born_alive),
+        "Growers": np.full(n, growers),
+        "Sold_Pigs": np.full(n, sold_pigs),
+        "Revenue": np.full(n, revenue),
+        "Total_Operating_Cost": np.full(n, total_operating_cost),
+        "Monthly_Profit": np.full(n, monthly_profit),
+        "Cumulative_Cash_Flow": np.cumsum(np.full(n, monthly_profit)),
+    }
+
+    # Build DataFrames
+    df_month = pd.DataFrame(monthly_columns, copy=False)
+
+    df_year = pd.DataFrame([{
+        "Total_Crossings": df_month["Sows_Crossed"].sum(),
+        "Piglets_Born_Alive": df_month["Piglets_Born_Alive"].sum(),
+        "Sold_Pigs": df_month["Sold_Pigs"].sum(),
+        "Revenue": df_month["Revenue"].sum(),
+        "Total_Operating_Cost": df_month["Total_Operating_Cost"].sum(),
+        "Profit": df_month["Monthly_Profit"].sum()   # plain profit, no dep
+    }])
+
+    return df_month, df_year
@@ -0,0 +1,97 @@
+# -------------------------------
+# Batched parameter sweeps
+# -------------------------------
+"""Evaluate many parameter sets in one call on the cohort engine.
+
+Scenarios are passed as a DataFrame (one row per scenario, columns named like
+the ``sow_rotation_simulator`` arguments) or as a mapping of arrays/scalars.
+Missing parameters take the simulator defaults. The scenario axis is processed
+in chunks so memory stays bounded for sweeps of tens of thousands of rows.
+"""
+
+import itertools
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .cohort import (DEFAULT_PARAMS, FINANCE_PARAMS, HERD_PARAMS, MONTHLY_COLUMNS, PARAM_NAMES,
+                     cached_herd_flow, financial_overlay, simulate_arrays)
+from .kpis import KPI_COLUMNS, compute_kpis
+
+BatchResult = namedtuple('BatchResult', ['params', 'monthly', 'kpis'])
+
+
+def parameter_grid(**values):
+    """Cartesian product of parameter values as a scenario DataFrame,
+    e.g. ``parameter_grid(sale_price=[160, 180], fcr=[2.9, 3.1], total_sows=[30, 60])``.
+    """
+    unknown = set(values) - set(PARAM_NAMES)
+    if unknown:
+        raise ValueError(f"Unknown parameters: {sorted(unknown)}")
+    names = list(values)
+    rows = itertools.product(*(np.atleast_1d(values[name]) for name in names))
+    return pd.DataFrame(list(rows), columns=names)
+
+
+def scenario_table(scenarios):
+    """Normalize a DataFrame or mapping of parameters to a full scenario DataFrame."""
+    if isinstance(scenarios, pd.DataFrame):
+        table = scenarios.reset_index(drop=True)
+    else:
+        arrays = {name: np.asarray(value) for name, value in scenarios.items()}
+        n = max([a.shape[0] for a in arrays.values() if a.ndim] or [1])
+        table = pd.DataFrame({name: np.broadcast_to(a, (n,)) for name, a in arrays.items()})
+
+    unknown = set(table.columns) - set(PARAM_NAMES) - {'months'}
+    if unknown:
+        raise ValueError(f"Unknown parameters: {sorted(unknown)}")
+    for name, default in DEFAULT_PARAMS.items():
+        if name not in table.columns:
+            table[name] = default
+    return table
+
+
+def simulate_batch(scenarios, months=60, columns=None, chunk_size=10_000, dtype=np.float64,
+                   capitalize_interest=False):
+    """Run every scenario and return ``BatchResult(params, monthly, kpis)``.
+
+    ``monthly`` maps each requested column to a (scenarios, months) array
+    (``columns=None`` keeps all monthly columns except ``Month``); pass a short
+    list for very large sweeps. ``kpis`` is a DataFrame with one row per scenario:
+    break-even month, cash ROI, realized CAGR, interest paid and totals.
+    ``capitalize_interest`` selects the ``monthly_kpi`` moratorium loan.
+    """
+    table = scenario_table(scenarios)
+    if 'months' in table.columns:
+        horizons = table.pop('months').unique()
+        if len(horizons) != 1:
+            raise ValueError("All scenarios in a batch must share the same 'months' horizon")
+        months = int(horizons[0])
+
+    if columns is None:
+        columns = [c for c in MONTHLY_COLUMNS if c != 'Month']
+    n = len(table)
+    monthly = {name: np.empty((n, months), dtype=dtype) for name in columns}
+    kpis = {name: np.empty(n) for name in KPI_COLUMNS}
+
+    values = {name: table[name].to_numpy(dtype=float) for name in PARAM_NAMES}
+    # A finance-only sweep shares one herd trajectory across all scenarios
+    shared_herd = None
+    if n and all((values[name] == values[name][0]).all() for name in HERD_PARAMS):
+        shared_herd = cached_herd_flow(months, **{name: float(values[name][0]) for name in HERD_PARAMS})
+
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        if shared_herd is not None:
+            r = financial_overlay(shared_herd, capitalize_interest,
+                                  **{name: values[name][start:stop] for name in FINANCE_PARAMS})
+        else:
+            r = simulate_arrays(months, capitalize_interest=capitalize_interest,
+                                **{name: v[start:stop] for name, v in values.items()})
+        for name in columns:
+            monthly[name][start:stop] = r[name]
+        for name, value in compute_kpis(r, months).items():
+            kpis[name][start:stop] = value
+
+    return BatchResult(table[PARAM_NAMES], monthly, pd.DataFrame(kpis, index=table.index))
@@ -0,0 +1,173 @@
+"""Batch rotation simulator with bimonthly sales (from ``Hosh_Sow_rotation_simulator_streamlit.py``).
+
+From month 13 pigs are sold every second month; only batches that finished
+growing in the two months before a sale day are sold.
+"""
+
+from .frames import column_buffers
+from .loans import amortization_schedule
+from .scheduler import BatchScheduler
+
+MONTHLY_COLUMNS = [
+    'Month', 'Piglets_Born_Alive', 'Growers', 'Sold_Pigs', 'Sows_Mated',
+    'Revenue', 'Sow_Feed_Cost', 'Grower_Feed_Cost', 'Staff_Cost', 'Mgmt_Fee',
+    'Mgmt_Comm', 'Other_Fixed_Costs', 'Total_Operating_Cost', 'Depreciation',
+    'Loan_EMI', 'Monthly_Profit', 'Monthly_Cash_Flow', 'Cumulative_Cash_Flow',
+]
+
+# -------------------------------
+# Sow Rotation Simulator with realistic batch sales
+# -------------------------------
+def sow_rotation_simulator(
+    total_sows=30,
+    piglets_per_cycle=8,
+    piglet_mortality=0.03,
+    abortion_rate=0.03,
+    sow_feed_price=32,
+    sow_feed_intake=2.8,
+    grower_feed_price=28,
+    fcr=3.2,
+    final_weight=105,
+    sale_price=180,
+    management_fee=50000,
+    management_commission=0.05,
+    supervisor_salary=25000,
+    worker_salary=18000,
+    n_workers=2,
+    shed_cost=1_000_000,
+    shed_life_years=10,
+    sow_cost=1_050_000,
+    sow_life_years=4,
+    loan_amount=0,
+    interest_rate=0.1,
+    loan_tenure_years=5,
+    moratorium_months=0,
+    medicine_cost=10000,
+    electricity_cost=5000,
+    land_lease=10000,
+    months=60
+):
+    import pandas as pd
+
+    cols = column_buffers(MONTHLY_COLUMNS, months)
+    shed_dep_rate = 1 / (shed_life_years * 12)
+    sow_dep_rate = 1 / (sow_life_years * 12)
+
+    # Interest is paid during the moratorium, then the EMI amortizes the loan
+    loan = amortization_schedule(loan_amount, interest_rate, loan_tenure_years * 12, months, moratorium_months)
+    loan_payments = loan['payment'].tolist()
+
+    average_cycle_length = 3.8 + 1.3 + 0.33
+    sows_to_mate_per_month = total_sows / average_cycle_length
+
+    scheduler = BatchScheduler()
+    # Batches that finished growing since the last sale day
+    ready_for_sale_batches = []
+    total_capital_invested = shed_cost + sow_cost
+    cumulative_cash_flow = -total_capital_invested
+
+    for month in range(1, months + 1):
+        sow_feed_cost = total_sows * sow_feed_intake * 30 * sow_feed_price
+        staff_cost = supervisor_salary + n_workers * worker_salary
+        mgmt_fixed = management_fee
+
+        sows_mated_this_month = 0
+
+        # Mate sows starting month 2
+        if month >= 2:
+            sows_to_mate = sows_to_mate_per_month
+            sows_mated_this_month = sows_to_mate
+            sows_pregnant = sows_to_mate * (1 - abortion_rate)
+            if sows_pregnant > 0:
+                farrow_month = month + 4
+                wean_month = farrow_month + 1
+                grower_start_month = wean_month
+                grower_end_month = grower_start_month + 6
+                piglets = sows_pregnant * piglets_per_cycle * (1 - piglet_mortality)
+                scheduler.new_batch(farrow_month, wean_month, grower_start_month, grower_end_month,
+                                    piglets, (piglets * fcr * final_weight) / 6)
+
+        # Apply this month's farrow / wean / grower events
+        newly_ready = scheduler.advance(month)
+        # Count piglets in lactation
+        piglets_with_sow = scheduler.lactating_piglets()
+        # Count growers
+        current_growers = scheduler.growers()
+        # Calculate grower feed
+        grower_feed_cost = scheduler.grower_feed_cost(grower_feed_price)
+
+        # Identify batches ready for sale this month
+        ready_for_sale_batches.extend(newly_ready)
+
+        sold_pigs = 0
+        revenue = 0
+        # Bimonthly sale logic
+        if month >= 13 and (month - 13) % 2 == 0 and ready_for_sale_batches:
+            pigs_sold_this_period = 0
+            sale_period_start = month - 1
+            sale_period_end = month
+
+            # Find batches that became ready in last 2 months; older ones missed their sale day
+            batches_to_sell = [b for b in ready_for_sale_batches if sale_period_start <= b.grower_end_month <= sale_period_end]
+            scheduler.expire([b for b in ready_for_sale_batches if b.grower_end_month < sale_period_start])
+            ready_for_sale_batches = []
+
+            pigs_sold_this_period += scheduler.sell(batches_to_sell)
+
+            revenue += pigs_sold_this_period * final_weight * sale_price
+            sold_pigs = pigs_sold_this_period
+            current_growers -= sold_pigs  # Deduct sold pigs from growers
+
+        mgmt_comm_cost = revenue * management_commission
+        other_fixed = medicine_cost + electricity_cost + land_lease
+        total_operating_cost = sow_feed_cost + grower_feed_cost + staff_cost + mgmt_fixed + mgmt_comm_cost + other_fixed
+        dep = shed_cost * shed_dep_rate + sow_cost * sow_dep_rate
+
+        loan_payment = loan_payments[month - 1]
+
+        monthly_profit = revenue - total_operating_cost - dep - loan_payment
+        monthly_cash_flow = revenue - total_operating_cost - loan_payment
+        cumulative_cash_flow += monthly_cash_flow
+
+        i = month - 1
+        cols['Month'][i] = month
+        cols['Piglets_Born_Alive'][i] = piglets_with_sow
+        cols['Growers'][i] = current_growers
+        cols['Sold_Pigs'][i] = sold_pigs
+        cols['Sows_Mated'][i] = sows_mated_this_month
+        cols['Revenue'][i] = revenue
+        cols['Sow_Feed_Cost'][i] = sow_feed_cost
+        cols['Grower_Feed_Cost'][i] = grower_feed_cost
+        cols['Staff_Cost'][i] = staff_cost
+        cols['Mgmt_Fee'][i] = mgmt_fixed
+        cols['Mgmt_Comm'][i] = mgmt_comm_cost
+        cols['Other_Fixed_Costs'][i] = other_fixed
+        cols['Total_Operating_Cost'][i] = total_operating_cost
+        cols['Depreciation'][i] = dep
+        cols['Loan_EMI'][i] = loan_payment
+        cols['Monthly_Profit'][i] = monthly_profit
+        cols['Monthly_Cash_Flow'][i] = monthly_cash_flow
+        cols['Cumulative_Cash_Flow'][i] = cumulative_cash_flow
+
+    df_month = pd.DataFrame(cols, copy=False)
+
+    # -------------------------------
+    # Yearly / Period Summary
+    # -------------------------------
+    periods = (df_month['Month'] - 1) // 12
+    df_year = df_month.groupby(periods).sum()
+
+    # Dynamic month range labels
+    month_ranges = []
+    for i in df_year.index:
+        start_month = i * 12 + 1
+        end_month = min((i + 1) * 12, months)
+        month_ranges.append(f"Month {start_month} - {end_month}")
+    df_year.index = month_ranges
+
+    df_year['Cash_Profit'] = df_year['Revenue'] - df_year['Total_Operating_Cost']
+    df_year['Profit_After_Dep_Loan'] = df_year['Cash_Profit'] - df_year['Depreciation'] - df_year['Loan_EMI']
+    df_year['Total_Capital_Invested'] = total_capital_invested
+    cumulative_cash_flow_with_assets = cumulative_cash_flow
+
+    return df_month, df_year, total_capital_invested, cumulative_cash_flow_with_assets
@@ -0,0 +1,125 @@
+# -------------------------------
+# Bounded LRU cache keyed by a parameter hash
+# -------------------------------
+"""Memoization for simulation results.
+
+``params_key`` turns a parameter mapping into a canonical hash (key order and
+int/float spelling do not matter), and ``LRUCache`` keeps at most ``maxsize``
+results, evicting the least recently used one and counting hits, misses and
+evictions. Cached values are shared between callers and must not be mutated.
+"""
+
+import contextvars
+import hashlib
+import json
+import numbers
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+
+def _canonical(value):
+    if isinstance(value, bool) or value is None or isinstance(value, str):
+        return value
+    if isinstance(value, numbers.Number):
+        return float(value)
+    if isinstance(value, dict):
+        return {str(k): _canonical(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_canonical(v) for v in value]
+    if hasattr(value, 'tolist'):
+        return _canonical(value.tolist())
+    return repr(value)
+
+
+def params_key(params, namespace=''):
+    """Canonical SHA-256 hex digest of a parameter mapping."""
+    payload = json.dumps([namespace, _canonical(dict(params))], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+class LRUCache:
+    """Thread-safe least-recently-used cache with hit/miss/eviction counters."""
+
+    def __init__(self, maxsize=32):
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def get_or_compute(self, key, compute):
+        """Return the cached value for ``key``, calling ``compute()`` on a miss."""
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def get_or_compute_many(self, items, max_workers=None):
+        """Values for ``(key, compute)`` pairs, in order; misses run concurrently in a thread pool.
+
+        Each compute runs in a copy of the caller's context, so an active
+        ``timing.PhaseTimer`` keeps recording inside the workers.
+        """
+        values = {}
+        missing = {}
+        with self._lock:
+            for key, compute in items:
+                if key in values or key in missing:
+                    continue
+                if key in self._data:
+                    self._data.move_to_end(key)
+                    self.hits += 1
+                    values[key] = self._data[key]
+                else:
+                    self.misses += 1
+                    missing[key] = compute
+        if missing:
+            with ThreadPoolExecutor(max_workers=max_workers or len(missing)) as pool:
+                futures = {key: pool.submit(contextvars.copy_context().run, compute) for key, compute in missing.items()}
+                for key, future in futures.items():
+                    values[key] = future.result()
+                    self.put(key, values[key])
+        return [values[key] for key, _ in items]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+        }
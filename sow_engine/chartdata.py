@@ -0,0 +1,43 @@
+# -------------------------------
+# Compact chart datasets
+# -------------------------------
+"""Chart-ready data for the Altair plots, built once per scenario.
+
+``chart_frame`` keeps only the columns the plots encode, rounds money to whole
+rupees and, for horizons longer than ``max_points`` months, buckets consecutive
+months so the chart payload stays the same size however long the run is.
+Reshaping (e.g. folding the cost columns into one series) is left to the chart
+itself, so all plots can share this one wide frame as their data source.
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+# Longest horizon sent month by month; the apps go up to 120 months
+CHART_MAX_POINTS = 120
+
+
+def chart_frame(df_month, flow_columns, level_columns=(), max_points=CHART_MAX_POINTS):
+    """``Month`` plus ``flow_columns`` and ``level_columns``, at most ``max_points`` rows.
+
+    When bucketed, flows (monthly amounts) are averaged over the months of a
+    bucket, levels (e.g. cumulative cash flow) take the bucket's last month, and
+    ``Month`` is the bucket's first month.
+    """
+    n = len(df_month)
+    size = max(math.ceil(n / max_points), 1)
+    starts = np.arange(0, n, size)
+    counts = np.diff(np.append(starts, n))
+    last = starts + counts - 1
+
+    data = {'Month': df_month['Month'].to_numpy()[starts]}
+    for name in flow_columns:
+        values = df_month[name].to_numpy(dtype=np.float64)
+        data[name] = values if size == 1 else np.add.reduceat(values, starts) / counts
+    for name in level_columns:
+        data[name] = df_month[name].to_numpy(dtype=np.float64)[last]
+    for name in [*flow_columns, *level_columns]:
+        data[name] = np.round(data[name]).astype(np.int64)
+    return pd.DataFrame(data, copy=False)
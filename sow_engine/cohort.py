@@ -0,0 +1,395 @@
+# -------------------------------
+# Vectorized cohort engine for the monthly sow rotation model
+# -------------------------------
+"""Array-based drop-in for ``sow_rotation_simulator`` in ``hosh_sow_calculator_monthly.py``.
+
+Every mating month produces one cohort of piglets. Because each cohort moves
+through farrowing, lactation, growing and sale on a fixed timetable, the herd
+at month ``t`` is just a delayed copy (or a windowed sum) of the per-month
+cohort array, so the whole horizon is computed with shifts and cumulative sums
+instead of rescanning a list of batch dicts every month.
+
+All helpers work along the last axis, so parameters may be scalars or arrays
+with a leading scenario axis.
+
+The model runs in two stages: ``herd_flow`` (head counts and kilograms, driven
+only by ``HERD_PARAMS``) and ``financial_overlay`` (prices, wages, lease, loan).
+``sow_rotation_simulator`` memoizes the herd stage, so price and finance
+what-ifs only redo the cheap overlay.
+"""
+
+import numpy as np
+
+from .cache import LRUCache, params_key
+from .loans import amortization_schedule
+from .sales import apply_sale_policy
+
+# Biological timetable (months), matching the loop simulators
+GESTATION_MONTHS = 4
+LACTATION_MONTHS = 1
+GROWING_MONTHS = 6
+FIRST_MATING_MONTH = 2
+AVERAGE_CYCLE_LENGTH = 3.8 + 1.3 + 0.33
+DAYS_PER_MONTH = 30
+
+MONTHLY_COLUMNS = [
+    'Month', 'Sows_Crossed', 'Piglets_Born_Alive', 'Growers', 'Sold_Pigs',
+    'Sow_Feed_Cost', 'Grower_Feed_Cost', 'Staff_Cost', 'Other_Fixed_Costs',
+    'Mgmt_Fee', 'Mgmt_Comm', 'Total_Operating_Cost', 'Revenue', 'Loan_EMI',
+    'Depreciation', 'Monthly_Cash_Flow', 'Monthly_Profit', 'Cumulative_Cash_Flow',
+]
+# Mated sows are a head count: rounded per month as in the loop simulator's table
+INT_COLUMNS = ('Month', 'Sows_Crossed')
+
+DEFAULT_PARAMS = dict(
+    total_sows=30,
+    piglets_per_cycle=10,
+    piglet_mortality=0.07,
+    abortion_rate=0.0,
+    sow_feed_price=30,
+    sow_feed_intake=2.8,
+    grower_feed_price=30,
+    fcr=3.1,
+    final_weight=105,
+    sale_price=180,
+    management_fee=0,
+    management_commission=0.0,
+    supervisor_salary=25000,
+    worker_salary=18000,
+    n_workers=2,
+    shed_cost=1_500_000,
+    shed_life_years=10,
+    sow_cost=35000,
+    sow_life_years=4,
+    loan_amount=0,
+    interest_rate=0.1,
+    loan_tenure_years=5,
+    moratorium_months=0,
+    medicine_cost=10000,
+    electricity_cost=5000,
+    land_lease=10000,
+)
+PARAM_NAMES = list(DEFAULT_PARAMS)
+# Inputs of the physical herd stage; everything else only reprices it
+HERD_PARAMS = ('total_sows', 'piglets_per_cycle', 'piglet_mortality', 'abortion_rate',
+               'sow_feed_intake', 'fcr', 'final_weight')
+FINANCE_PARAMS = tuple(name for name in PARAM_NAMES if name not in HERD_PARAMS)
+
+
+# -------------------------------
+# Array helpers
+# -------------------------------
+def _col(value):
+    """Scalar or per-scenario parameter -> array broadcastable against (..., months)."""
+    return np.asarray(value, dtype=float)[..., None]
+
+
+def _delay(x, k):
+    """Shift ``x`` k months later along the last axis, filling the start with zeros."""
+    out = np.zeros_like(x)
+    if k < x.shape[-1]:
+        out[..., k:] = x[..., :x.shape[-1] - k]
+    return out
+
+
+def _window_sum(x, lo, hi):
+    """out[t] = sum(x[t - hi] .. x[t - lo]) along the last axis."""
+    c = np.cumsum(x, axis=-1)
+    return _delay(c, lo) - _delay(c, hi + 1)
+
+
+# -------------------------------
+# Core simulation on arrays
+# -------------------------------
+def expected_cohorts(months, total_sows, piglets_per_cycle, piglet_mortality, abortion_rate):
+    """Deterministic mating schedule: (sows_crossed, cohort) arrays shaped (..., months).
+
+    ``cohort[m]`` is the number of surviving piglets from the sows mated in month m.
+    """
+    month = np.arange(1, months + 1)
+    sows_crossed = np.where(month >= FIRST_MATING_MONTH, _col(total_sows) / AVERAGE_CYCLE_LENGTH, 0.0)
+    sows_pregnant = sows_crossed * (1 - _col(abortion_rate))
+    cohort = np.where(sows_pregnant > 0,
+                      sows_pregnant * _col(piglets_per_cycle) * (1 - _col(piglet_mortality)),
+                      0.0)
+    return sows_crossed, cohort
+
+
+def herd_flow(months=60, sows_crossed=None, cohort=None, sale_policy=None, **herd_params):
+    """Physical herd trajectory, independent of every price, salary and loan input.
+
+    Only ``HERD_PARAMS`` are accepted (defaults from ``DEFAULT_PARAMS``). Returns
+    head counts and feed/sale kilograms shaped (..., months) plus per-scenario
+    totals; ``financial_overlay`` turns it into money columns. ``sale_policy``
+    (see ``sales``) replaces selling every pig the month it is ready.
+    """
+    unknown = set(herd_params) - set(HERD_PARAMS)
+    if unknown:
+        raise ValueError(f"Not herd parameters: {sorted(unknown)}")
+    p = {name: herd_params.get(name, DEFAULT_PARAMS[name]) for name in HERD_PARAMS}
+
+    expected_crossed, expected_cohort = expected_cohorts(
+        months, p['total_sows'], p['piglets_per_cycle'], p['piglet_mortality'], p['abortion_rate'])
+    if sows_crossed is None:
+        sows_crossed = expected_crossed
+    if cohort is None:
+        cohort = expected_cohort
+    shape = np.broadcast_shapes(*(np.shape(v) for v in p.values()), np.shape(sows_crossed)[:-1],
+                                np.shape(cohort)[:-1]) + (months,)
+    cohort = np.broadcast_to(cohort, shape)
+
+    total_sows = _col(p['total_sows'])
+    final_weight = _col(p['final_weight'])
+
+    wean_lag = GESTATION_MONTHS + LACTATION_MONTHS
+    sale_lag = wean_lag + GROWING_MONTHS
+    piglets_with_sow = _delay(cohort, GESTATION_MONTHS)
+    growers_on_feed = _window_sum(cohort, wean_lag, sale_lag - 1)
+    sold_pigs = _delay(cohort, sale_lag)
+    growers = growers_on_feed - sold_pigs
+    grower_feed_kg = growers_on_feed * _col(p['fcr']) * final_weight / GROWING_MONTHS
+    sold_kg = sold_pigs * final_weight
+    # cohorts still growing at the end of the horizon
+    animals_left = cohort[..., max(months - sale_lag, 0):].sum(axis=-1)
+    sale_price_index = None
+
+    if sale_policy is not None:
+        sales = apply_sale_policy(sold_pigs, growers_on_feed, sale_policy, final_weight, _col(p['fcr']))
+        growers = growers + sold_pigs - sales['sold'] + sales['held']
+        grower_feed_kg = grower_feed_kg + sales['extra_feed_kg']
+        sold_pigs, sold_kg = sales['sold'], sales['sold_kg']
+        animals_left = animals_left + sales['held'][..., -1]
+        sale_price_index = sale_policy.price_index
+
+    sold_any = sold_pigs > 0
+    first_sale_month = np.where(sold_any.any(axis=-1), sold_any.argmax(axis=-1) + 1, months)
+
+    return {
+        'months': months,
+        'Sows_Crossed': np.broadcast_to(sows_crossed, shape),
+        'Piglets_Born_Alive': piglets_with_sow,
+        'Growers': growers,
+        'Sold_Pigs': sold_pigs,
+        'total_sows': total_sows,
+        'sow_feed_kg': total_sows * _col(p['sow_feed_intake']) * DAYS_PER_MONTH,
+        'grower_feed_kg': grower_feed_kg,
+        'sold_kg': sold_kg,
+        'sale_price_index': sale_price_index,
+        'first_sale_month': first_sale_month,
+        'total_pigs_sold': sold_pigs.sum(axis=-1),
+        'total_pigs_born': cohort.sum(axis=-1),
+        'animals_left': animals_left,
+    }
+
+
+_HERD_CACHE = LRUCache(maxsize=64)
+
+
+def cached_herd_flow(months=60, sale_policy=None, **herd_params):
+    """``herd_flow`` for scalar parameters, memoized on a hash of the herd inputs.
+
+    The returned arrays are shared between callers and marked read-only.
+    """
+    def compute():
+        herd = herd_flow(months, sale_policy=sale_policy, **herd_params)
+        for value in herd.values():
+            if isinstance(value, np.ndarray) and value.flags.writeable:
+                value.flags.writeable = False
+        return herd
+
+    key = params_key({**herd_params, 'months': months, 'sale_policy': sale_policy}, namespace='cohort.herd_flow')
+    return _HERD_CACHE.get_or_compute(key, compute)
+
+
+def financial_overlay(herd, capitalize_interest=False, **finance_params):
+    """Price a herd trajectory: money columns and summary scalars shaped like ``simulate_arrays``.
+
+    Only ``FINANCE_PARAMS`` are accepted; this is plain vector arithmetic on the
+    cached herd arrays, so changing a price, salary, lease or loan term never
+    re-simulates the herd. ``capitalize_interest=True`` adds moratorium interest
+    to the loan instead of paying it (the ``monthly_kpi`` loan).
+    """
+    unknown = set(finance_params) - set(FINANCE_PARAMS)
+    if unknown:
+        raise ValueError(f"Not financial parameters: {sorted(unknown)}")
+    p = {name: finance_params.get(name, DEFAULT_PARAMS[name]) for name in FINANCE_PARAMS}
+    months = herd['months']
+    month = np.arange(1, months + 1)
+    shape = np.broadcast_shapes(*(np.shape(v) for v in p.values()), herd['Sold_Pigs'].shape[:-1]) + (months,)
+
+    total_sows = herd['total_sows']
+
+    # ----- Costs & revenue -----
+    grower_feed_cost = herd['grower_feed_kg'] * _col(p['grower_feed_price'])
+    sow_feed_cost = herd['sow_feed_kg'] * _col(p['sow_feed_price'])
+    staff_cost = _col(p['supervisor_salary']) + _col(p['n_workers']) * _col(p['worker_salary'])
+    mgmt_fixed = _col(p['management_fee'])
+    other_fixed = _col(p['medicine_cost']) + _col(p['electricity_cost']) + _col(p['land_lease'])
+
+    revenue = herd['sold_kg'] * _col(p['sale_price'])
+    if herd.get('sale_price_index') is not None:
+        revenue = revenue * herd['sale_price_index'][:months]
+    mgmt_comm_cost = revenue * _col(p['management_commission'])
+    total_operating_cost = sow_feed_cost + grower_feed_cost + staff_cost + mgmt_fixed + mgmt_comm_cost + other_fixed
+
+    shed_cost = _col(p['shed_cost'])
+    total_sow_cost = _col(p['sow_cost']) * total_sows
+    dep = shed_cost / (_col(p['shed_life_years']) * 12) + total_sow_cost / (_col(p['sow_life_years']) * 12)
+
+    # Interest is paid (or capitalized) during the moratorium, then the EMI amortizes the loan
+    loan = amortization_schedule(p['loan_amount'], p['interest_rate'], np.asarray(p['loan_tenure_years']) * 12,
+                                 months, p['moratorium_months'], capitalize=capitalize_interest)
+    loan_payment = loan['payment']
+
+    monthly_cash_flow = revenue - total_operating_cost - loan_payment
+    monthly_profit = revenue - total_operating_cost - dep - loan_payment
+    cumulative_cash_flow = np.cumsum(monthly_cash_flow, axis=-1) - (shed_cost + total_sow_cost)
+
+    # ----- Working capital until (and including) the first sale month -----
+    cash_cost = total_operating_cost - mgmt_comm_cost
+    first_sale_cash_needed = np.where(month <= herd['first_sale_month'][..., None], cash_cost, 0.0).sum(axis=-1)
+
+    return {
+        'Month': np.broadcast_to(month, shape),
+        'Sows_Crossed': np.broadcast_to(herd['Sows_Crossed'], shape),
+        'Piglets_Born_Alive': np.broadcast_to(herd['Piglets_Born_Alive'], shape),
+        'Growers': np.broadcast_to(herd['Growers'], shape),
+        'Sold_Pigs': np.broadcast_to(herd['Sold_Pigs'], shape),
+        'Sow_Feed_Cost': np.broadcast_to(sow_feed_cost, shape),
+        'Grower_Feed_Cost': np.broadcast_to(grower_feed_cost, shape),
+        'Staff_Cost': np.broadcast_to(staff_cost, shape),
+        'Other_Fixed_Costs': np.broadcast_to(other_fixed, shape),
+        'Mgmt_Fee': np.broadcast_to(mgmt_fixed, shape),
+        'Mgmt_Comm': np.broadcast_to(mgmt_comm_cost, shape),
+        'Total_Operating_Cost': np.broadcast_to(total_operating_cost, shape),
+        'Revenue': np.broadcast_to(revenue, shape),
+        'Loan_EMI': np.broadcast_to(loan_payment, shape),
+        'Loan_Interest': np.broadcast_to(loan['interest'], shape),
+        'Loan_Balance': np.broadcast_to(loan['balance'], shape),
+        'Depreciation': np.broadcast_to(dep, shape),
+        'Monthly_Cash_Flow': np.broadcast_to(monthly_cash_flow, shape),
+        'Monthly_Profit': np.broadcast_to(monthly_profit, shape),
+        'Cumulative_Cash_Flow': np.broadcast_to(cumulative_cash_flow, shape),
+        # per-scenario scalars
+        'total_sow_cost': np.broadcast_to(total_sow_cost[..., 0], shape[:-1]),
+        'shed_cost': np.broadcast_to(shed_cost[..., 0], shape[:-1]),
+        'first_sale_cash_needed': np.broadcast_to(first_sale_cash_needed, shape[:-1]),
+        'total_pigs_sold': np.broadcast_to(herd['total_pigs_sold'], shape[:-1]),
+        'total_pigs_born': np.broadcast_to(herd['total_pigs_born'], shape[:-1]),
+        'animals_left': np.broadcast_to(herd['animals_left'], shape[:-1]),
+        'final_cumulative_cash_flow': np.broadcast_to(cumulative_cash_flow[..., -1], shape[:-1]),
+        'total_interest_paid': np.broadcast_to(loan['interest'].sum(axis=-1), shape[:-1]),
+    }
+
+
+def split_params(params):
+    """Split a parameter mapping into (herd_params, finance_params)."""
+    unknown = set(params) - set(PARAM_NAMES)
+    if unknown:
+        raise ValueError(f"Unknown parameters: {sorted(unknown)}")
+    herd_params = {k: v for k, v in params.items() if k in HERD_PARAMS}
+    finance_params = {k: v for k, v in params.items() if k in FINANCE_PARAMS}
+    return herd_params, finance_params
+
+
+def simulate_arrays(months=60, sows_crossed=None, cohort=None, capitalize_interest=False, sale_policy=None,
+                    **params):
+    """Run the cohort model and return a dict of column arrays shaped (..., months).
+
+    Parameters not given fall back to ``DEFAULT_PARAMS``; any of them may be an
+    array with a leading scenario axis. Besides the monthly columns the dict holds
+    the loan's ``Loan_Interest`` and ``Loan_Balance`` and the per-scenario
+    scalars of the loop simulator's summary tuple.
+
+    ``sows_crossed``/``cohort`` replace the deterministic mating schedule of
+    ``expected_cohorts`` (e.g. with sampled outcomes); ``sale_policy`` is a
+    ``sales.SalePolicy``.
+    """
+    herd_params, finance_params = split_params(params)
+    return financial_overlay(herd_flow(months, sows_crossed, cohort, sale_policy, **herd_params),
+                             capitalize_interest, **finance_params)
+
+
+# -------------------------------
+# DataFrame wrappers
+# -------------------------------
+def monthly_frame(arrays):
+    """Build ``df_month`` for a single scenario (unrounded; see ``frames.display_frame``)."""
+    import pandas as pd
+
+    data = {}
+    for name in MONTHLY_COLUMNS:
+        col = np.asarray(arrays[name])
+        if name in INT_COLUMNS:
+            data[name] = np.round(col).astype(np.int64)
+        else:
+            data[name] = col.astype(np.float64, copy=False)
+    return pd.DataFrame(data, copy=False)
+
+
+def yearly_summary(df_month):
+    df_year = df_month.groupby(((df_month['Month']-1)//12)*12).sum()
+    df_year.index = [f"Year {i+1}" for i in range(len(df_year))]
+
+    df_year['Cash_Profit'] = df_year['Revenue'] - df_year['Total_Operating_Cost']
+    df_year['Profit_After_Dep_Loan'] = df_year['Cash_Profit'] - df_year['Depreciation'] - df_year['Loan_EMI']
+
+    df_year['Total_Crossings'] = df_month.groupby(((df_month['Month']-1)//12)*12)['Sows_Crossed'].sum().values
+    return df_year
+
+
+def sow_rotation_simulator(
+    total_sows=30,
+    piglets_per_cycle=10,
+    piglet_mortality=0.07,
+    abortion_rate=0.0,
+    sow_feed_price=30,
+    sow_feed_intake=2.8,
+    grower_feed_price=30,
+    fcr=3.1,
+    final_weight=105,
+    sale_price=180,
+    management_fee=0,
+    management_commission=0.0,
+    supervisor_salary=25000,
+    worker_salary=18000,
+    n_workers=2,
+    shed_cost=1_500_000,
+    shed_life_years=10,
+    sow_cost=35000,
+    sow_life_years=4,
+    loan_amount=0,
+    interest_rate=0.1,
+    loan_tenure_years=5,
+    moratorium_months=0,
+    medicine_cost=10000,
+    electricity_cost=5000,
+    land_lease=10000,
+    months=60,
+    sale_policy=None,
+):
+    """Same arguments and return tuple as the loop simulator in ``hosh_sow_calculator_monthly.py``.
+
+    ``sale_policy`` is an optional ``sales.SalePolicy``.
+    """
+    params = dict(locals())
+    months = params.pop('months')
+    sale_policy = params.pop('sale_policy')
+    herd_params, finance_params = split_params(params)
+    r = financial_overlay(cached_herd_flow(months, sale_policy, **herd_params), **finance_params)
+
+    df_month = monthly_frame(r)
+    df_year = yearly_summary(df_month)
+
+    return (
+        df_month,
+        df_year,
+        float(r['total_sow_cost']),
+        shed_cost,
+        float(r['first_sale_cash_needed']),
+        float(r['total_pigs_sold']),
+        float(r['total_pigs_born']),
+        float(r['animals_left']),
+        float(r['final_cumulative_cash_flow']),
+        float(r['total_interest_paid']),
+    )
@@ -0,0 +1,35 @@
+# -------------------------------
+# Column buffers and display rounding
+# -------------------------------
+"""Columnar result construction shared by the simulators.
+
+The loop simulators write each month into preallocated typed column arrays
+and wrap them in a DataFrame without building a dict per row. Values stay
+unrounded so sums, cumulative cash flow and KPIs are exact; ``display_frame``
+rounds the money columns once per column for the tables in the apps.
+"""
+
+import numpy as np
+
+# Head counts keep their fractions on screen, like the original tables
+UNROUNDED_COLUMNS = ('Month', 'Piglets_Born_Alive', 'Growers', 'Sold_Pigs')
+
+
+def column_buffers(names, n, int_columns=('Month',)):
+    """Zeroed float64 column arrays of length ``n`` (int64 for ``int_columns``)."""
+    return {name: np.zeros(n, dtype=np.int64 if name in int_columns else np.float64) for name in names}
+
+
+def trim(columns, n):
+    """First ``n`` rows of every column (views, no copy)."""
+    return {name: values[:n] for name, values in columns.items()}
+
+
+def display_frame(df, keep=UNROUNDED_COLUMNS):
+    """Copy of ``df`` with every float column not in ``keep`` rounded to whole rupees."""
+    out = df.copy()
+    for name in out.columns:
+        values = out[name].to_numpy()
+        if name not in keep and values.dtype.kind == 'f' and np.isfinite(values).all():
+            out[name] = np.round(values).astype(np.int64)
+    return out
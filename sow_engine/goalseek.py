@@ -0,0 +1,143 @@
+# -------------------------------
+# Goal seek on one parameter
+# -------------------------------
+"""Solve for the value of one parameter that hits a KPI target.
+
+Questions like "how many sows to break even by month 36?" or "what sale price
+gives a 20% CAGR?" are answered by bracketing and bisection on the cohort
+engine:
+
+1. the bounds are scanned with one batched evaluation to find where the target
+   flips from missed to achieved;
+2. that bracket is bisected down to ``tol`` (or to one unit for integer
+   parameters such as ``total_sows``).
+
+A target counts as achieved when the KPI is at or below it for
+``break_even_month`` and at or above it for every other KPI; a scenario that
+never breaks even never achieves a break-even target. Every evaluated point is
+kept in a module-level LRU, so re-solving after a UI rerun is nearly free.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .batch import simulate_batch
+from .cache import LRUCache, params_key
+from .cohort import DEFAULT_PARAMS
+from .kpis import KPI_COLUMNS
+
+GoalSeekResult = namedtuple('GoalSeekResult', ['value', 'kpi_value', 'status', 'evaluations'])
+
+# Parameters that only make sense as whole numbers
+INTEGER_PARAMS = ('total_sows', 'piglets_per_cycle', 'n_workers', 'loan_tenure_years',
+                  'moratorium_months', 'shed_life_years', 'sow_life_years')
+# Search ranges used when no ``bounds`` are given (otherwise 0 .. 10 x base value)
+DEFAULT_BOUNDS = {
+    'total_sows': (1, 5000),
+    'piglets_per_cycle': (1, 30),
+    'sale_price': (0, 2000),
+    'final_weight': (20, 300),
+    'fcr': (1.0, 8.0),
+    'sow_feed_price': (0, 200),
+    'grower_feed_price': (0, 200),
+    'loan_amount': (0, 100_000_000),
+    'interest_rate': (0.0, 0.5),
+    'piglet_mortality': (0.0, 1.0),
+    'abortion_rate': (0.0, 1.0),
+    'management_commission': (0.0, 1.0),
+}
+
+_EVAL_CACHE = LRUCache(maxsize=4096)
+
+
+def _bounds(param, base_value, bounds):
+    if bounds is not None:
+        return bounds
+    if param in DEFAULT_BOUNDS:
+        return DEFAULT_BOUNDS[param]
+    return 0, 10 * max(base_value, 1)
+
+
+def _evaluate(param, values, base, months, capitalize_interest, counter):
+    """KPI dicts for ``values`` of ``param``; uncached points run as one batch."""
+    keys = [params_key({**base, param: v, 'months': months, 'capitalize_interest': capitalize_interest},
+                       namespace='goalseek') for v in values]
+    # results are kept here too: the shared cache may evict them before we return
+    found = {}
+    for key in keys:
+        value = _EVAL_CACHE.get(key)
+        if value is not None:
+            found[key] = value
+    missing = [i for i, key in enumerate(keys) if key not in found]
+    if missing:
+        table = pd.DataFrame([{**base, param: values[i]} for i in missing])
+        kpis = simulate_batch(table, months, columns=[], capitalize_interest=capitalize_interest).kpis
+        for row, i in enumerate(missing):
+            found[keys[i]] = {name: float(kpis[name].iloc[row]) for name in KPI_COLUMNS}
+            _EVAL_CACHE.put(keys[i], found[keys[i]])
+        counter[0] += len(missing)
+    return [found[key] for key in keys]
+
+
+def _achieved(kpi, target, row):
+    value = row[kpi]
+    if kpi == 'break_even_month':
+        return not np.isnan(value) and value <= target
+    return value >= target
+
+
+def goal_seek(param, target, kpi='break_even_month', params=None, bounds=None, months=60,
+              tol=None, scan_points=17, max_iter=100, capitalize_interest=False):
+    """Value of ``param`` at which ``kpi`` reaches ``target``, all other params held.
+
+    ``params`` may include ``months`` (as in the Streamlit apps). Returns
+    ``GoalSeekResult(value, kpi_value, status, evaluations)`` where ``value`` is
+    the achieving side of the bracket and ``status`` is ``'solved'``,
+    ``'always'`` (achieved over the whole range, value is the lower bound) or
+    ``'never'`` (not achievable within the bounds, value is NaN).
+    """
+    if kpi not in KPI_COLUMNS:
+        raise ValueError(f"Unknown KPI {kpi!r}; choose from {KPI_COLUMNS}")
+    base = {**DEFAULT_PARAMS, **(params or {})}
+    months = int(base.pop('months', months))
+    if param not in base:
+        raise ValueError(f"Unknown parameter {param!r}")
+
+    integer = param in INTEGER_PARAMS
+    lo, hi = _bounds(param, base[param], bounds)
+    if integer:
+        lo, hi = int(np.ceil(lo)), int(np.floor(hi))
+    tol = 1 if integer else (tol or 1e-6 * max(abs(hi - lo), 1e-12))
+    counter = [0]
+
+    # ----- Bracket: one batched scan over the bounds -----
+    grid = np.linspace(lo, hi, scan_points)
+    if integer:
+        grid = np.unique(np.round(grid).astype(int))
+    grid = grid.tolist()
+    rows = _evaluate(param, grid, base, months, capitalize_interest, counter)
+    ok = [_achieved(kpi, target, row) for row in rows]
+
+    flip = next((i for i in range(len(grid) - 1) if ok[i] != ok[i + 1]), None)
+    if flip is None:
+        if ok[0]:
+            return GoalSeekResult(grid[0], rows[0][kpi], 'always', counter[0])
+        return GoalSeekResult(float('nan'), float('nan'), 'never', counter[0])
+
+    # ----- Bisect the bracket; ``good`` always achieves, ``bad`` never -----
+    good, bad = (grid[flip], grid[flip + 1]) if ok[flip] else (grid[flip + 1], grid[flip])
+    good_row = rows[flip] if ok[flip] else rows[flip + 1]
+    for _ in range(max_iter):
+        if abs(good - bad) <= tol:
+            break
+        mid = (good + bad) // 2 if integer else (good + bad) / 2
+        if mid in (good, bad):
+            break
+        row = _evaluate(param, [mid], base, months, capitalize_interest, counter)[0]
+        if _achieved(kpi, target, row):
+            good, good_row = mid, row
+        else:
+            bad = mid
+    return GoalSeekResult(good, good_row[kpi], 'solved', counter[0])
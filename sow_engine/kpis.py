@@ -0,0 +1,58 @@
+# -------------------------------
+# Per-scenario KPIs from engine arrays
+# -------------------------------
+"""Break-even, ROI and CAGR computed on (..., months) arrays.
+
+The definitions follow the financial summary of ``sowcalcmonthly_withgraphs.py``:
+initial investment is shed + sows, ROI/CAGR are measured against that
+investment plus the working capital needed until the first sale, and the
+average monthly profit is revenue less operating cost (before depreciation and
+loan payments, unlike the cohort ``Monthly_Profit`` column).
+"""
+
+import numpy as np
+
+KPI_COLUMNS = [
+    'break_even_month',
+    'roi_cash_pct',
+    'realized_cagr',
+    'total_interest_paid',
+    'final_cumulative_cash_flow',
+    'first_sale_cash_needed',
+    'average_monthly_profit',
+    'total_pigs_born',
+    'total_pigs_sold',
+    'animals_left',
+]
+
+
+def break_even_month(cumulative_cash_flow):
+    """First 1-based month with cumulative cash flow >= 0, NaN if never reached."""
+    hit = np.asarray(cumulative_cash_flow) >= 0
+    return np.where(hit.any(axis=-1), hit.argmax(axis=-1) + 1.0, np.nan)
+
+
+def compute_kpis(arrays, months):
+    """KPI dict (one value per scenario) from the output of ``simulate_arrays``."""
+    initial_investment = arrays['shed_cost'] + arrays['total_sow_cost']
+    invested = arrays['first_sale_cash_needed'] + initial_investment
+    final_cum = arrays['final_cumulative_cash_flow']
+    years = months / 12
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        roi_cash_pct = final_cum / invested * 100
+        realized_cagr = ((final_cum + initial_investment) / invested) ** (1 / years) - 1
+
+    return {
+        'break_even_month': break_even_month(arrays['Cumulative_Cash_Flow']),
+        'roi_cash_pct': roi_cash_pct,
+        'realized_cagr': realized_cagr,
+        'total_interest_paid': arrays['total_interest_paid'],
+        'final_cumulative_cash_flow': final_cum,
+        'first_sale_cash_needed': arrays['first_sale_cash_needed'],
+        'average_monthly_profit': (np.asarray(arrays['Revenue'])
+                                   - np.asarray(arrays['Total_Operating_Cost'])).mean(axis=-1),
+        'total_pigs_born': arrays['total_pigs_born'],
+        'total_pigs_sold': arrays['total_pigs_sold'],
+        'animals_left': arrays['animals_left'],
+    }
@@ -0,0 +1,143 @@
+# -------------------------------
+# Closed-form loan amortization schedules
+# -------------------------------
+"""One loan-schedule component for every simulator.
+
+A loan is disbursed at the start of ``start_month`` and, by loan age, goes
+through:
+
+* a moratorium of ``moratorium_months`` where interest is either paid
+  (``capitalize=False``) or added to the balance (``capitalize=True``);
+* an EMI phase that fully amortizes the balance left after the moratorium over
+  the remaining ``tenure_months - moratorium_months`` months (the moratorium is
+  capped at ``tenure_months - 1``).
+
+Optional ``prepayments`` (extra principal per calendar month) keep the EMI and
+shorten the loan; a payment never exceeds what is outstanding.
+
+Balances follow the linear recurrence ``B[k] = a[k] * B[k-1] - c[k]``, which is
+solved in closed form with a cumulative product and a cumulative sum, so any
+number of loans (leading axes broadcast) is scheduled without a month loop.
+"""
+
+import numpy as np
+
+SCHEDULE_COLUMNS = ('payment', 'interest', 'principal', 'prepayment', 'balance')
+
+
+def _arr(value):
+    return np.asarray(value, dtype=float)[..., None]
+
+
+def emi(principal, monthly_rate, n_months):
+    """Level payment that repays ``principal`` over ``n_months`` (element-wise)."""
+    principal = np.asarray(principal, dtype=float)
+    monthly_rate = np.asarray(monthly_rate, dtype=float)
+    n = np.maximum(np.asarray(n_months, dtype=float), 1)
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        growth = (1 + monthly_rate) ** n
+        level = np.where(monthly_rate > 0, principal * monthly_rate * growth / (growth - 1), principal / n)
+    return np.where(principal > 0, level, 0.0)
+
+
+def _solve_recurrence(b0, a, c):
+    """B[k] = a[k] * B[k-1] - c[k] along the last axis, B[-1] = b0."""
+    growth = np.cumprod(a, axis=-1)
+    return growth * (b0 - np.cumsum(c / growth, axis=-1))
+
+
+def _to_calendar(by_age, start_month, months):
+    """Move (..., months) loan-age arrays onto the calendar, starting at ``start_month``."""
+    age = np.arange(months) - (np.asarray(start_month, dtype=int)[..., None] - 1)
+    valid = age >= 0
+    index = np.broadcast_to(np.clip(age, 0, months - 1), by_age.shape)
+    return np.where(valid, np.take_along_axis(by_age, index, axis=-1), 0.0)
+
+
+def amortization_schedule(principal, annual_rate, tenure_months, months, moratorium_months=0,
+                          capitalize=False, start_month=1, prepayments=None):
+    """Per-month schedule for one or many loans.
+
+    Scalar arguments may be arrays with matching leading axes; ``prepayments`` is
+    a (..., months) array indexed by calendar month. Returns a dict of
+    ``SCHEDULE_COLUMNS`` arrays shaped (..., months); ``balance`` is the balance
+    at the end of each month.
+    """
+    principal = _arr(principal)
+    rate = _arr(annual_rate) / 12
+    tenure = np.maximum(_arr(tenure_months), 1)
+    moratorium = np.minimum(_arr(moratorium_months), tenure - 1)
+    capitalize = np.asarray(capitalize, dtype=bool)[..., None]
+    start_month = np.asarray(start_month, dtype=int)
+    shape = np.broadcast_shapes(principal.shape, rate.shape, tenure.shape, moratorium.shape,
+                                capitalize.shape, start_month.shape + (1,))[:-1] + (months,)
+
+    age = np.arange(1, months + 1)
+    extra = np.zeros(shape)
+    if prepayments is not None:
+        # calendar month -> loan age
+        shift = np.broadcast_to(start_month[..., None] - 1, shape)
+        index = np.clip(age - 1 + shift, 0, months - 1)
+        extra = np.where(age - 1 + shift < months,
+                         np.take_along_axis(np.broadcast_to(np.asarray(prepayments, dtype=float), shape), index, axis=-1),
+                         0.0)
+
+    in_moratorium = age <= moratorium
+    in_tenure = age <= tenure
+    growth = np.broadcast_to(1 + rate, shape)
+
+    # ----- Moratorium: B[k] = g B[k-1] - P[k] (capitalized) or B[k-1] - P[k] (interest paid) -----
+    a = np.where(in_moratorium & ~capitalize, 1.0, growth)
+    c = np.where(in_moratorium, extra, 0.0)
+    balance_mor = _solve_recurrence(principal, np.where(in_moratorium, a, 1.0), c)
+    n_mor = moratorium.astype(int)
+    b_start = np.where(n_mor > 0,
+                       np.take_along_axis(balance_mor, np.clip(n_mor - 1, 0, months - 1), axis=-1),
+                       principal)
+    # moratorium longer than the horizon: the EMI phase is never reached
+    b_start = np.where(n_mor > months, 0.0, np.maximum(b_start, 0.0))
+
+    # ----- EMI phase over the remaining tenure -----
+    level = emi(b_start, rate, tenure - moratorium)
+    in_emi = ~in_moratorium & in_tenure
+    c = np.where(in_emi, level + extra, 0.0)
+    balance_emi = _solve_recurrence(b_start, np.where(in_emi, growth, 1.0), c)
+    balance = np.where(in_moratorium, balance_mor, np.where(in_tenure, balance_emi, 0.0))
+
+    # ----- Payoff: stop at the first month the balance reaches zero -----
+    tol = 1e-9 * np.maximum(principal, 1.0)
+    closed = balance <= tol
+    open_before = np.concatenate([np.ones(shape[:-1] + (1,), dtype=bool), ~closed[..., :-1]], axis=-1)
+    open_before &= np.logical_and.accumulate(open_before, axis=-1)
+    prev_balance = np.concatenate([np.broadcast_to(principal, shape[:-1] + (1,)), balance[..., :-1]], axis=-1)
+    prev_balance = np.where(open_before, prev_balance, 0.0)
+
+    interest = prev_balance * rate
+    owed = prev_balance + interest
+    scheduled = np.where(in_moratorium, np.where(capitalize, 0.0, interest), np.where(in_tenure, level, 0.0))
+    scheduled = np.minimum(scheduled, owed)
+    prepayment = np.minimum(np.where(open_before, extra, 0.0), owed - scheduled)
+    payment = scheduled + prepayment
+    end_balance = np.where(open_before, np.maximum(owed - payment, 0.0), 0.0)
+    end_balance = np.where(end_balance <= tol, 0.0, end_balance)
+
+    schedule = {
+        'payment': payment,
+        'interest': interest,
+        'principal': payment - interest,
+        'prepayment': prepayment,
+        'balance': end_balance,
+    }
+    if (start_month != 1).any():
+        schedule = {name: _to_calendar(value, start_month, months) for name, value in schedule.items()}
+    return schedule
+
+
+def tranche_schedule(tranches, months):
+    """Combined schedule of several loans given as a list of ``amortization_schedule`` keyword dicts."""
+    total = {name: np.zeros(months) for name in SCHEDULE_COLUMNS}
+    for tranche in tranches:
+        schedule = amortization_schedule(months=months, **tranche)
+        for name in SCHEDULE_COLUMNS:
+            total[name] = total[name] + schedule[name]
+    return total
@@ -0,0 +1,99 @@
+# -------------------------------
+# Stochastic Monte Carlo mode
+# -------------------------------
+"""Replicate the monthly model with sampled herd outcomes instead of fixed fractions.
+
+For every mating month of every replication:
+
+* sows mated      = floor(expected) + Bernoulli(fractional part)
+* sows pregnant   ~ Binomial(sows mated, 1 - abortion_rate)
+* piglets born    ~ Poisson(piglets_per_cycle * sows pregnant)
+* piglets weaned  ~ Binomial(piglets born, 1 - piglet_mortality)
+
+Replications are sampled and simulated as (replications, months) arrays per
+chunk, and chunks are spread over a process pool. Random streams belong to
+fixed blocks of ``SEED_BLOCK`` replications (block i draws from the i-th child
+of ``SeedSequence(seed)``), not to chunks, so results depend only on ``seed``:
+neither ``chunk_size`` nor the number of workers changes a sample.
+"""
+
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .cohort import DEFAULT_PARAMS, expected_cohorts, simulate_arrays
+from .kpis import compute_kpis
+
+# Replications per random stream; chunks draw whole blocks and keep their part
+SEED_BLOCK = 100
+
+MonteCarloResult = namedtuple('MonteCarloResult', ['cumulative_cash_flow', 'kpis', 'prob_no_break_even'])
+
+
+def sample_cohorts(rng, n, months, total_sows, piglets_per_cycle, piglet_mortality, abortion_rate):
+    """Draw (sows_crossed, cohort) integer outcomes for ``n`` replications."""
+    expected_crossed, _ = expected_cohorts(months, total_sows, piglets_per_cycle, piglet_mortality, abortion_rate)
+    expected_crossed = np.broadcast_to(expected_crossed, (n, months))
+
+    whole = np.floor(expected_crossed)
+    mated = whole + (rng.random((n, months)) < expected_crossed - whole)
+    pregnant = rng.binomial(mated.astype(np.int64), 1 - abortion_rate)
+    born = rng.poisson(piglets_per_cycle * pregnant)
+    weaned = rng.binomial(born, 1 - piglet_mortality)
+    return mated, weaned.astype(float)
+
+
+def _run_chunk(start, stop, n_replications, seed_seqs, months, params):
+    """Simulate replications ``start:stop``; ``seed_seqs`` are the streams of the blocks they fall in."""
+    first_block = start // SEED_BLOCK
+    draws = []
+    for i, seed_seq in enumerate(seed_seqs, first_block):
+        n = min(SEED_BLOCK, n_replications - i * SEED_BLOCK)
+        draws.append(sample_cohorts(np.random.default_rng(seed_seq), n, months, params['total_sows'],
+                                    params['piglets_per_cycle'], params['piglet_mortality'],
+                                    params['abortion_rate']))
+    offset = first_block * SEED_BLOCK
+    sows_crossed, cohort = (np.concatenate(d)[start - offset:stop - offset] for d in zip(*draws))
+    r = simulate_arrays(months, sows_crossed=sows_crossed, cohort=cohort, **params)
+    return r['Cumulative_Cash_Flow'], compute_kpis(r, months)
+
+
+def monte_carlo(n_replications=10_000, seed=0, chunk_size=1_000, workers=None, months=60, **params):
+    """Run ``n_replications`` sampled trajectories of the monthly model.
+
+    Returns ``MonteCarloResult(cumulative_cash_flow, kpis, prob_no_break_even)``:
+    a (replications, months) array of cumulative cash flow, a per-replication KPI
+    DataFrame (break-even month is NaN when not reached) and the share of
+    replications that never break even. ``workers=1`` runs in-process.
+    """
+    if n_replications < 1:
+        raise ValueError(f"n_replications must be at least 1, got {n_replications}")
+    params = {**DEFAULT_PARAMS, **params}
+    seeds = np.random.SeedSequence(seed).spawn(-(-n_replications // SEED_BLOCK))
+    jobs = []
+    for start in range(0, n_replications, chunk_size):
+        stop = min(start + chunk_size, n_replications)
+        blocks = seeds[start // SEED_BLOCK:(stop - 1) // SEED_BLOCK + 1]
+        jobs.append((start, stop, n_replications, blocks, months, params))
+
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) == 1:
+        results = [_run_chunk(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+            results = list(pool.map(_run_chunk, *zip(*jobs)))
+
+    cumulative_cash_flow = np.concatenate([cum for cum, _ in results])
+    kpis = pd.concat([pd.DataFrame(k) for _, k in results], ignore_index=True)
+    prob_no_break_even = float(kpis['break_even_month'].isna().mean())
+    return MonteCarloResult(cumulative_cash_flow, kpis, prob_no_break_even)
+
+
+def cash_flow_quantiles(result, q=(0.05, 0.5, 0.95)):
+    """Per-month quantiles of cumulative cash flow as a DataFrame (one column per quantile)."""
+    values = np.quantile(result.cumulative_cash_flow, q, axis=0)
+    months = np.arange(1, values.shape[1] + 1)
+    return pd.DataFrame(values.T, index=pd.Index(months, name='Month'), columns=[f"p{round(x * 100)}" for x in q])
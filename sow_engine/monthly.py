@@ -0,0 +1,235 @@
+"""Batch rotation simulator with monthly sales (from ``hosh_sow_calculator_monthly.py``).
+
+This is the reference loop implementation; ``sow_engine.cohort`` is the
+vectorized equivalent with the same arguments and return tuple.
+"""
+
+import math
+
+from .loans import amortization_schedule
+from .scheduler import BatchScheduler
+from .frames import column_buffers, trim
+from .streaming import collect, records
+
+MONTHLY_COLUMNS = [
+    'Month', 'Sows_Crossed', 'Piglets_Born_Alive', 'Growers', 'Sold_Pigs',
+    'Sow_Feed_Cost', 'Grower_Feed_Cost', 'Staff_Cost', 'Other_Fixed_Costs',
+    'Mgmt_Fee', 'Mgmt_Comm', 'Total_Operating_Cost', 'Revenue', 'Loan_EMI',
+    'Depreciation', 'Monthly_Cash_Flow', 'Monthly_Profit', 'Cumulative_Cash_Flow',
+]
+# Mated sows are a head count: rounded per month as in the original tables
+INT_COLUMNS = ('Month', 'Sows_Crossed')
+
+# -------------------------------
+# Sow Rotation Simulator with realistic monthly sales
+# -------------------------------
+def sow_rotation_simulator(
+    total_sows=30,
+    piglets_per_cycle=10,
+    piglet_mortality=0.07,
+    abortion_rate=0.0,
+    sow_feed_price=30,
+    sow_feed_intake=2.8,
+    grower_feed_price=30,
+    fcr=3.1,
+    final_weight=105,
+    sale_price=180,
+    management_fee=0,
+    management_commission=0.0,
+    supervisor_salary=25000,
+    worker_salary=18000,
+    n_workers=2,
+    shed_cost=1_500_000,
+    shed_life_years=10,
+    sow_cost=35000,
+    sow_life_years=4,
+    loan_amount=0,
+    interest_rate=0.1,
+    loan_tenure_years=5,
+    moratorium_months=0,
+    medicine_cost=10000,
+    electricity_cost=5000,
+    land_lease=10000,
+    months=60
+):
+    params = dict(locals())
+    import pandas as pd
+
+    chunks, totals = collect(iter_monthly_chunks(**params, chunk_months=months))
+
+    df_month = pd.DataFrame(chunks[0], copy=False)
+
+    # Yearly summary
+    df_year = df_month.groupby(((df_month['Month']-1)//12)*12).sum()
+    df_year.index = [f"Year {i+1}" for i in range(len(df_year))]
+
+    df_year['Cash_Profit'] = df_year['Revenue'] - df_year['Total_Operating_Cost']
+    df_year['Profit_After_Dep_Loan'] = df_year['Cash_Profit'] - df_year['Depreciation'] - df_year['Loan_EMI']
+
+    df_year['Total_Crossings'] = df_month.groupby(((df_month['Month']-1)//12)*12)['Sows_Crossed'].sum().values
+
+    return (df_month, df_year, totals['total_sow_cost'], shed_cost, totals['first_sale_cash_needed'],
+            totals['total_pigs_sold'], totals['total_pigs_born'], totals['animals_left'],
+            totals['cumulative_cash_flow'], totals['total_interest_paid'])
+
+
+def iter_monthly_records(**params):
+    """Yield one record dict per month (arguments as ``iter_monthly_chunks``);
+    the generator returns the end-of-run totals."""
+    return (yield from records(iter_monthly_chunks(**params)))
+
+
+def iter_monthly_chunks(
+    total_sows=30,
+    piglets_per_cycle=10,
+    piglet_mortality=0.07,
+    abortion_rate=0.0,
+    sow_feed_price=30,
+    sow_feed_intake=2.8,
+    grower_feed_price=30,
+    fcr=3.1,
+    final_weight=105,
+    sale_price=180,
+    management_fee=0,
+    management_commission=0.0,
+    supervisor_salary=25000,
+    worker_salary=18000,
+    n_workers=2,
+    shed_cost=1_500_000,
+    shed_life_years=10,
+    sow_cost=35000,
+    sow_life_years=4,
+    loan_amount=0,
+    interest_rate=0.1,
+    loan_tenure_years=5,
+    moratorium_months=0,
+    medicine_cost=10000,
+    electricity_cost=5000,
+    land_lease=10000,
+    months=60,
+    chunk_months=120
+):
+    """Yield ``MONTHLY_COLUMNS`` arrays for up to ``chunk_months`` months at a time;
+    the generator returns the end-of-run totals.
+
+    Memory stays constant in ``months``: sold batches are retired, the loan
+    schedule only covers the loan tenure and each chunk gets fresh buffers.
+    """
+    if chunk_months < 1:
+        raise ValueError(f"chunk_months must be at least 1, got {chunk_months}")
+    current_sows = total_sows
+
+    shed_dep_rate = 1 / (shed_life_years * 12)
+    sow_dep_rate = 1 / (sow_life_years * 12)
+
+    # Interest is paid during the moratorium, then the EMI amortizes the loan
+    loan_months = max(min(months, math.ceil(loan_tenure_years * 12)), 1)
+    loan = amortization_schedule(loan_amount, interest_rate, loan_tenure_years * 12, loan_months, moratorium_months)
+    loan_payments = loan['payment'].tolist()
+
+    average_cycle_length = 3.8 + 1.3 + 0.33
+    sows_to_mate_per_month = total_sows / average_cycle_length
+
+    scheduler = BatchScheduler()
+    total_sow_cost = sow_cost * total_sows
+    total_capital_invested = shed_cost + total_sow_cost
+    cumulative_cash_flow = -total_capital_invested
+    total_pigs_born = 0
+    total_pigs_sold = 0
+
+    first_sale_cash_needed = 0
+    first_sale_done = False
+
+    cols = column_buffers(MONTHLY_COLUMNS, min(chunk_months, months), int_columns=INT_COLUMNS)
+    for month in range(1, months + 1):
+        sow_feed_cost = current_sows * sow_feed_intake * 30 * sow_feed_price
+        staff_cost = supervisor_salary + n_workers * worker_salary
+        mgmt_fixed = management_fee
+
+        sows_crossed = 0
+        if month >= 2:
+            sows_to_mate = sows_to_mate_per_month
+            sows_pregnant = sows_to_mate * (1 - abortion_rate)
+            sows_crossed = sows_to_mate  # track how many sows were crossed this month
+            if sows_pregnant > 0:
+                farrow_month = month + 4
+                wean_month = farrow_month + 1
+                grower_start_month = wean_month
+                grower_end_month = grower_start_month + 6
+                piglets = sows_pregnant * piglets_per_cycle * (1 - piglet_mortality)
+                total_pigs_born += piglets
+                scheduler.new_batch(farrow_month, wean_month, grower_start_month, grower_end_month,
+                                    piglets, (piglets * fcr * final_weight) / 6)
+      
+
+        # Apply this month's farrow / wean / grower events
+        newly_ready = scheduler.advance(month)
+        # Count piglets in lactation
+        piglets_with_sow = scheduler.lactating_piglets()
+        # Count growers
+        current_growers = scheduler.growers()
+        # Calculate grower feed
+        grower_feed_cost = scheduler.grower_feed_cost(grower_feed_price)
+
+        sold_pigs = 0
+        revenue = 0
+        # Monthly sale logic (sell every batch that became ready this month)
+        if newly_ready:
+            pigs_sold_this_month = scheduler.sell(newly_ready)
+            revenue += pigs_sold_this_month * final_weight * sale_price
+            sold_pigs = pigs_sold_this_month
+            total_pigs_sold += sold_pigs
+            current_growers -= sold_pigs
+
+        # Track first sale working capital
+        if not first_sale_done:
+            first_sale_cash_needed += sow_feed_cost + grower_feed_cost + staff_cost + mgmt_fixed + medicine_cost + electricity_cost + land_lease
+        if sold_pigs > 0 and not first_sale_done:
+            first_sale_done = True
+
+        mgmt_comm_cost = revenue * management_commission
+        other_fixed = medicine_cost + electricity_cost + land_lease
+        total_operating_cost = sow_feed_cost + grower_feed_cost + staff_cost + mgmt_fixed + mgmt_comm_cost + other_fixed
+        dep = shed_cost * shed_dep_rate + total_sow_cost * sow_dep_rate
+
+        loan_payment = loan_payments[month - 1] if month <= loan_months else 0.0
+
+        monthly_profit = revenue - total_operating_cost - dep - loan_payment
+        monthly_cash_flow = revenue - total_operating_cost - loan_payment
+        cumulative_cash_flow += monthly_cash_flow
+
+        i = (month - 1) % chunk_months
+        cols['Month'][i] = month
+        cols['Sows_Crossed'][i] = round(sows_crossed)
+        cols['Piglets_Born_Alive'][i] = piglets_with_sow
+        cols['Growers'][i] = current_growers
+        cols['Sold_Pigs'][i] = sold_pigs
+        cols['Sow_Feed_Cost'][i] = sow_feed_cost
+        cols['Grower_Feed_Cost'][i] = grower_feed_cost
+        cols['Staff_Cost'][i] = staff_cost
+        cols['Other_Fixed_Costs'][i] = other_fixed
+        cols['Mgmt_Fee'][i] = mgmt_fixed
+        cols['Mgmt_Comm'][i] = mgmt_comm_cost
+        cols['Total_Operating_Cost'][i] = total_operating_cost
+        cols['Revenue'][i] = revenue
+        cols['Loan_EMI'][i] = loan_payment
+        cols['Depreciation'][i] = dep
+        cols['Monthly_Cash_Flow'][i] = monthly_cash_flow
+        cols['Monthly_Profit'][i] = monthly_profit
+        cols['Cumulative_Cash_Flow'][i] = cumulative_cash_flow
+        if i == chunk_months - 1 or month == months:
+            yield trim(cols, i + 1)
+            cols = column_buffers(MONTHLY_COLUMNS, min(chunk_months, months - month), int_columns=INT_COLUMNS)
+
+    return {
+        'total_sow_cost': total_sow_cost,
+        'first_sale_cash_needed': first_sale_cash_needed,
+        'total_pigs_sold': total_pigs_sold,
+        'total_pigs_born': total_pigs_born,
+        # Total animals left in shed
+        'animals_left': scheduler.animals_left(months),
+        'cumulative_cash_flow': cumulative_cash_flow,
+        # Interest charged within the simulation, from the same schedule as the payments
+        'total_interest_paid': float(loan['interest'].sum()),
+    }
+
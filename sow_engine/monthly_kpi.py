@@ -0,0 +1,339 @@
+"""Monthly-sale simulator with break-even, ROI and CAGR outputs (from ``sowcalcmonthly_withgraphs.py``)."""
+
+import math
+
+import numpy as np
+
+from .frames import column_buffers, trim
+from .loans import amortization_schedule
+from .scheduler import BatchScheduler
+from .streaming import collect, records
+from .timing import phase
+
+MONTHLY_COLUMNS = [
+    'Month', 'Sows_Crossed', 'Piglets_Born_Alive', 'Growers', 'Sold_Pigs',
+    'Sow_Feed_Cost', 'Grower_Feed_Cost', 'Staff_Cost', 'Other_Fixed_Costs',
+    'Mgmt_Fee', 'Mgmt_Comm', 'Total_Operating_Cost', 'Revenue', 'Monthly_Profit',
+    'Loan_EMI', 'Monthly_Cash_Flow', 'Depreciation',
+]
+# Mated sows are a head count: rounded per month as in the original tables
+INT_COLUMNS = ('Month', 'Sows_Crossed')
+
+# -------------------------------
+# Sow Rotation Simulator Function
+# -------------------------------
+def sow_rotation_simulator(
+    total_sows=30,
+    piglets_per_cycle=10,
+    piglet_mortality=0.07,
+    abortion_rate=0.0,
+    sow_feed_price=30,
+    sow_feed_intake=2.8,
+    grower_feed_price=30,
+    fcr=3.1,
+    final_weight=105,
+    sale_price=180,
+    management_fee=0,
+    management_commission=0.0,
+    supervisor_salary=25000,
+    worker_salary=18000,
+    n_workers=2,
+    shed_cost=1_500_000,
+    shed_life_years=10,
+    sow_cost=35000,
+    sow_life_years=4,
+    loan_amount=4_000_000,
+    interest_rate=0.121,
+    loan_tenure_years=5,
+    moratorium_months=0,
+    medicine_cost=10000,
+    electricity_cost=5000,
+    land_lease=10000,
+    months=60
+):
+    params = dict(locals())
+    with phase('simulation_loop'):
+        chunks, totals = collect(iter_monthly_chunks(**params, chunk_months=months))
+    first_sale_cash_needed = totals['first_sale_cash_needed']
+    animals_left = totals['animals_left']
+
+    with phase('groupby'):
+        df_month, df_year = monthly_frames(chunks[0])
+
+    # Initial Investment
+    total_sow_cost = total_sows * sow_cost
+    shed_cost_val = shed_cost
+    initial_investment = shed_cost + total_sow_cost 
+
+    with phase('kpis'):
+        (cumulative_cash_flow, break_even_month, profit_after_break_even, avg_profit_after_breakeven,
+         average_monthly_profit, roi_cash_pct, realized_cagr) = cash_flow_kpis(
+            df_month, initial_investment, first_sale_cash_needed, months)
+    final_cumulative_cash_flow = cumulative_cash_flow[-1]
+
+    # ROI including remaining assets
+    remaining_shed_value = shed_cost * (1 - months / (shed_life_years * 12))
+    remaining_sow_value = total_sow_cost * (1 - months / (sow_life_years * 12))
+    remaining_animals_value = animals_left * 12000  # approximate value of remaining pigs
+    roi_with_assets_pct = ((final_cumulative_cash_flow + remaining_shed_value + remaining_sow_value + remaining_animals_value) / (first_sale_cash_needed + initial_investment - 1)) * 100
+
+    # Total crossings (optional)
+    total_crossings = df_month['Sows_Crossed'].sum() if 'Sows_Crossed' in df_month.columns else 0
+
+    return (
+        df_month,
+        df_year,
+        total_sow_cost,
+        shed_cost_val,
+        first_sale_cash_needed,
+        totals['total_pigs_sold'],
+        totals['total_pigs_born'],
+        animals_left,
+        cumulative_cash_flow,
+        totals['total_interest_paid'],
+        break_even_month,
+        profit_after_break_even,
+        average_monthly_profit,
+        avg_profit_after_breakeven,
+        total_crossings,
+        roi_with_assets_pct,
+        roi_cash_pct,
+        realized_cagr
+    )
+
+
+# Names of the scalar entries of the ``sow_rotation_simulator`` tuple, in order
+# (the cumulative cash flow array is kept as its final value)
+RESULT_SCALARS = [
+    'total_sow_cost', 'shed_cost', 'first_sale_cash_needed', 'total_pigs_sold',
+    'total_pigs_born', 'animals_left', 'final_cumulative_cash_flow', 'total_interest_paid',
+    'break_even_month', 'profit_after_break_even', 'average_monthly_profit',
+    'avg_profit_after_breakeven', 'total_crossings', 'roi_with_assets_pct', 'roi_cash_pct',
+    'realized_cagr',
+]
+
+
+def result_scalars(results):
+    """Scalar results of a ``sow_rotation_simulator`` tuple as a dict (for ``store.ResultStore``)."""
+    values = list(results[2:])
+    values[6] = values[6][-1]
+    return dict(zip(RESULT_SCALARS, values))
+
+
+def results_from_frame(df_month, scalars):
+    """Rebuild the ``sow_rotation_simulator`` tuple from a stored ``df_month`` and ``result_scalars``."""
+    _, df_year = monthly_frames({name: df_month[name] for name in MONTHLY_COLUMNS})
+    values = [float('nan') if scalars.get(name) is None else scalars[name] for name in RESULT_SCALARS]
+    values[6] = df_month['Cumulative_Cash_Flow'].to_numpy()
+    values[8] = scalars.get('break_even_month')
+    if values[8] is not None:
+        values[8] = int(values[8])
+    return (df_month, df_year, *values)
+
+
+def iter_monthly_records(**params):
+    """Yield one record dict per month (arguments as ``iter_monthly_chunks``);
+    the generator returns the end-of-run totals."""
+    return (yield from records(iter_monthly_chunks(**params)))
+
+
+def iter_monthly_chunks(
+    total_sows=30,
+    piglets_per_cycle=10,
+    piglet_mortality=0.07,
+    abortion_rate=0.0,
+    sow_feed_price=30,
+    sow_feed_intake=2.8,
+    grower_feed_price=30,
+    fcr=3.1,
+    final_weight=105,
+    sale_price=180,
+    management_fee=0,
+    management_commission=0.0,
+    supervisor_salary=25000,
+    worker_salary=18000,
+    n_workers=2,
+    shed_cost=1_500_000,
+    shed_life_years=10,
+    sow_cost=35000,
+    sow_life_years=4,
+    loan_amount=4_000_000,
+    interest_rate=0.121,
+    loan_tenure_years=5,
+    moratorium_months=0,
+    medicine_cost=10000,
+    electricity_cost=5000,
+    land_lease=10000,
+    months=60,
+    chunk_months=120
+):
+    """Yield ``MONTHLY_COLUMNS`` arrays for up to ``chunk_months`` months at a time;
+    the generator returns the end-of-run totals.
+
+    Memory stays constant in ``months``: sold batches are retired, the loan
+    schedule only covers the loan tenure and each chunk gets fresh buffers.
+    """
+    if chunk_months < 1:
+        raise ValueError(f"chunk_months must be at least 1, got {chunk_months}")
+    # ----- Initialize -----
+    current_sows = total_sows
+
+    shed_dep_rate = 1 / (shed_life_years * 12)
+    sow_dep_rate = 1 / (sow_life_years * 12)
+
+    # Loan schedule: moratorium interest is capitalized, then the EMI amortizes the loan
+    loan_months = max(min(months, math.ceil(loan_tenure_years * 12)), 1)
+    with phase('loan_schedule'):
+        loan = amortization_schedule(loan_amount, interest_rate, loan_tenure_years * 12, loan_months,
+                                     moratorium_months, capitalize=True)
+    loan_payments = loan['payment'].tolist()
+
+    # Sow mating logic
+    average_cycle_length = 3.8 + 1.3 + 0.33
+    sows_to_mate_per_month = total_sows / average_cycle_length
+
+    scheduler = BatchScheduler()
+    total_sow_cost = sow_cost * total_sows
+    total_capital = shed_cost + total_sow_cost  # initial capital
+    total_pigs_born = 0
+    total_pigs_sold = 0
+
+    first_sale_cash_needed = 0
+    first_sale_done = False
+
+    # ----- Monthly Simulation -----
+    cols = column_buffers(MONTHLY_COLUMNS, min(chunk_months, months), int_columns=INT_COLUMNS)
+    for month in range(1, months + 1):
+        # Costs
+        sow_feed_cost = current_sows * sow_feed_intake * 30 * sow_feed_price
+        staff_cost = supervisor_salary + n_workers * worker_salary
+        mgmt_fixed = management_fee
+        other_fixed = medicine_cost + electricity_cost + land_lease
+
+        # Mating & Piglets
+        sows_crossed = 0
+        if month >= 2:
+            sows_to_mate = sows_to_mate_per_month
+            sows_pregnant = sows_to_mate * (1 - abortion_rate)
+            sows_crossed = sows_to_mate
+            if sows_pregnant > 0:
+                farrow_month = month + 4
+                wean_month = farrow_month + 1
+                grower_start_month = wean_month
+                grower_end_month = grower_start_month + 6
+                piglets = sows_pregnant * piglets_per_cycle * (1 - piglet_mortality)
+                total_pigs_born += piglets
+                scheduler.new_batch(farrow_month, wean_month, grower_start_month, grower_end_month,
+                                    piglets, (piglets * fcr * final_weight) / 6)
+
+        # Apply this month's farrow / wean / grower events
+        newly_ready = scheduler.advance(month)
+
+        # Lactating piglets
+        piglets_with_sow = scheduler.lactating_piglets()
+        current_growers = scheduler.growers()
+        grower_feed_cost = scheduler.grower_feed_cost(grower_feed_price)
+
+        # Sell every batch that became ready this month
+        sold_pigs = 0
+        revenue = 0
+        if newly_ready:
+            pigs_sold_this_month = scheduler.sell(newly_ready)
+            revenue += pigs_sold_this_month * final_weight * sale_price
+            sold_pigs = pigs_sold_this_month
+            total_pigs_sold += sold_pigs
+
+        # Track first sale working capital
+        if not first_sale_done:
+            first_sale_cash_needed += sow_feed_cost + grower_feed_cost + staff_cost + mgmt_fixed + other_fixed
+        if sold_pigs > 0 and not first_sale_done:
+            first_sale_done = True
+
+        mgmt_comm_cost = revenue * management_commission
+        total_operating_cost = sow_feed_cost + grower_feed_cost + staff_cost + mgmt_fixed + mgmt_comm_cost + other_fixed
+        dep = shed_cost * shed_dep_rate + total_sow_cost * sow_dep_rate
+
+        # Loan Payment
+        loan_payment = loan_payments[month - 1] if month <= loan_months else 0.0
+
+        monthly_profit = revenue - total_operating_cost
+        monthly_cash_flow = revenue - total_operating_cost - loan_payment
+
+        i = (month - 1) % chunk_months
+        cols['Month'][i] = month
+        cols['Sows_Crossed'][i] = round(sows_crossed)
+        cols['Piglets_Born_Alive'][i] = piglets_with_sow
+        cols['Growers'][i] = current_growers
+        cols['Sold_Pigs'][i] = sold_pigs
+        cols['Sow_Feed_Cost'][i] = sow_feed_cost
+        cols['Grower_Feed_Cost'][i] = grower_feed_cost
+        cols['Staff_Cost'][i] = staff_cost
+        cols['Other_Fixed_Costs'][i] = other_fixed
+        cols['Mgmt_Fee'][i] = mgmt_fixed
+        cols['Mgmt_Comm'][i] = mgmt_comm_cost
+        cols['Total_Operating_Cost'][i] = total_operating_cost
+        cols['Revenue'][i] = revenue
+        cols['Monthly_Profit'][i] = monthly_profit
+        cols['Loan_EMI'][i] = loan_payment
+        cols['Monthly_Cash_Flow'][i] = monthly_cash_flow
+        cols['Depreciation'][i] = dep
+        if i == chunk_months - 1 or month == months:
+            yield trim(cols, i + 1)
+            cols = column_buffers(MONTHLY_COLUMNS, min(chunk_months, months - month), int_columns=INT_COLUMNS)
+
+    return {
+        'first_sale_cash_needed': first_sale_cash_needed,
+        'total_pigs_sold': total_pigs_sold,
+        'total_pigs_born': total_pigs_born,
+        # Animals left
+        'animals_left': int(scheduler.animals_left(months)),
+        # Total interest paid (from the same schedule as the payments)
+        'total_interest_paid': float(loan['interest'].sum()),
+    }
+
+
+def monthly_frames(columns):
+    """DataFrame build step: monthly column arrays -> (df_month, df_year)."""
+    import pandas as pd
+
+    df_month = pd.DataFrame(columns, copy=False)
+    df_year = df_month.groupby(((df_month['Month']-1)//12)*12).sum()
+    df_year.index = [f"Year {i+1}" for i in range(len(df_year))]
+    return df_month, df_year
+
+
+def cash_flow_kpis(df_month, initial_investment, first_sale_cash_needed, months):
+    """KPI post-processing: adds Cumulative_Cash_Flow to ``df_month`` and returns
+    (cumulative_cash_flow, break_even_month, profit_after_break_even,
+    avg_profit_after_breakeven, average_monthly_profit, roi_cash_pct, realized_cagr).
+    """
+    # ----- Cumulative Cash Flow (month by month, starting from -initial_investment) -----
+    cash_flows = df_month['Monthly_Cash_Flow'].to_numpy(dtype=float)
+    cumulative_cash_flow = np.cumsum(np.concatenate(([-initial_investment], cash_flows)))[1:]
+    df_month['Cumulative_Cash_Flow'] = cumulative_cash_flow
+
+    # Break-even
+    reached = cumulative_cash_flow >= 0
+    break_even_month = int(reached.argmax()) + 1 if reached.any() else None
+
+    # Profit After Break-even
+    if break_even_month:
+        profit_after_break_even = df_month['Monthly_Profit'].iloc[break_even_month:].sum()
+        avg_profit_after_breakeven = df_month['Monthly_Profit'].iloc[break_even_month:].mean()
+    else:
+        profit_after_break_even = 0
+        avg_profit_after_breakeven = 0
+
+    average_monthly_profit = df_month['Monthly_Profit'].mean()
+
+    # Cash-only CAGR
+    years = months / 12
+    final_cash = cumulative_cash_flow[-1] + initial_investment  # net cash returned
+    realized_cagr = (final_cash / (first_sale_cash_needed + initial_investment)) ** (1 / years) - 1
+
+    # ROI
+    final_cumulative_cash_flow = cumulative_cash_flow[-1]
+    roi_cash_pct = final_cumulative_cash_flow / (first_sale_cash_needed + initial_investment) * 100
+
+    return (cumulative_cash_flow, break_even_month, profit_after_break_even, avg_profit_after_breakeven,
+            average_monthly_profit, roi_cash_pct, realized_cagr)
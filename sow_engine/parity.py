@@ -0,0 +1,197 @@
+# -------------------------------
+# Parity-structured sow herd
+# -------------------------------
+"""Sow herd by parity with culling, mortality and gilt replacement.
+
+The herd is a state vector of shares of ``total_sows``:
+
+* initial gilts bought with the farm, mated over one cycle from month 2
+  (exactly like the flat model's matings);
+* replacement gilts, mated ``1 / gilt_entry_months`` per month;
+* sows carrying or nursing their k-th litter, k = 1 .. len(cull_rates).
+
+Each month a sow completes her cycle with probability ``1 / AVERAGE_CYCLE_LENGTH``;
+she is then culled with the ``cull_rates`` entry of her parity or re-mated into
+the next parity (sows kept after the last parity stay in it; the default rates
+cull them all). ``sow_mortality`` removes sows every month. Every culled or
+dead sow is replaced by a gilt, so the herd stays at ``total_sows`` and sow
+feed is unchanged; the gilts' purchase is covered by sow depreciation, as in
+the flat model. With no culling, no mortality and flat litter factors the
+herd mates ``total_sows / AVERAGE_CYCLE_LENGTH`` a month from month 2, i.e.
+it reproduces ``cohort``.
+
+One month is one matrix-vector step, and the state is a share of the herd, so
+the projection runs once per set of rates and is then scaled by ``total_sows``
+(and ``piglets_per_cycle``, mortality ...) for any number of scenarios.
+Matings and the parity mix of each month's litters replace the constant
+mating rate and litter size of ``cohort.expected_cohorts``.
+"""
+
+import numpy as np
+
+from .cohort import (AVERAGE_CYCLE_LENGTH, DEFAULT_PARAMS, FIRST_MATING_MONTH, _col,
+                     monthly_frame, simulate_arrays as cohort_simulate_arrays, yearly_summary)
+
+# Litter size relative to ``piglets_per_cycle`` for parity 1, 2, ...
+PARITY_LITTER_FACTORS = (0.88, 0.95, 1.0, 1.02, 1.02, 1.0, 0.96, 0.92)
+# Share of sows culled at weaning of their parity 1, 2, ... litter
+PARITY_CULL_RATES = (0.12, 0.10, 0.10, 0.12, 0.15, 0.20, 0.30, 1.0)
+DEFAULT_HERD_MODEL = dict(
+    litter_factors=PARITY_LITTER_FACTORS,
+    cull_rates=PARITY_CULL_RATES,
+    sow_mortality=0.004,
+    gilt_entry_months=1.5,
+)
+
+
+def projection_matrix(cull_rates=PARITY_CULL_RATES, sow_mortality=DEFAULT_HERD_MODEL['sow_mortality'],
+                      gilt_entry_months=DEFAULT_HERD_MODEL['gilt_entry_months']):
+    """Monthly step of the herd state: ``(M, mated, litters)``.
+
+    State order is [initial gilts, replacement gilts, parity 1 .. P]. ``M`` maps
+    this month's state to the next, ``mated @ state`` is the share of the herd
+    mated this month and ``litters`` (P, states) splits those matings by the
+    parity of the litter they produce.
+    """
+    cull = np.asarray(cull_rates, dtype=float)
+    n_parities = len(cull)
+    n = n_parities + 2
+    cycle_rate = 1 / AVERAGE_CYCLE_LENGTH
+    gilt_rate = min(1 / gilt_entry_months, 1.0)
+
+    litters = np.zeros((n_parities, n))
+    litters[0, 0] = cycle_rate
+    litters[0, 1] = gilt_rate
+    for k in range(n_parities):
+        litters[min(k + 1, n_parities - 1), 2 + k] += cycle_rate * (1 - cull[k])
+
+    M = np.zeros((n, n))
+    M[0, 0] = 1 - cycle_rate
+    M[1, 1] = 1 - gilt_rate
+    M[2:, :] += litters
+    for k in range(n_parities):
+        M[2 + k, 2 + k] += 1 - cycle_rate
+    survive = 1 - sow_mortality
+    M[2:, 2:] *= survive
+    # culled and dead sows come back as replacement gilts, so each column sums to 1
+    M[1, :] += 1 - M.sum(axis=0)
+    return M, litters.sum(axis=0), litters
+
+
+def herd_projection(months=60, cull_rates=PARITY_CULL_RATES, sow_mortality=DEFAULT_HERD_MODEL['sow_mortality'],
+                    gilt_entry_months=DEFAULT_HERD_MODEL['gilt_entry_months']):
+    """Shares of the herd per month: ``(states, mated, litters)``.
+
+    ``states`` is (months, 2 + P) at the start of each month, ``mated`` (months,)
+    the share mated and ``litters`` (months, P) those matings by litter parity;
+    nobody is mated before ``FIRST_MATING_MONTH``.
+    """
+    M, _, litter_rows = projection_matrix(cull_rates, sow_mortality, gilt_entry_months)
+    states = np.zeros((months, M.shape[0]))
+    state = np.zeros(M.shape[0])
+    state[0] = 1.0
+    for i in range(months):
+        states[i] = state
+        if i + 1 >= FIRST_MATING_MONTH:
+            state = M @ state
+    litters = states @ litter_rows.T
+    litters[:FIRST_MATING_MONTH - 1] = 0.0
+    return states, litters.sum(axis=1), litters
+
+
+def parity_cohorts(months, total_sows, piglets_per_cycle, piglet_mortality, abortion_rate,
+                   litter_factors=PARITY_LITTER_FACTORS, cull_rates=PARITY_CULL_RATES,
+                   sow_mortality=DEFAULT_HERD_MODEL['sow_mortality'],
+                   gilt_entry_months=DEFAULT_HERD_MODEL['gilt_entry_months']):
+    """``cohort.expected_cohorts`` for the parity-structured herd: (sows_crossed, cohort)."""
+    if len(litter_factors) != len(cull_rates):
+        raise ValueError("litter_factors and cull_rates need one entry per parity")
+    _, mated, litters = herd_projection(months, cull_rates, sow_mortality, gilt_entry_months)
+    litter_share = litters @ np.asarray(litter_factors, dtype=float)
+
+    sows_crossed = _col(total_sows) * mated
+    cohort = (_col(total_sows) * litter_share * (1 - _col(abortion_rate))
+              * _col(piglets_per_cycle) * (1 - _col(piglet_mortality)))
+    return sows_crossed, cohort
+
+
+def simulate_arrays(months=60, capitalize_interest=False, herd_model=None, **params):
+    """``cohort.simulate_arrays`` driven by the parity-structured herd.
+
+    ``herd_model`` overrides ``DEFAULT_HERD_MODEL`` entries.
+    """
+    model = {**DEFAULT_HERD_MODEL, **(herd_model or {})}
+    p = {name: params.get(name, DEFAULT_PARAMS[name])
+         for name in ('total_sows', 'piglets_per_cycle', 'piglet_mortality', 'abortion_rate')}
+    sows_crossed, cohort = parity_cohorts(months, **p, **model)
+    return cohort_simulate_arrays(months, sows_crossed, cohort, capitalize_interest, **params)
+
+
+def herd_frame(months=60, total_sows=DEFAULT_PARAMS['total_sows'], herd_model=None):
+    """Sows by state per month (Gilts, Parity_1 .. Parity_P), matings and average litter factor."""
+    import pandas as pd
+
+    model = {**DEFAULT_HERD_MODEL, **(herd_model or {})}
+    states, mated, litters = herd_projection(months, model['cull_rates'], model['sow_mortality'],
+                                             model['gilt_entry_months'])
+    n_parities = states.shape[1] - 2
+    data = {'Month': np.arange(1, months + 1), 'Gilts': total_sows * states[:, :2].sum(axis=1)}
+    for k in range(n_parities):
+        data[f'Parity_{k + 1}'] = total_sows * states[:, 2 + k]
+    data['Sows_Crossed'] = total_sows * mated
+    with np.errstate(invalid='ignore', divide='ignore'):
+        data['Litter_Factor'] = litters @ np.asarray(model['litter_factors'], dtype=float) / mated
+    return pd.DataFrame(data)
+
+
+def sow_rotation_simulator(
+    total_sows=30,
+    piglets_per_cycle=10,
+    piglet_mortality=0.07,
+    abortion_rate=0.0,
+    sow_feed_price=30,
+    sow_feed_intake=2.8,
+    grower_feed_price=30,
+    fcr=3.1,
+    final_weight=105,
+    sale_price=180,
+    management_fee=0,
+    management_commission=0.0,
+    supervisor_salary=25000,
+    worker_salary=18000,
+    n_workers=2,
+    shed_cost=1_500_000,
+    shed_life_years=10,
+    sow_cost=35000,
+    sow_life_years=4,
+    loan_amount=0,
+    interest_rate=0.1,
+    loan_tenure_years=5,
+    moratorium_months=0,
+    medicine_cost=10000,
+    electricity_cost=5000,
+    land_lease=10000,
+    months=60,
+    herd_model=None,
+):
+    """Return tuple of ``cohort.sow_rotation_simulator`` with a parity-structured herd."""
+    params = dict(locals())
+    months = params.pop('months')
+    herd_model = params.pop('herd_model')
+    r = simulate_arrays(months, herd_model=herd_model, **params)
+
+    df_month = monthly_frame(r)
+    df_year = yearly_summary(df_month)
+
+    return (
+        df_month,
+        df_year,
+        float(r['total_sow_cost']),
+        shed_cost,
+        float(r['first_sale_cash_needed']),
+        float(r['total_pigs_sold']),
+        float(r['total_pigs_born']),
+        float(r['animals_left']),
+        float(r['final_cumulative_cash_flow']),
+        float(r['total_interest_paid']),
+    )
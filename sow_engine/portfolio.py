@@ -0,0 +1,133 @@
+# -------------------------------
+# Multi-farm portfolio simulation
+# -------------------------------
+"""Simulate many sheds at once and consolidate them on one calendar.
+
+Farms are given as a table like ``simulate_batch`` scenarios (one row per farm,
+parameter columns, missing ones take the defaults) plus two optional columns:
+``farm`` (a label) and ``start_month`` (calendar month the farm starts in, 1 by
+default). Each farm runs its own timeline from its start month; before that it
+contributes zeros.
+
+Farms are split into chunks that run on the vectorized cohort engine in a
+process pool. Workers write their rows straight into one
+``multiprocessing.shared_memory`` block of shape (columns, farms, months), so
+only parameter rows go to the workers and nothing large comes back pickled.
+"""
+
+import math
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import pandas as pd
+
+from .batch import scenario_table
+from .cohort import PARAM_NAMES, simulate_arrays
+
+PORTFOLIO_COLUMNS = (
+    'Sows_Crossed', 'Piglets_Born_Alive', 'Growers', 'Sold_Pigs',
+    'Revenue', 'Total_Operating_Cost', 'Loan_EMI', 'Loan_Interest', 'Loan_Balance',
+    'Monthly_Cash_Flow', 'Cumulative_Cash_Flow',
+)
+
+PortfolioResult = namedtuple('PortfolioResult', ['farms', 'per_farm', 'consolidated'])
+
+
+def _attach(name):
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)
+    except TypeError:  # Python < 3.13 has no ``track``
+        return shared_memory.SharedMemory(name=name)
+
+
+def _shift_to_calendar(x, start_month):
+    """Move (farms, months) farm-timeline rows so farm month 1 lands on ``start_month``."""
+    months = x.shape[-1]
+    calendar = np.arange(months) - (start_month[:, None] - 1)
+    index = np.clip(calendar, 0, months - 1)
+    return np.where(calendar >= 0, np.take_along_axis(x, index, axis=-1), 0.0)
+
+
+def _fill_rows(out, start, stop, months, params, start_month):
+    """Simulate farms ``start:stop`` and write their calendar rows into ``out``."""
+    r = simulate_arrays(months, **params)
+    n = stop - start
+    for i, name in enumerate(PORTFOLIO_COLUMNS):
+        out[i, start:stop] = _shift_to_calendar(np.broadcast_to(r[name], (n, months)), start_month)
+
+
+def _run_chunk(shm_name, shape, start, stop, months, params, start_month):
+    shm = _attach(shm_name)
+    try:
+        out = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        _fill_rows(out, start, stop, months, params, start_month)
+        del out
+    finally:
+        shm.close()
+    return start, stop
+
+
+def simulate_portfolio(farms, months=60, workers=None, chunk_size=None):
+    """Run every farm and return ``PortfolioResult(farms, per_farm, consolidated)``.
+
+    ``per_farm`` maps each of ``PORTFOLIO_COLUMNS`` to a (farms, months) array on
+    the calendar (``Loan_EMI`` is the debt service, ``Loan_Balance`` the balance
+    at month end); ``consolidated`` is a DataFrame of the same columns summed
+    over farms. ``workers=1`` runs in-process; ``chunk_size`` defaults to an even
+    split of the farms over the workers.
+    """
+    table = farms.reset_index(drop=True) if isinstance(farms, pd.DataFrame) else pd.DataFrame(farms)
+    labels = table.pop('farm') if 'farm' in table.columns else pd.Series(range(1, len(table) + 1))
+    start_month = (table.pop('start_month') if 'start_month' in table.columns
+                   else pd.Series(1, index=table.index)).to_numpy(dtype=int)
+    if ((start_month < 1) | (start_month > months)).any():
+        raise ValueError(f"start_month must be between 1 and {months}")
+    table = scenario_table(table)
+    if 'months' in table.columns:
+        raise ValueError("Farms share the portfolio horizon; pass months= instead of a 'months' column")
+
+    n = len(table)
+    values = {name: table[name].to_numpy(dtype=float) for name in PARAM_NAMES}
+    workers = workers or os.cpu_count() or 1
+    chunk_size = chunk_size or max(math.ceil(n / workers), 1)
+    jobs = [(start, min(start + chunk_size, n)) for start in range(0, n, chunk_size)]
+
+    def job_args(start, stop):
+        return start, stop, months, {k: v[start:stop] for k, v in values.items()}, start_month[start:stop]
+
+    shape = (len(PORTFOLIO_COLUMNS), n, months)
+    if workers == 1 or len(jobs) <= 1:
+        data = np.zeros(shape)
+        for start, stop in jobs:
+            _fill_rows(data, *job_args(start, stop))
+    else:
+        shm = shared_memory.SharedMemory(create=True, size=max(math.prod(shape) * 8, 1))
+        try:
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+                futures = [pool.submit(_run_chunk, shm.name, shape, *job_args(start, stop)) for start, stop in jobs]
+                for future in futures:
+                    future.result()
+            data = np.ndarray(shape, dtype=np.float64, buffer=shm.buf).copy()
+        finally:
+            shm.close()
+            shm.unlink()
+
+    per_farm = {name: data[i] for i, name in enumerate(PORTFOLIO_COLUMNS)}
+    consolidated = pd.DataFrame({'Month': np.arange(1, months + 1),
+                                 **{name: per_farm[name].sum(axis=0) for name in PORTFOLIO_COLUMNS}})
+    farms_table = table[PARAM_NAMES].assign(start_month=start_month)
+    farms_table.insert(0, 'farm', labels.to_numpy())
+    return PortfolioResult(farms_table, per_farm, consolidated)
+
+
+def farm_frame(result, farm):
+    """Calendar DataFrame of one farm, selected by its ``farm`` label."""
+    matches = np.flatnonzero(result.farms['farm'].to_numpy() == farm)
+    if not len(matches):
+        raise KeyError(farm)
+    index = int(matches[0])
+    return pd.DataFrame({'Month': np.arange(1, result.consolidated.shape[0] + 1),
+                         **{name: values[index] for name, values in result.per_farm.items()}})
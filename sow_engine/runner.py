@@ -0,0 +1,317 @@
+# -------------------------------
+# Command-line batch runner
+# -------------------------------
+"""Run a file of scenarios through the engine and stream the results to disk.
+
+    python -m sow_engine scenarios.csv --out-dir results/
+    python -m sow_engine scenarios.parquet --out-dir results/ --workers 4 --columns Monthly_Cash_Flow
+
+The input has one row per scenario, with columns named like the
+``sow_rotation_simulator`` arguments (missing columns and blank cells take the
+defaults of the chosen engine, see ``engine_defaults``), an optional
+``months`` column and an optional ``scenario`` label (default: the 0-based
+row number). It is read ``--chunk-size`` rows at a time, and each chunk
+runs in a process pool:
+
+* ``--engine cohort`` (default) - one ``batch.simulate_batch`` call per chunk;
+* ``--engine monthly_kpi``      - ``monthly_kpi.sow_rotation_simulator`` row by
+  row, the model of ``sowcalcmonthly_withgraphs.py``.
+
+Finished chunks are appended, in input order, to ``kpis.csv`` (parameters and
+KPIs, one row per scenario) and ``monthly.csv`` (one row per scenario and
+month); ``--format parquet`` writes Parquet instead and, like Parquet input,
+needs ``pyarrow``. At most ``2 * workers`` chunks are in flight or waiting to
+be written, so memory depends on the chunk size, not on the input size.
+Progress goes to stderr; the exit status is non-zero if the input is invalid.
+"""
+
+import argparse
+import collections
+import inspect
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from .batch import scenario_table, simulate_batch
+from .cohort import DEFAULT_PARAMS, MONTHLY_COLUMNS
+
+ENGINES = ('cohort', 'monthly_kpi')
+OUTPUT_FORMATS = ('csv', 'parquet')
+
+
+def _require_pyarrow(what):
+    try:
+        import pyarrow  # noqa: F401
+        import pyarrow.parquet
+    except ImportError:
+        raise SystemExit(f"{what} needs pyarrow (pip install pyarrow)") from None
+    return pyarrow
+
+
+def engine_defaults(engine):
+    """Parameter defaults of ``engine``'s ``sow_rotation_simulator`` (without ``months``).
+
+    The engines disagree on some of them: ``monthly_kpi`` assumes a 4,000,000
+    loan at 12.1%, the cohort engine no loan.
+    """
+    if engine == 'cohort':
+        return dict(DEFAULT_PARAMS)
+    from .monthly_kpi import sow_rotation_simulator
+
+    return {name: p.default for name, p in inspect.signature(sow_rotation_simulator).parameters.items()
+            if name != 'months'}
+
+
+def scenario_rows(chunk, engine='cohort'):
+    """``chunk`` with every parameter of ``engine`` as a column, missing ones at that engine's defaults."""
+    if engine == 'cohort':
+        return scenario_table(chunk)
+    defaults = engine_defaults(engine)
+    unknown = set(chunk.columns) - set(defaults) - {'months'}
+    if unknown:
+        raise ValueError(f"Unknown parameters: {sorted(unknown)}")
+    table = chunk.reset_index(drop=True)
+    for name, default in defaults.items():
+        if name not in table.columns:
+            table[name] = default
+    return table[[*defaults, *(['months'] if 'months' in table.columns else [])]]
+
+
+def read_scenarios(path, chunk_size):
+    """Yield DataFrames of up to ``chunk_size`` scenario rows from a CSV or Parquet file."""
+    if path.endswith('.parquet'):
+        pa = _require_pyarrow('Parquet input')
+        for batch in pa.parquet.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+def count_scenarios(path):
+    """Number of scenario rows, for progress reporting (CSV: line count less the header)."""
+    if path.endswith('.parquet'):
+        return _require_pyarrow('Parquet input').parquet.ParquetFile(path).metadata.num_rows
+    with open(path, 'rb') as f:
+        return max(sum(1 for _ in f) - 1, 0)
+
+
+def _months_groups(table, months):
+    if 'months' not in table.columns:
+        return [(months, table)]
+    return [(int(horizon), group.drop(columns='months'))
+            for horizon, group in table.groupby('months', sort=False)]
+
+
+def _long_frame(scenarios, months, columns):
+    """Monthly (scenarios, months) arrays as a long frame: scenario, Month, columns..."""
+    n = len(scenarios)
+    data = {'scenario': np.repeat(np.asarray(scenarios), months),
+            'Month': np.tile(np.arange(1, months + 1), n)}
+    for name, values in columns.items():
+        data[name] = values.reshape(-1)
+    return pd.DataFrame(data, copy=False)
+
+
+def _run_cohort(labels, table, months, columns, capitalize_interest):
+    kpis, monthly, rows = [], [], []
+    for horizon, group in _months_groups(table, months):
+        result = simulate_batch(group, horizon, columns=columns, capitalize_interest=capitalize_interest)
+        kpis.append(pd.concat([result.params, result.kpis], axis=1).set_index(group.index))
+        if columns:
+            monthly.append(_long_frame(labels[group.index], horizon, result.monthly))
+            rows.append(np.repeat(group.index, horizon))
+    if len(monthly) > 1:
+        # horizon groups back in input order
+        order = np.argsort(np.concatenate(rows), kind='stable')
+        monthly = [pd.concat(monthly, ignore_index=True).iloc[order].reset_index(drop=True)]
+    return pd.concat(kpis).sort_index(), monthly
+
+
+def _run_monthly_kpi(labels, table, months, columns, capitalize_interest):
+    from .monthly_kpi import result_scalars, sow_rotation_simulator
+
+    kpis, monthly = [], []
+    for i, row in zip(table.index, table.to_dict('records')):
+        horizon = int(row.pop('months', months))
+        with np.errstate(invalid='ignore'):  # CAGR of a loss-making run is NaN
+            results = sow_rotation_simulator(**row, months=horizon)
+        kpis.append({**row, **result_scalars(results)})
+        if columns:
+            df_month = results[0]
+            monthly.append(_long_frame([labels[i]], horizon,
+                                       {name: df_month[name].to_numpy(dtype=float) for name in columns}))
+    return pd.DataFrame(kpis, index=table.index), monthly
+
+
+def _like_default(values, default):
+    """``values`` in the dtype of ``default``, so a column is written the same way in every chunk
+    whether or not it had blanks (whole numbers stay int64 for integer defaults)."""
+    if not pd.api.types.is_numeric_dtype(values) or isinstance(default, bool):
+        return values
+    if isinstance(default, int) and (values == values.round()).all():
+        return values.astype(np.int64)
+    return values.astype(np.float64)
+
+
+def run_chunk(chunk, months=60, engine='cohort', columns=None, capitalize_interest=False):
+    """Simulate one chunk of input rows: ``(kpis, monthly)`` DataFrames, ``monthly`` None without columns."""
+    chunk = chunk.reset_index(drop=True)
+    if 'scenario' in chunk.columns:
+        labels = chunk.pop('scenario')
+    else:
+        labels = pd.Series(np.arange(len(chunk)))
+    # blank cells take the defaults too
+    defaults = {**engine_defaults(engine), 'months': months}
+    chunk = chunk.fillna({name: value for name, value in defaults.items() if name in chunk.columns})
+    for name in chunk.columns.intersection(list(defaults)):
+        chunk[name] = _like_default(chunk[name], defaults[name])
+    table = scenario_rows(chunk, engine)
+    run = _run_cohort if engine == 'cohort' else _run_monthly_kpi
+    kpis, monthly = run(labels, table, months, columns, capitalize_interest)
+    kpis.insert(0, 'scenario', labels)
+    kpis.insert(1, 'months', table['months'].astype(int) if 'months' in table.columns else months)
+    monthly = pd.concat(monthly, ignore_index=True) if monthly else None
+    return kpis, monthly
+
+
+class _Sink:
+    """Append DataFrames to one CSV or Parquet file, opening it on the first write."""
+
+    def __init__(self, path, fmt):
+        self.path = path
+        self.fmt = fmt
+        self._writer = None
+        self._started = False
+
+    def write(self, df):
+        if self.fmt == 'parquet':
+            pa = _require_pyarrow('Parquet output')
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                self._writer = pa.parquet.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode='a' if self._started else 'w', header=not self._started, index=False)
+        self._started = True
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+class _Progress:
+    def __init__(self, total, stream=sys.stderr, every=1.0):
+        self.total = total
+        self.done = 0
+        self.stream = stream
+        self.every = every
+        self._start = self._last = time.perf_counter()
+
+    def update(self, n, force=False):
+        self.done += n
+        now = time.perf_counter()
+        if self.stream is None or (not force and now - self._last < self.every):
+            return
+        self._last = now
+        rate = self.done / max(now - self._start, 1e-9)
+        line = f"{self.done:,}"
+        if self.total:
+            eta = max(self.total - self.done, 0) / rate if rate else float('inf')
+            line += f"/{self.total:,} scenarios ({self.done / self.total:.0%}), {rate:,.0f}/s, ETA {eta:,.0f}s"
+        else:
+            line += f" scenarios, {rate:,.0f}/s"
+        print(line, file=self.stream, flush=True)
+
+
+def run_file(path, out_dir, months=60, engine='cohort', columns=None, chunk_size=500, workers=None,
+             fmt='csv', capitalize_interest=False, progress=sys.stderr):
+    """Simulate every scenario in ``path`` and write ``kpis`` and ``monthly`` files to ``out_dir``.
+
+    Chunks run in a process pool (``workers=1`` runs in-process) and are written
+    in input order as soon as they and every chunk before them are done.
+    Returns the number of scenarios simulated.
+    """
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}; choose from {ENGINES}")
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unknown format {fmt!r}; choose from {OUTPUT_FORMATS}")
+    if columns is None:
+        columns = [c for c in MONTHLY_COLUMNS if c != 'Month']
+    unknown = set(columns) - set(MONTHLY_COLUMNS)
+    if unknown:
+        raise ValueError(f"Unknown monthly columns: {sorted(unknown)}")
+    columns = [c for c in columns if c != 'Month']
+
+    os.makedirs(out_dir, exist_ok=True)
+    kpi_sink = _Sink(os.path.join(out_dir, f'kpis.{fmt}'), fmt)
+    monthly_sink = _Sink(os.path.join(out_dir, f'monthly.{fmt}'), fmt) if columns else None
+    tracker = _Progress(count_scenarios(path) if progress is not None else 0, progress)
+    workers = workers or os.cpu_count() or 1
+
+    def write(kpis, monthly):
+        kpi_sink.write(kpis)
+        if monthly is not None:
+            monthly_sink.write(monthly)
+        tracker.update(len(kpis))
+
+    def chunks():
+        start = 0
+        for chunk in read_scenarios(path, chunk_size):
+            if 'scenario' not in chunk.columns:
+                chunk.insert(0, 'scenario', np.arange(start, start + len(chunk)))
+            start += len(chunk)
+            yield chunk
+
+    try:
+        if workers == 1:
+            for chunk in chunks():
+                write(*run_chunk(chunk, months, engine, columns, capitalize_interest))
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                pending = collections.deque()
+                for chunk in chunks():
+                    if len(pending) >= 2 * workers:
+                        write(*pending.popleft().result())
+                    pending.append(pool.submit(run_chunk, chunk, months, engine, columns, capitalize_interest))
+                while pending:
+                    write(*pending.popleft().result())
+    finally:
+        kpi_sink.close()
+        if monthly_sink is not None:
+            monthly_sink.close()
+    tracker.update(0, force=True)
+    return tracker.done
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('scenarios', help='CSV or .parquet file, one row per scenario')
+    parser.add_argument('--out-dir', required=True, help='directory for the kpis and monthly files')
+    parser.add_argument('--engine', choices=ENGINES, default='cohort')
+    parser.add_argument('--months', type=int, default=60, help="horizon for rows without a 'months' column")
+    parser.add_argument('--columns', nargs='*', help='monthly columns to write (default: all; none: skip monthly)')
+    parser.add_argument('--chunk-size', type=int, default=500, help='scenarios per worker task')
+    parser.add_argument('--workers', type=int, help='worker processes (default: CPU count; 1: in-process)')
+    parser.add_argument('--format', choices=OUTPUT_FORMATS, default='csv', dest='fmt')
+    parser.add_argument('--capitalize-interest', action='store_true',
+                        help='cohort engine: moratorium interest capitalized, as in sowcalcmonthly_withgraphs.py')
+    parser.add_argument('--quiet', action='store_true', help='no progress on stderr')
+    args = parser.parse_args(argv)
+
+    try:
+        n = run_file(args.scenarios, args.out_dir, args.months, args.engine, args.columns, args.chunk_size,
+                     args.workers, args.fmt, args.capitalize_interest, None if args.quiet else sys.stderr)
+    except (ValueError, TypeError, FileNotFoundError) as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
+    if not args.quiet:
+        print(f"{n:,} scenarios written to {args.out_dir}", file=sys.stderr)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,191 @@
+# -------------------------------
+# Vectorized sale policies
+# -------------------------------
+"""When finished pigs are sold, as a policy applied to the cohort engine.
+
+Pigs reach market weight on the fixed timetable of ``cohort.herd_flow``. A
+sale policy decides, every month, which share of the pigs held past that
+point to sell. Held pigs are kept as age classes (months past market
+readiness), a (..., max_hold_months) array per scenario, so a policy is a mask
+or share over those classes rather than a walk over batches:
+
+* ``SellAll``        - everything the month it is ready (the default model);
+* ``EveryNMonths``   - sale days every ``n`` months, optionally dropping pigs
+  older than ``window`` months (the bimonthly calculator);
+* ``TargetWeight``   - each pig once it has grown to ``target_kg``;
+* ``MinimumLot``     - everything once at least ``lot_size`` pigs are waiting;
+* ``Capacity``       - hold pigs, selling the oldest only when growers plus
+  held pigs exceed ``max_pigs``;
+* ``PriceTriggered`` - everything when the sale price index reaches
+  ``threshold``; revenue is priced with the same index.
+
+Held pigs grow at ``growth_kg_per_day`` on grower feed (``fcr`` kg per kg
+gained), up to ``max_weight_kg``, and are sold at their grown weight for the
+same price per kg. Growth is 0 by default, except for ``TargetWeight``, so a
+timing policy is compared on timing and price rather than on extra kilos.
+Every policy sells whatever is still held at ``max_hold_months - 1`` months
+past readiness.
+"""
+
+from abc import ABC, abstractmethod
+
+import numpy as np
+
+DAYS_PER_MONTH = 30
+
+
+class SalePolicy(ABC):
+    """Base policy: subclasses implement ``sell`` (and override ``drop`` for pigs written off)."""
+
+    max_hold_months = 6
+    growth_kg_per_day = 0.0
+    max_weight_kg = 130
+    price_index = None
+
+    @abstractmethod
+    def sell(self, month, held, weight, growers):
+        """Share in [0, 1] of each age class of ``held`` (..., H) to sell in 1-based ``month``.
+
+        ``weight`` is the live weight of each age class and ``growers`` the
+        pigs still in the growing stage, shaped like ``held[..., 0]``.
+        """
+
+    def drop(self, month, held):
+        """Share of each age class written off unsold this month."""
+        return 0.0
+
+    def __repr__(self):
+        fields = ', '.join(f'{k}={v!r}' for k, v in vars(self).items())
+        return f'{type(self).__name__}({fields})'
+
+
+class SellAll(SalePolicy):
+    max_hold_months = 1
+
+    def sell(self, month, held, weight, growers):
+        return 1.0
+
+
+class EveryNMonths(SalePolicy):
+    def __init__(self, n, first_month=1, window=None, growth_kg_per_day=0.0):
+        self.n = n
+        self.first_month = first_month
+        self.window = window
+        self.growth_kg_per_day = growth_kg_per_day
+        self.max_hold_months = max(n, window or 0, first_month) + 1
+
+    def _sale_day(self, month):
+        return month >= self.first_month and (month - self.first_month) % self.n == 0
+
+    def sell(self, month, held, weight, growers):
+        if not self._sale_day(month):
+            return 0.0
+        if self.window is None:
+            return 1.0
+        return (np.arange(held.shape[-1]) < self.window).astype(float)
+
+    def drop(self, month, held):
+        if self.window is None or not self._sale_day(month):
+            return 0.0
+        return (np.arange(held.shape[-1]) >= self.window).astype(float)
+
+
+class TargetWeight(SalePolicy):
+    def __init__(self, target_kg, growth_kg_per_day=0.7, max_hold_months=12):
+        self.target_kg = target_kg
+        self.growth_kg_per_day = growth_kg_per_day
+        self.max_hold_months = max_hold_months
+        self.max_weight_kg = max(target_kg, SalePolicy.max_weight_kg)
+
+    def sell(self, month, held, weight, growers):
+        return (weight >= self.target_kg).astype(float)
+
+
+class MinimumLot(SalePolicy):
+    def __init__(self, lot_size, max_hold_months=6, growth_kg_per_day=0.0):
+        self.lot_size = lot_size
+        self.max_hold_months = max_hold_months
+        self.growth_kg_per_day = growth_kg_per_day
+
+    def sell(self, month, held, weight, growers):
+        return (held.sum(axis=-1, keepdims=True) >= self.lot_size).astype(float)
+
+
+class Capacity(SalePolicy):
+    def __init__(self, max_pigs, max_hold_months=6, growth_kg_per_day=0.0):
+        self.max_pigs = max_pigs
+        self.max_hold_months = max_hold_months
+        self.growth_kg_per_day = growth_kg_per_day
+
+    def sell(self, month, held, weight, growers):
+        excess = np.maximum(growers + held.sum(axis=-1) - self.max_pigs, 0.0)[..., None]
+        # oldest first: pigs older than each class are sold before it
+        older = np.cumsum(held[..., ::-1], axis=-1)[..., ::-1] - held
+        sold = np.clip(excess - older, 0.0, held)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return np.where(held > 0, sold / held, 0.0)
+
+
+class PriceTriggered(SalePolicy):
+    def __init__(self, threshold, price_index, max_hold_months=6, growth_kg_per_day=0.0):
+        self.threshold = threshold
+        self.price_index = np.asarray(price_index, dtype=float)
+        self.max_hold_months = max_hold_months
+        self.growth_kg_per_day = growth_kg_per_day
+
+    def sell(self, month, held, weight, growers):
+        return float(self.price_index[month - 1] >= self.threshold)
+
+    def __repr__(self):
+        return (f'PriceTriggered(threshold={self.threshold!r}, price_index={self.price_index.tolist()!r}, '
+                f'max_hold_months={self.max_hold_months!r}, growth_kg_per_day={self.growth_kg_per_day!r})')
+
+
+def seasonal_price_index(months, amplitude=0.1, peak_month=12):
+    """Sale price multiplier per month: ``1 + amplitude`` in ``peak_month`` of each year, ``1 - amplitude`` six months off."""
+    month = np.arange(1, months + 1)
+    return 1 + amplitude * np.cos(2 * np.pi * (month - peak_month) / 12)
+
+
+def apply_sale_policy(ready, growers, policy, final_weight, fcr):
+    """Run ``policy`` over pigs becoming ``ready`` each month, shaped (..., months).
+
+    ``growers`` are the pigs in the growing stage and ``final_weight``/``fcr``
+    broadcast against (..., 1). Returns ``sold``, ``sold_kg``, ``held`` (after
+    the month's sales) and ``dropped`` per month, and the extra grower feed kg
+    eaten by held pigs for the weight they gain (none once at ``max_weight_kg``).
+    """
+    months = ready.shape[-1]
+    if policy.price_index is not None and len(policy.price_index) < months:
+        raise ValueError(f"price_index covers {len(policy.price_index)} months, need {months}")
+    n_ages = max(int(policy.max_hold_months), 1)
+    gain = policy.growth_kg_per_day * DAYS_PER_MONTH
+    shape = np.broadcast_shapes(ready.shape[:-1], np.shape(final_weight)[:-1], np.shape(fcr)[:-1])
+    weight = np.minimum(np.broadcast_to(final_weight, shape + (1,)) + gain * np.arange(n_ages),
+                        np.maximum(policy.max_weight_kg, final_weight))
+    # kg a pig held in each age class puts on before next month
+    class_gain = np.diff(weight, append=weight[..., -1:], axis=-1)
+    ready = np.broadcast_to(ready, shape + (months,))
+    growers = np.broadcast_to(growers, shape + (months,))
+
+    held = np.zeros(shape + (n_ages,))
+    out = {name: np.zeros(shape + (months,)) for name in ('sold', 'sold_kg', 'held', 'dropped', 'gain_kg')}
+    for t in range(months):
+        held[..., 1:] = held[..., :-1].copy()
+        held[..., 0] = ready[..., t]
+
+        dropped = held * policy.drop(t + 1, held)
+        share = np.broadcast_to(policy.sell(t + 1, held, weight, growers[..., t]), held.shape).copy()
+        share[..., -1] = 1.0
+        sold = (held - dropped) * share
+
+        out['sold'][..., t] = sold.sum(axis=-1)
+        out['sold_kg'][..., t] = (sold * weight).sum(axis=-1)
+        out['dropped'][..., t] = dropped.sum(axis=-1)
+        held -= sold + dropped
+        out['held'][..., t] = held.sum(axis=-1)
+        out['gain_kg'][..., t] = (held * class_gain).sum(axis=-1)
+
+    out['extra_feed_kg'] = out.pop('gain_kg') * np.asarray(fcr)
+    return out
+
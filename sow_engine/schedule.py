@@ -0,0 +1,177 @@
+# -------------------------------
+# Mating-schedule optimizer
+# -------------------------------
+"""Search batch mating schedules for the best NPV or the least working capital.
+
+A candidate schedule mates ``batch_size`` sows every ``interval`` months from
+``start_month`` on (the flat model mates ``total_sows / 5.43`` every month from
+month 2). Candidates are turned into (candidates, months) mating arrays and
+evaluated in chunks on the cohort engine, pruning as early as possible:
+
+1. sow availability - a mated sow is busy through gestation and lactation, so
+   sows mated in any ``GESTATION_MONTHS + LACTATION_MONTHS`` window must not
+   exceed ``total_sows`` (array arithmetic, no simulation);
+2. pen capacity - the herd stage alone gives the peak number of growers;
+3. cash limit - only the survivors are priced, and schedules whose peak
+   working capital exceeds ``cash_limit`` (or whose NPV is below ``min_npv``)
+   are dropped.
+
+NPV discounts the monthly cash flow at ``discount_rate`` a year after the
+initial investment (shed + sows) at month 0; stock left at the horizon is not
+valued. Peak working capital is the deepest the running operating cash flow
+(loan payments included, capital excluded) goes below zero.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+import pandas as pd
+
+from .cohort import (DEFAULT_PARAMS, GESTATION_MONTHS, LACTATION_MONTHS, _window_sum, expected_cohorts,
+                     financial_overlay, herd_flow, split_params)
+
+ScheduleResult = namedtuple('ScheduleResult', ['best', 'candidates', 'baseline', 'pruned'])
+OBJECTIVES = ('npv', 'peak_working_capital')
+# Months a mated sow is unavailable for another mating
+SOW_BUSY_MONTHS = GESTATION_MONTHS + LACTATION_MONTHS
+
+
+def schedule_grid(total_sows, start_months=range(2, 7), intervals=range(1, 7), batch_sizes=None):
+    """Every combination of start month, interval and batch size (1 .. total_sows sows by default)."""
+    if batch_sizes is None:
+        batch_sizes = np.arange(1, int(total_sows) + 1)
+    start, interval, size = np.meshgrid(list(start_months), list(intervals), list(batch_sizes), indexing='ij')
+    return pd.DataFrame({'start_month': start.ravel(), 'interval': interval.ravel(),
+                         'batch_size': size.ravel().astype(float)})
+
+
+def mating_schedule(candidates, months):
+    """Sows mated per month, shaped (candidates, months)."""
+    month = np.arange(1, months + 1)
+    since_start = month - candidates['start_month'].to_numpy()[:, None]
+    interval = candidates['interval'].to_numpy()[:, None]
+    mating = (since_start >= 0) & (since_start % interval == 0)
+    return np.where(mating, candidates['batch_size'].to_numpy(dtype=float)[:, None], 0.0)
+
+
+def schedule_metrics(cash_flow, initial_investment, discount_rate):
+    """(npv, peak_working_capital) per row of a (..., months) monthly cash flow."""
+    months = cash_flow.shape[-1]
+    discount = (1 + discount_rate) ** (-np.arange(1, months + 1) / 12)
+    npv = (cash_flow * discount).sum(axis=-1) - initial_investment
+    peak_working_capital = np.maximum(-np.cumsum(cash_flow, axis=-1).min(axis=-1), 0.0)
+    return npv, peak_working_capital
+
+
+def _herd(sows_crossed, herd_params, p):
+    cohort = sows_crossed * (1 - p['abortion_rate']) * p['piglets_per_cycle'] * (1 - p['piglet_mortality'])
+    return herd_flow(sows_crossed.shape[-1], sows_crossed, cohort, **herd_params)
+
+
+def _select(herd, keep):
+    """Rows ``keep`` of every per-candidate array of a ``herd_flow`` result (parameters broadcast as is)."""
+    n = len(keep)
+    return {name: value[keep] if np.ndim(value) and np.shape(value)[0] == n else value
+            for name, value in herd.items()}
+
+
+def _evaluate(sows_crossed, herd_params, finance_params, p, pen_capacity, discount_rate, capitalize_interest):
+    """Metrics for a chunk of schedules; ``npv`` is NaN where a constraint prunes the schedule."""
+    n = len(sows_crossed)
+    out = {'peak_sows_busy': _window_sum(sows_crossed, 0, SOW_BUSY_MONTHS - 1).max(axis=-1)}
+    ok = out['peak_sows_busy'] <= p['total_sows'] * (1 + 1e-9)
+    out['sows_ok'] = ok.copy()
+
+    for name in ('peak_growers', 'npv', 'peak_working_capital', 'final_cumulative_cash_flow',
+                 'total_pigs_sold'):
+        out[name] = np.full(n, np.nan)
+    herd = None
+    if ok.any():
+        herd = _herd(sows_crossed[ok], herd_params, p)
+        out['peak_growers'][ok] = herd['Growers'].max(axis=-1)
+        if pen_capacity is not None and (out['peak_growers'][ok] > pen_capacity).any():
+            fits = out['peak_growers'][ok] <= pen_capacity
+            ok[ok] = fits
+            herd = _select(herd, fits) if ok.any() else None
+
+    out['pen_ok'] = ok.copy()
+    if herd is not None:
+        r = financial_overlay(herd, capitalize_interest, **finance_params)
+        npv, peak_wc = schedule_metrics(r['Monthly_Cash_Flow'], r['shed_cost'] + r['total_sow_cost'],
+                                        discount_rate)
+        out['npv'][ok] = npv
+        out['peak_working_capital'][ok] = peak_wc
+        out['final_cumulative_cash_flow'][ok] = r['final_cumulative_cash_flow']
+        out['total_pigs_sold'][ok] = r['total_pigs_sold']
+    return out
+
+
+def optimize_schedule(params=None, objective='npv', pen_capacity=None, cash_limit=None, min_npv=None,
+                      discount_rate=0.12, months=60, candidates=None, chunk_size=2_000, capitalize_interest=False):
+    """Best mating schedule among ``candidates`` (default ``schedule_grid``) under the constraints.
+
+    ``params`` may include ``months`` (as in the Streamlit apps). Returns
+    ``ScheduleResult(best, candidates, baseline, pruned)``: the best feasible
+    candidate row (None if none is feasible), the candidate table with its
+    metrics and a ``feasible`` flag, the same metrics for the flat schedule,
+    and how many candidates each constraint pruned.
+    """
+    if objective not in OBJECTIVES:
+        raise ValueError(f"Unknown objective {objective!r}; choose from {OBJECTIVES}")
+    p = {**DEFAULT_PARAMS, **(params or {})}
+    months = int(p.pop('months', months))
+    herd_params, finance_params = split_params(p)
+    if candidates is None:
+        candidates = schedule_grid(p['total_sows'])
+    table = candidates.reset_index(drop=True).copy()
+
+    chunks = []
+    # an empty table still goes through once, for the metric columns
+    for start in range(0, max(len(table), 1), chunk_size):
+        chunk = table.iloc[start:start + chunk_size]
+        chunks.append(_evaluate(mating_schedule(chunk, months), herd_params, finance_params, p,
+                                pen_capacity, discount_rate, capitalize_interest))
+    for name in chunks[0]:
+        table[name] = np.concatenate([c[name] for c in chunks])
+
+    def within_cash(peak_working_capital, npv):
+        ok = np.ones(np.shape(npv), dtype=bool)
+        if cash_limit is not None:
+            ok &= peak_working_capital <= cash_limit
+        if min_npv is not None:
+            ok &= npv >= min_npv
+        return ok
+
+    table['feasible'] = table['pen_ok'].to_numpy() & within_cash(table['peak_working_capital'].to_numpy(),
+                                                                 table['npv'].to_numpy())
+    pruned = {
+        'sows': int((~table['sows_ok']).sum()),
+        'pen_capacity': int((table['sows_ok'] & ~table['pen_ok']).sum()),
+        'cash_limit': int((table['pen_ok'] & ~table['feasible']).sum()),
+    }
+    table = table.drop(columns=['sows_ok', 'pen_ok'])
+
+    feasible = table[table['feasible']]
+    if feasible.empty:
+        best = None
+    elif objective == 'npv':
+        best = feasible.loc[feasible['npv'].idxmax()]
+    else:
+        best = feasible.loc[feasible['peak_working_capital'].idxmin()]
+
+    sows_crossed, cohort = expected_cohorts(months, p['total_sows'], p['piglets_per_cycle'],
+                                            p['piglet_mortality'], p['abortion_rate'])
+    flat_herd = herd_flow(months, sows_crossed, cohort, **herd_params)
+    flat = financial_overlay(flat_herd, capitalize_interest, **finance_params)
+    npv, peak_wc = schedule_metrics(flat['Monthly_Cash_Flow'], flat['shed_cost'] + flat['total_sow_cost'],
+                                    discount_rate)
+    peak_growers = float(flat_herd['Growers'].max())
+    baseline = {
+        'feasible': bool((pen_capacity is None or peak_growers <= pen_capacity) and within_cash(peak_wc, npv)),
+        'peak_growers': peak_growers,
+        'npv': float(npv),
+        'peak_working_capital': float(peak_wc),
+        'final_cumulative_cash_flow': float(flat['final_cumulative_cash_flow']),
+        'total_pigs_sold': float(flat['total_pigs_sold']),
+    }
+    return ScheduleResult(best, table, baseline, pruned)
@@ -0,0 +1,148 @@
+# -------------------------------
+# Event calendar and compact cohort store for batch life cycles
+# -------------------------------
+"""Month-bucketed farrow / wean / grower-start / sale events for the loop simulators.
+
+When a batch is mated its future state changes are filed under the month they
+happen in. ``advance(month)`` pops that single bucket (O(1) lookup) and moves
+batches between the lactating and growing sets, so a month only touches the
+batches whose state changes instead of rescanning every batch ever created.
+Head counts are summed over the live sets in batch order, which gives the same
+floating-point totals as the original full scans.
+
+Batches are ``__slots__`` records. Once a batch is sold (or misses its sale)
+it is retired into a ``CohortLedger`` of running totals and dropped, so the
+scheduler only holds the cohorts still in the shed however long the horizon.
+"""
+
+from collections import defaultdict
+
+FARROW = 'farrow'
+WEAN = 'wean'
+GROWER_START = 'grower_start'
+SALE_READY = 'sale_ready'
+
+
+class Batch:
+    __slots__ = ('batch_id', 'farrow_month', 'wean_month', 'grower_start_month',
+                 'grower_end_month', 'piglets', 'grower_feed_per_month', 'sold')
+
+    def __init__(self, batch_id, farrow_month, wean_month, grower_start_month,
+                 grower_end_month, piglets, grower_feed_per_month):
+        self.batch_id = batch_id
+        self.farrow_month = farrow_month
+        self.wean_month = wean_month
+        self.grower_start_month = grower_start_month
+        self.grower_end_month = grower_end_month
+        self.piglets = piglets
+        self.grower_feed_per_month = grower_feed_per_month
+        self.sold = False
+
+    def __repr__(self):
+        return (f"Batch({self.batch_id}, farrow={self.farrow_month}, "
+                f"ready={self.grower_end_month}, piglets={self.piglets:g})")
+
+
+class CohortLedger:
+    """Running totals of retired batches."""
+
+    __slots__ = ('batches_sold', 'pigs_sold', 'batches_unsold', 'pigs_unsold')
+
+    def __init__(self):
+        self.batches_sold = 0
+        self.pigs_sold = 0
+        self.batches_unsold = 0
+        self.pigs_unsold = 0
+
+    def as_dict(self):
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class BatchScheduler:
+    """Live batches of one simulation, filed by the months their state changes.
+
+    ``new_batch`` files four events per batch under their months: farrow (the
+    litter joins the lactating set), wean (it leaves it), grower start (it joins
+    the growing set) and sale ready (it leaves the growing set). ``advance`` must
+    be called once per month in order. It pops that month's bucket and returns the
+    batches that became ready for sale. The caller then retires each one with
+    ``sell`` (pigs counted as sold) or ``expire`` (pigs counted as unsold).
+    Retired batches live on only as ``ledger`` totals.
+
+    ``lactating_piglets``, ``growers`` and ``grower_feed_cost`` sum over the
+    current sets; ``animals_left`` counts live batches not yet ready for sale.
+    """
+
+    def __init__(self):
+        self._events = defaultdict(list)
+        self._live = {}
+        self._lactating = {}
+        self._growing = {}
+        self.batches_created = 0
+        self.ledger = CohortLedger()
+
+    def __len__(self):
+        return len(self._live)
+
+    def new_batch(self, farrow_month, wean_month, grower_start_month, grower_end_month,
+                  piglets, grower_feed_per_month):
+        """Create the next batch and file its life-cycle events."""
+        self.batches_created += 1
+        batch = Batch(self.batches_created, farrow_month, wean_month, grower_start_month,
+                      grower_end_month, piglets, grower_feed_per_month)
+        self.add_batch(batch)
+        return batch
+
+    def add_batch(self, batch):
+        key = batch.batch_id
+        self._live[key] = batch
+        self._events[batch.farrow_month].append((FARROW, key, batch))
+        self._events[batch.wean_month].append((WEAN, key, batch))
+        self._events[batch.grower_start_month].append((GROWER_START, key, batch))
+        self._events[batch.grower_end_month].append((SALE_READY, key, batch))
+
+    def advance(self, month):
+        """Apply the events of ``month`` and return the batches that became ready for sale."""
+        ready = []
+        for kind, key, batch in self._events.pop(month, ()):
+            if kind == FARROW:
+                self._lactating[key] = batch
+            elif kind == WEAN:
+                del self._lactating[key]
+            elif kind == GROWER_START:
+                self._growing[key] = batch
+            else:
+                del self._growing[key]
+                ready.append(batch)
+        return ready
+
+    def sell(self, batches):
+        """Retire sold batches into the ledger and return the pigs sold."""
+        pigs = 0
+        for batch in batches:
+            pigs += batch.piglets
+            batch.sold = True
+            del self._live[batch.batch_id]
+        self.ledger.batches_sold += len(batches)
+        self.ledger.pigs_sold += pigs
+        return pigs
+
+    def expire(self, batches):
+        """Retire batches that missed their sale without selling them."""
+        for batch in batches:
+            self.ledger.batches_unsold += 1
+            self.ledger.pigs_unsold += batch.piglets
+            del self._live[batch.batch_id]
+
+    def lactating_piglets(self):
+        return sum(batch.piglets for batch in self._lactating.values())
+
+    def growers(self):
+        return sum(batch.piglets for batch in self._growing.values())
+
+    def grower_feed_cost(self, grower_feed_price):
+        return sum(batch.grower_feed_per_month * grower_feed_price for batch in self._growing.values())
+
+    def animals_left(self, month):
+        """Piglets of unsold batches still growing after ``month``."""
+        return sum(batch.piglets for batch in self._live.values() if batch.grower_end_month > month)
@@ -0,0 +1,319 @@
+# -------------------------------
+# Local HTTP simulation service
+# -------------------------------
+"""Serve engine runs over HTTP to dashboards and other local tools.
+
+    python -m sow_engine.service --port 8765 --workers 4
+
+Endpoints (JSON in, JSON out):
+
+* ``POST /simulate`` - body ``{"params": {...}, "months": 60, "engine": "cohort",
+  "columns": [...], "capitalize_interest": false}``; everything is optional.
+  ``params`` are ``sow_rotation_simulator`` arguments (missing ones take the
+  engine's own defaults, ``runner.engine_defaults``), ``engine`` is one of ``runner.ENGINES`` and ``columns`` the monthly
+  columns to return (default all, ``[]`` for KPIs only);
+* ``GET /simulate?sale_price=190&months=120&columns=Monthly_Cash_Flow,...`` -
+  the same with parameters in the query string;
+* ``GET /stats`` - request, coalescing and cache counters;
+* ``GET /health``.
+
+The response holds the full parameter set, the KPIs of ``runner.run_chunk``
+and the monthly columns as lists. Requests are keyed by ``params_key`` of the
+normalized request: a finished result is answered from a bounded ``LRUCache``
+of encoded responses, and a request arriving while the same key is being
+computed waits for that computation instead of starting another. Simulations
+run in a process pool, so the event loop only parses, looks up and writes.
+The HTTP layer is a minimal HTTP/1.1 server on ``asyncio`` streams (keep-alive,
+``Content-Length`` bodies only) meant for localhost, not for the open network.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import math
+import os
+import signal
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import parse_qsl
+
+from .cache import LRUCache, params_key
+from .cohort import MONTHLY_COLUMNS
+
+MAX_BODY_BYTES = 1 << 20
+MAX_MONTHS = 1200
+_REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+            413: 'Payload Too Large', 431: 'Request Header Fields Too Large', 500: 'Internal Server Error'}
+_OPTIONS = ('engine', 'months', 'columns', 'capitalize_interest')
+# Parameters that are shares of 1, and parameters that must be above zero (every other one may be zero)
+_SHARES = ('piglet_mortality', 'abortion_rate', 'management_commission')
+_POSITIVE = ('total_sows', 'piglets_per_cycle', 'fcr', 'final_weight', 'shed_life_years', 'sow_life_years',
+             'loan_tenure_years')
+
+
+def _json_value(value):
+    if isinstance(value, (bool, str)) or value is None:
+        return value
+    value = float(value)
+    return None if math.isnan(value) or math.isinf(value) else value
+
+
+def _number(value):
+    """JSON number or query-string value as an int or float (``bool`` is not a number here)."""
+    if isinstance(value, bool) or not isinstance(value, (int, float, str)):
+        raise TypeError(value)
+    if isinstance(value, str):
+        try:
+            return int(value)
+        except ValueError:
+            return float(value)
+    return value
+
+
+def _warm_worker():
+    from . import runner  # noqa: F401 - import numpy/pandas and the engine once per worker
+
+
+def simulate(engine, months, params, columns, capitalize_interest):
+    """Run one request (in a worker process) and return the encoded JSON response."""
+    import pandas as pd
+
+    from .runner import run_chunk
+
+    kpis, monthly = run_chunk(pd.DataFrame([params]), months, engine, list(columns), capitalize_interest)
+    row = kpis.iloc[0].to_dict()
+    result = {
+        'engine': engine,
+        'months': months,
+        'capitalize_interest': capitalize_interest,
+        'params': params,
+        'kpis': {name: _json_value(value) for name, value in row.items()
+                 if name not in params and name not in ('scenario', 'months')},
+        'monthly': {} if monthly is None else {name: monthly[name].tolist() for name in columns},
+    }
+    return json.dumps(result, allow_nan=False, separators=(',', ':')).encode()
+
+
+def simulation_request(request, flat=False):
+    """Validate a request mapping: ``(key, engine, months, params, columns, capitalize_interest)``.
+
+    ``flat`` requests (query strings) carry the parameters next to the options
+    instead of under ``params``. Raises ``ValueError`` on anything invalid.
+    """
+    from .runner import ENGINES, engine_defaults
+
+    if not isinstance(request, dict):
+        raise ValueError("Request must be a JSON object")
+    request = dict(request)
+    if flat:
+        params = {name: request.pop(name) for name in list(request) if name not in _OPTIONS}
+    else:
+        params = request.pop('params', None) or {}
+        unknown = set(request) - set(_OPTIONS)
+        if unknown:
+            raise ValueError(f"Unknown request fields: {sorted(unknown)}")
+        if not isinstance(params, dict):
+            raise ValueError("'params' must be an object")
+    engine = request.get('engine', 'cohort')
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown engine {engine!r}; choose from {list(ENGINES)}")
+    defaults = engine_defaults(engine)
+    unknown = set(params) - set(defaults)
+    if unknown:
+        raise ValueError(f"Unknown parameters: {sorted(unknown)}")
+    try:
+        params = {**defaults, **{name: _number(value) for name, value in params.items()}}
+        months = int(request.get('months', 60))
+    except (TypeError, ValueError):
+        raise ValueError("Parameters and 'months' must be numbers") from None
+    for name, value in params.items():
+        if not math.isfinite(value):
+            raise ValueError(f"'{name}' must be finite")
+        if name in _SHARES and not 0 <= value <= 1:
+            raise ValueError(f"'{name}' must be between 0 and 1")
+        if name in _POSITIVE and value <= 0:
+            raise ValueError(f"'{name}' must be positive")
+        if value < 0:
+            raise ValueError(f"'{name}' must not be negative")
+    if not 1 <= months <= MAX_MONTHS:
+        raise ValueError(f"'months' must be between 1 and {MAX_MONTHS}")
+
+    columns = request.get('columns')
+    if columns is None:
+        columns = [c for c in MONTHLY_COLUMNS if c != 'Month']
+    elif isinstance(columns, str):
+        columns = [c for c in columns.split(',') if c]
+    unknown = set(columns) - set(MONTHLY_COLUMNS) if isinstance(columns, list) else None
+    if unknown is None or unknown or 'Month' in columns:
+        raise ValueError(f"'columns' must be a list of {[c for c in MONTHLY_COLUMNS if c != 'Month']}")
+    capitalize_interest = request.get('capitalize_interest', False)
+    if isinstance(capitalize_interest, str):
+        capitalize_interest = capitalize_interest.lower() in ('1', 'true', 'yes')
+    capitalize_interest = bool(capitalize_interest)
+
+    columns = tuple(columns)
+    key = params_key({**params, 'engine': engine, 'months': months, 'columns': columns,
+                      'capitalize_interest': capitalize_interest}, namespace='service')
+    return key, engine, months, params, columns, capitalize_interest
+
+
+class SimulationService:
+    """Coalescing, caching front of a process pool; ``handle`` serves one HTTP connection."""
+
+    def __init__(self, workers=None, cache_size=256, executor=None):
+        self.workers = workers or os.cpu_count() or 1
+        self.executor = executor or ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+        self.cache = LRUCache(maxsize=cache_size)
+        self._inflight = {}
+        self.requests = 0
+        self.computed = 0
+        self.coalesced = 0
+        self.errors = 0
+
+    async def simulate(self, key, *spec):
+        """Encoded response for a validated request, computing it at most once across concurrent callers."""
+        body = self.cache.get(key)
+        if body is not None:
+            return body
+        future = self._inflight.get(key)
+        if future is None:
+            future = asyncio.get_running_loop().run_in_executor(self.executor, simulate, *spec)
+            self._inflight[key] = future
+            future.add_done_callback(lambda f: self._finished(key, f))
+            self.computed += 1
+        else:
+            self.coalesced += 1
+        # a client going away must not cancel the computation others are waiting on
+        return await asyncio.shield(future)
+
+    def _finished(self, key, future):
+        self._inflight.pop(key, None)
+        if not future.cancelled() and future.exception() is None:
+            self.cache.put(key, future.result())
+
+    def stats(self):
+        return {
+            'requests': self.requests,
+            'computed': self.computed,
+            'coalesced': self.coalesced,
+            'errors': self.errors,
+            'in_flight': len(self._inflight),
+            'workers': self.workers,
+            'cache': self.cache.stats(),
+        }
+
+    async def dispatch(self, method, target, body):
+        """``(status, payload)`` for one request; payload is a dict or an encoded response."""
+        path, _, query = target.partition('?')
+        if path == '/health':
+            return (200, {'status': 'ok'}) if method == 'GET' else (405, {'error': 'use GET'})
+        if path == '/stats':
+            return (200, self.stats()) if method == 'GET' else (405, {'error': 'use GET'})
+        if path != '/simulate':
+            return 404, {'error': f'no such endpoint: {path}'}
+
+        self.requests += 1
+        try:
+            if method == 'POST':
+                spec = simulation_request(json.loads(body or b'{}'))
+            elif method == 'GET':
+                spec = simulation_request(dict(parse_qsl(query, keep_blank_values=True)), flat=True)
+            else:
+                return 405, {'error': 'use GET or POST'}
+        except ValueError as exc:  # json.JSONDecodeError included
+            self.errors += 1
+            return 400, {'error': str(exc)}
+        try:
+            return 200, await self.simulate(*spec)
+        except Exception as exc:
+            self.errors += 1
+            return 500, {'error': f'{type(exc).__name__}: {exc}'}
+
+    async def handle(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection until it closes."""
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b'\r\n\r\n')
+                except asyncio.IncompleteReadError:
+                    break
+                except asyncio.LimitOverrunError:
+                    await self._respond(writer, 431, {'error': 'headers too large'}, False)
+                    break
+                lines = head.decode('latin-1').split('\r\n')
+                try:
+                    method, target, version = lines[0].split(' ', 2)
+                    headers = {name.strip().lower(): value.strip()
+                               for name, value in (line.split(':', 1) for line in lines[1:] if line)}
+                    length = int(headers.get('content-length', 0))
+                except ValueError:
+                    await self._respond(writer, 400, {'error': 'malformed request'}, False)
+                    break
+                if length > MAX_BODY_BYTES:
+                    await self._respond(writer, 413, {'error': f'body over {MAX_BODY_BYTES} bytes'}, False)
+                    break
+                body = await reader.readexactly(length) if length else b''
+                keep_alive = version == 'HTTP/1.1' and headers.get('connection', '').lower() != 'close'
+                status, payload = await self.dispatch(method, target, body)
+                await self._respond(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            with contextlib.suppress(ConnectionError):
+                await writer.wait_closed()
+
+    @staticmethod
+    async def _respond(writer, status, payload, keep_alive):
+        body = payload if isinstance(payload, bytes) else json.dumps(payload).encode()
+        head = (f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+                f"Content-Type: application/json\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode() + body)
+        await writer.drain()
+
+    def close(self):
+        self.executor.shutdown(cancel_futures=True)
+
+
+async def serve(host='127.0.0.1', port=8765, workers=None, cache_size=256, ready=None):
+    """Run the service until cancelled or sent SIGTERM; ``ready(url)`` is called once it is listening."""
+    with contextlib.suppress(NotImplementedError):  # no signal handlers on Windows event loops
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    service = SimulationService(workers, cache_size)
+    try:
+        server = await asyncio.start_server(service.handle, host, port)
+        async with server:
+            bound_port = server.sockets[0].getsockname()[1]
+            if ready is not None:
+                ready(f'http://{host}:{bound_port}')
+            await server.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        # stop the worker processes too, or they outlive the service
+        service.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765, help='0 picks a free port')
+    parser.add_argument('--workers', type=int, help='simulation processes (default: CPU count)')
+    parser.add_argument('--cache-size', type=int, default=256, help='responses kept in the LRU cache')
+    args = parser.parse_args(argv)
+
+    def ready(url):
+        print(f'listening on {url}', file=sys.stderr, flush=True)
+
+    with contextlib.suppress(KeyboardInterrupt):
+        asyncio.run(serve(args.host, args.port, args.workers, args.cache_size, ready))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
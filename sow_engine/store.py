@@ -0,0 +1,241 @@
+# -------------------------------
+# Persistent scenario result store
+# -------------------------------
+"""Keep simulation results on disk under the ``params_key`` of their parameters.
+
+A store is a directory holding
+
+* ``index.sqlite`` - one row per scenario: key, namespace, parameters (JSON),
+  the ``kpis.KPI_COLUMNS`` as indexed REAL columns and any other scalar results
+  (JSON);
+* ``arrays/*.npy`` - monthly columns as a (columns, scenarios, months) float64
+  array (integer columns such as ``Month`` come back as int64); a single run is one file with one scenario, a ``simulate_batch`` sweep
+  shares one file across all its scenarios.
+
+Arrays are reopened with ``np.load(mmap_mode='r')``, so a stored scenario comes
+back without re-simulating and without reading the rest of its sweep; KPI
+queries such as "break-even before month 30" only touch SQLite.
+
+Every row records the ``MODEL_VERSION`` it was computed with, which is also
+part of its key. Opening a store drops rows (and unused array files) from any
+other version, so results never outlive a change to the model.
+"""
+
+import json
+import math
+import numbers
+import os
+import sqlite3
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+from .cache import params_key
+from .kpis import KPI_COLUMNS
+
+# Bump whenever a change to the engine changes stored results
+MODEL_VERSION = 3
+
+_SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS scenarios (
+    key TEXT PRIMARY KEY,
+    namespace TEXT NOT NULL,
+    model_version INTEGER,
+    params TEXT NOT NULL,
+    months INTEGER,
+    array_file TEXT,
+    array_index INTEGER,
+    columns TEXT,
+    scalars TEXT,
+    created REAL,
+    {', '.join(f'{name} REAL' for name in KPI_COLUMNS)}
+);
+CREATE INDEX IF NOT EXISTS scenarios_namespace ON scenarios (namespace);
+{''.join(f'CREATE INDEX IF NOT EXISTS scenarios_{name} ON scenarios ({name});' for name in KPI_COLUMNS)}
+"""
+
+
+def _scalar(value):
+    """JSON/SQLite-friendly scalar: numbers become float, NaN and None become None."""
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    if isinstance(value, numbers.Number):
+        value = float(value)
+        return None if math.isnan(value) else value
+    return repr(value)
+
+
+class ResultStore:
+    """Scenario results in ``root`` (created if missing), safe to share between threads."""
+
+    def __init__(self, root, model_version=MODEL_VERSION):
+        self.root = os.fspath(root)
+        self.model_version = model_version
+        os.makedirs(os.path.join(self.root, 'arrays'), exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(os.path.join(self.root, 'index.sqlite'), check_same_thread=False)
+        self._db.execute('PRAGMA journal_mode=WAL')
+        self._db.executescript(_SCHEMA)
+        columns = {row[1] for row in self._db.execute('PRAGMA table_info(scenarios)')}
+        if 'model_version' not in columns:  # stores written before versioning
+            self._db.execute('ALTER TABLE scenarios ADD COLUMN model_version INTEGER')
+        self._drop_stale()
+
+    def _drop_stale(self):
+        """Delete rows of other model versions and the array files only they used."""
+        with self._lock, self._db:
+            stale = 'model_version IS NOT ?'
+            files = [row[0] for row in self._db.execute(
+                f'SELECT DISTINCT array_file FROM scenarios WHERE {stale} AND array_file IS NOT NULL',
+                (self.model_version,))]
+            self._db.execute(f'DELETE FROM scenarios WHERE {stale}', (self.model_version,))
+            for name in files:
+                if self._db.execute('SELECT 1 FROM scenarios WHERE array_file = ?', (name,)).fetchone() is None:
+                    try:
+                        os.remove(os.path.join(self.root, 'arrays', name))
+                    except FileNotFoundError:
+                        pass
+
+    def key(self, params, namespace=''):
+        """Key of ``params`` in ``namespace`` under this store's model version."""
+        return params_key(params, f'{namespace}@{self.model_version}')
+
+    def close(self):
+        self._db.close()
+
+    def __len__(self):
+        with self._lock:
+            return self._db.execute('SELECT COUNT(*) FROM scenarios').fetchone()[0]
+
+    def __contains__(self, key):
+        with self._lock:
+            return self._db.execute('SELECT 1 FROM scenarios WHERE key = ?', (key,)).fetchone() is not None
+
+    def _save_array(self, name, array):
+        # written under a temporary name so readers never map a partial file
+        path = os.path.join(self.root, 'arrays', name)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, 'wb') as f:
+            np.save(f, array)
+        os.replace(tmp, path)
+        return name
+
+    def _insert(self, rows):
+        with self._lock, self._db:
+            self._db.executemany(
+                f"INSERT OR REPLACE INTO scenarios (key, namespace, model_version, params, months, array_file,"
+                f" array_index, columns, scalars, created, {', '.join(KPI_COLUMNS)})"
+                f" VALUES ({', '.join('?' * (10 + len(KPI_COLUMNS)))})", rows)
+
+    def _row(self, key, namespace, params, months, array_file, array_index, columns, scalars, int_columns=()):
+        columns = {'names': columns, 'integer': list(int_columns)}
+        scalars = {name: _scalar(value) for name, value in (scalars or {}).items()}
+        return (key, namespace, self.model_version, json.dumps({k: _scalar(v) for k, v in params.items()}), months,
+                array_file, array_index, json.dumps(columns), json.dumps(scalars), time.time(),
+                *(scalars.get(name) for name in KPI_COLUMNS))
+
+    def put(self, params, df_month, scalars=None, namespace=''):
+        """Store one run's monthly DataFrame and scalar results; returns its key.
+
+        ``scalars`` entries named like ``kpis.KPI_COLUMNS`` become queryable.
+        """
+        key = self.key(params, namespace)
+        columns = list(df_month.columns)
+        int_columns = [name for name in columns if df_month[name].dtype.kind in 'iu']
+        array = df_month.to_numpy(dtype=np.float64).T[:, None, :]
+        array_file = self._save_array(f"{key}.npy", np.ascontiguousarray(array))
+        self._insert([self._row(key, namespace, params, len(df_month), array_file, 0, columns, scalars,
+                                int_columns)])
+        return key
+
+    def put_batch(self, result, months, namespace='batch', capitalize_interest=False):
+        """Store a ``simulate_batch`` result; returns the scenario keys.
+
+        Each scenario is keyed by its parameters plus ``months`` and
+        ``capitalize_interest``; the monthly arrays of the whole sweep go to one file.
+        """
+        table = result.params.reset_index(drop=True)
+        records = table.to_dict('records')
+        keys = [self.key({**p, 'months': months, 'capitalize_interest': capitalize_interest}, namespace)
+                for p in records]
+        columns = list(result.monthly)
+        array_file = None
+        if columns:
+            array = np.stack([np.asarray(result.monthly[name], dtype=np.float64) for name in columns])
+            array_file = self._save_array(f"batch-{params_key({'keys': keys}, namespace)}.npy", array)
+        kpis = result.kpis.reset_index(drop=True).to_dict('records')
+        self._insert([
+            self._row(key, namespace, {**p, 'months': months, 'capitalize_interest': capitalize_interest},
+                      months, array_file, i if array_file else None, columns, kpis[i])
+            for i, (key, p) in enumerate(zip(keys, records))
+        ])
+        return keys
+
+    def get(self, params, namespace=''):
+        """``(df_month, scalars)`` stored for ``params``, or None.
+
+        The DataFrame columns are read-only views of the memory-mapped array file.
+        """
+        return self.get_key(self.key(params, namespace))
+
+    def get_key(self, key):
+        with self._lock:
+            row = self._db.execute('SELECT array_file, array_index, columns, scalars FROM scenarios'
+                                   ' WHERE key = ? AND model_version = ?', (key, self.model_version)).fetchone()
+        if row is None:
+            return None
+        array_file, array_index, columns, scalars = row
+        scalars = json.loads(scalars)
+        if array_file is None:
+            return None, scalars
+        try:
+            array = np.load(os.path.join(self.root, 'arrays', array_file), mmap_mode='r')
+        except FileNotFoundError:
+            return None
+        columns = json.loads(columns)
+        data = {name: array[i, array_index] for i, name in enumerate(columns['names'])}
+        for name in columns['integer']:
+            data[name] = data[name].astype(np.int64)
+        return pd.DataFrame(data, copy=False), scalars
+
+    def query(self, where=None, args=(), namespace=None, limit=None):
+        """DataFrame of stored scenarios: key, parameters and KPIs.
+
+        ``where`` is an SQL condition on the KPI columns with ``?`` placeholders,
+        e.g. ``store.query('break_even_month < ?', [30])``.
+        """
+        conditions, values = ['model_version = ?'], [self.model_version]
+        if namespace is not None:
+            conditions.append('namespace = ?')
+            values.append(namespace)
+        if where:
+            conditions.append(f"({where})")
+            values.extend(args)
+        sql = f"SELECT key, params, {', '.join(KPI_COLUMNS)} FROM scenarios"
+        sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY created'
+        if limit is not None:
+            sql += f' LIMIT {int(limit)}'
+        with self._lock:
+            rows = self._db.execute(sql, values).fetchall()
+
+        kpis = pd.DataFrame([row[2:] for row in rows], columns=KPI_COLUMNS, dtype=float)
+        params = pd.DataFrame([json.loads(row[1]) for row in rows])
+        return pd.concat([pd.DataFrame({'key': [row[0] for row in rows]}), params, kpis], axis=1)
+
+    def delete(self, key):
+        """Forget ``key``; its array file goes once no other scenario uses it."""
+        with self._lock, self._db:
+            row = self._db.execute('SELECT array_file FROM scenarios WHERE key = ?', (key,)).fetchone()
+            self._db.execute('DELETE FROM scenarios WHERE key = ?', (key,))
+            if row is None or row[0] is None:
+                return
+            if self._db.execute('SELECT 1 FROM scenarios WHERE array_file = ?', row).fetchone() is None:
+                try:
+                    os.remove(os.path.join(self.root, 'arrays', row[0]))
+                except FileNotFoundError:
+                    pass
@@ -0,0 +1,129 @@
+# -------------------------------
+# Streaming consumers for monthly record generators
+# -------------------------------
+"""Work with simulations one month at a time instead of one DataFrame at the end.
+
+``monthly.iter_monthly_chunks`` and ``monthly_kpi.iter_monthly_chunks`` yield
+dicts of column arrays covering up to ``chunk_months`` months, and the matching
+``iter_monthly_records`` yield one record dict per month; all of them *return*
+(via ``StopIteration.value``) the end-of-run totals. The helpers here consume
+such streams in constant memory:
+
+* ``records`` turns a chunk stream into a record stream;
+* ``chunks`` groups records into DataFrames of ``size`` months, e.g. for
+  appending to Parquet/CSV;
+* ``RunningSummary`` folds records into yearly sums, running cash and the
+  break-even month as they pass through;
+* ``write_csv`` streams records straight to a CSV file.
+"""
+
+import csv
+
+
+def collect(stream):
+    """Drain a record generator into ``(records, totals)``."""
+    items = []
+    while True:
+        try:
+            items.append(next(stream))
+        except StopIteration as stop:
+            return items, stop.value
+
+
+def records(chunk_stream):
+    """Yield one record dict per row of a stream of column chunks; returns its totals."""
+    while True:
+        try:
+            chunk = next(chunk_stream)
+        except StopIteration as stop:
+            return stop.value
+        names = list(chunk)
+        for values in zip(*(chunk[name].tolist() for name in names)):
+            yield dict(zip(names, values))
+
+
+def chunks(stream, size=120):
+    """Yield DataFrames of up to ``size`` consecutive monthly records."""
+    import pandas as pd
+
+    batch = []
+    for record in stream:
+        batch.append(record)
+        if len(batch) == size:
+            yield pd.DataFrame(batch)
+            batch = []
+    if batch:
+        yield pd.DataFrame(batch)
+
+
+class RunningSummary:
+    """Yearly sums, running cash position and break-even month of a record stream.
+
+    ``opening_balance`` is the cash position before month 1 (e.g. minus the
+    capital invested); the running position adds each ``Monthly_Cash_Flow``,
+    exactly like ``cash_flow_kpis``. Only one year of state is open at a time.
+    """
+
+    def __init__(self, opening_balance=0.0, months_per_year=12, cash_flow_column='Monthly_Cash_Flow'):
+        self.months_per_year = months_per_year
+        self.cash_flow_column = cash_flow_column
+        self.cash = opening_balance
+        self.months = 0
+        self.break_even_month = None
+        self.years = []
+        self._year = None
+
+    def update(self, record):
+        self.months += 1
+        self.cash += record[self.cash_flow_column]
+        if self.break_even_month is None and self.cash >= 0:
+            self.break_even_month = self.months
+
+        if self._year is None:
+            self._year = dict.fromkeys((k for k, v in record.items() if isinstance(v, (int, float))), 0)
+        for name in self._year:
+            self._year[name] += record[name]
+        if self.months % self.months_per_year == 0:
+            self._close_year()
+
+    def _close_year(self):
+        self.years.append({'Year': f"Year {len(self.years) + 1}", **self._year})
+        self._year = None
+
+    def watch(self, stream):
+        """Pass records through unchanged while updating the summary; returns the stream's totals."""
+        while True:
+            try:
+                record = next(stream)
+            except StopIteration as stop:
+                self.finish()
+                return stop.value
+            self.update(record)
+            yield record
+
+    def finish(self):
+        """Close a trailing partial year."""
+        if self._year is not None:
+            self._close_year()
+
+
+def write_csv(stream, path, chunk_size=120):
+    """Write a record stream to ``path`` as CSV, flushing every ``chunk_size`` rows.
+
+    Returns the stream's totals.
+    """
+    with open(path, 'w', newline='') as f:
+        writer = None
+        rows = 0
+        while True:
+            try:
+                record = next(stream)
+            except StopIteration as stop:
+                return stop.value
+            if writer is None:
+                writer = csv.DictWriter(f, fieldnames=list(record))
+                writer.writeheader()
+            writer.writerow(record)
+            rows += 1
+            if rows % chunk_size == 0:
+                f.flush()
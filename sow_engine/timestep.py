@@ -0,0 +1,203 @@
+# -------------------------------
+# Weekly / daily time-step engine
+# -------------------------------
+"""Cohort engine at weekly or daily resolution, rolled up to the monthly frames.
+
+Sows are mated every step from month 2 on; each step's litter goes through
+gestation, lactation and growing for a configurable number of days (the
+defaults reproduce the monthly timetable: 120, 30 and 180 days), so weekly
+batch-farrowing schedules such as 114 / 28 / 154 days can be modelled.
+
+Herd arrays are float32 and calendar indices int32, so a 10-year daily run is a
+handful of (steps,) arrays. ``roll_up`` turns the step arrays into the monthly
+herd dict of ``cohort.herd_flow`` (stocks averaged over the days of a month,
+feed spread over the days a step covers, matings and sales booked in the month
+they happen) and ``cohort.financial_overlay`` prices it, so ``df_month`` and
+``df_year`` have exactly the columns of the monthly engine. ``Growers`` is the
+average number of pigs on grower feed in the month.
+
+With the default timetable a daily run books the same matings, sales, revenue
+and sow feed as ``cohort`` in every month. It does not book the same grower
+feed: ``cohort`` feeds a month's litters for whole months from the month they
+are weaned, while here feed follows the days each pig actually grows, about
+half a month later. Daily cumulative cash flow therefore runs ahead of the
+monthly engine by a constant of about half a month of grower feed for the
+standing herd once sales start (about 0.24M with the default parameters, 2.8%
+of the 60-month total). Weekly runs also move matings and sales to week
+boundaries, so their monthly columns differ a little more.
+"""
+
+import numpy as np
+
+from .cohort import (AVERAGE_CYCLE_LENGTH, DAYS_PER_MONTH, DEFAULT_PARAMS, FIRST_MATING_MONTH,
+                     GESTATION_MONTHS, GROWING_MONTHS, HERD_PARAMS, LACTATION_MONTHS,
+                     _col, _delay, _window_sum, financial_overlay, monthly_frame, split_params,
+                     yearly_summary)
+
+STEP_DAYS = {'day': 1, 'week': 7}
+DEFAULT_STAGE_DAYS = dict(
+    gestation_days=GESTATION_MONTHS * DAYS_PER_MONTH,
+    lactation_days=LACTATION_MONTHS * DAYS_PER_MONTH,
+    growing_days=GROWING_MONTHS * DAYS_PER_MONTH,
+)
+
+
+def step_herd_flow(months=60, step='week', gestation_days=DEFAULT_STAGE_DAYS['gestation_days'],
+                   lactation_days=DEFAULT_STAGE_DAYS['lactation_days'],
+                   growing_days=DEFAULT_STAGE_DAYS['growing_days'], dtype=np.float32, **herd_params):
+    """Herd trajectory per step: head counts and grower feed shaped (..., steps) in ``dtype``.
+
+    Stage lengths are rounded to whole steps; the grower feed per pig over the
+    growing stage is always ``fcr * final_weight``.
+    """
+    if step not in STEP_DAYS:
+        raise ValueError(f"step must be one of {sorted(STEP_DAYS)}")
+    unknown = set(herd_params) - set(HERD_PARAMS)
+    if unknown:
+        raise ValueError(f"Not herd parameters: {sorted(unknown)}")
+    p = {name: herd_params.get(name, DEFAULT_PARAMS[name]) for name in HERD_PARAMS}
+
+    step_days = STEP_DAYS[step]
+    n_days = months * DAYS_PER_MONTH
+    n_steps = -(-n_days // step_days)
+    start_day = np.arange(n_steps, dtype=np.int32) * step_days
+
+    mating_rate = _col(p['total_sows']) / (AVERAGE_CYCLE_LENGTH * DAYS_PER_MONTH) * step_days
+    sows_crossed = np.where(start_day >= (FIRST_MATING_MONTH - 1) * DAYS_PER_MONTH, mating_rate, 0.0)
+    sows_pregnant = sows_crossed * (1 - _col(p['abortion_rate']))
+    cohort = sows_pregnant * _col(p['piglets_per_cycle']) * (1 - _col(p['piglet_mortality']))
+
+    farrow_lag = max(round(gestation_days / step_days), 1)
+    wean_lag = farrow_lag + max(round(lactation_days / step_days), 1)
+    sale_lag = wean_lag + max(round(growing_days / step_days), 1)
+    grower_feed_per_pig_step = (_col(p['fcr']) * _col(p['final_weight'])) / (sale_lag - wean_lag)
+
+    # Window sums run in float64 and are stored compact
+    lactating = _window_sum(cohort, farrow_lag, wean_lag - 1)
+    growers = _window_sum(cohort, wean_lag, sale_lag - 1)
+    sold = _delay(cohort, sale_lag)
+
+    return {
+        'months': months,
+        'step_days': step_days,
+        'start_day': start_day,
+        'Sows_Crossed': sows_crossed.astype(dtype),
+        'Piglets_Born_Alive': lactating.astype(dtype),
+        'Growers': growers.astype(dtype),
+        'Sold_Pigs': sold.astype(dtype),
+        'grower_feed_kg': (growers * grower_feed_per_pig_step).astype(dtype),
+        'total_sows': _col(p['total_sows']),
+        'sow_feed_intake': _col(p['sow_feed_intake']),
+        'final_weight': _col(p['final_weight']),
+        'total_pigs_born': cohort.sum(axis=-1),
+        'animals_left': cohort[..., max(n_steps - sale_lag, 0):].sum(axis=-1),
+    }
+
+
+def roll_up(steps):
+    """Monthly herd dict (as returned by ``cohort.herd_flow``) from ``step_herd_flow`` output."""
+    months = steps['months']
+    step_days = steps['step_days']
+    n_days = months * DAYS_PER_MONTH
+    month_start_day = np.arange(months) * DAYS_PER_MONTH
+
+    def stock(x):
+        # average head count over the days of each month
+        daily = np.repeat(x.astype(np.float64), step_days, axis=-1)[..., :n_days]
+        return np.add.reduceat(daily, month_start_day, axis=-1) / DAYS_PER_MONTH
+
+    def spread(x):
+        # a step's flow is spread evenly over the days it covers
+        daily = np.repeat(x.astype(np.float64) / step_days, step_days, axis=-1)[..., :n_days]
+        return np.add.reduceat(daily, month_start_day, axis=-1)
+
+    def events(x):
+        # booked in the month the step starts in
+        first_step = np.searchsorted(steps['start_day'], month_start_day)
+        return np.add.reduceat(x.astype(np.float64), first_step, axis=-1)
+
+    sold_pigs = events(steps['Sold_Pigs'])
+    sold_any = sold_pigs > 0
+    final_weight = steps['final_weight']
+    return {
+        'months': months,
+        'Sows_Crossed': events(steps['Sows_Crossed']),
+        'Piglets_Born_Alive': stock(steps['Piglets_Born_Alive']),
+        'Growers': stock(steps['Growers']),
+        'Sold_Pigs': sold_pigs,
+        'total_sows': steps['total_sows'],
+        'sow_feed_kg': steps['total_sows'] * steps['sow_feed_intake'] * DAYS_PER_MONTH,
+        'grower_feed_kg': spread(steps['grower_feed_kg']),
+        'sold_kg': sold_pigs * final_weight,
+        'first_sale_month': np.where(sold_any.any(axis=-1), sold_any.argmax(axis=-1) + 1, months),
+        'total_pigs_sold': sold_pigs.sum(axis=-1),
+        'total_pigs_born': steps['total_pigs_born'],
+        'animals_left': steps['animals_left'],
+    }
+
+
+def simulate_arrays(months=60, step='week', capitalize_interest=False, stage_days=None, **params):
+    """``cohort.simulate_arrays`` at step resolution: monthly money columns and scalars.
+
+    ``stage_days`` overrides ``DEFAULT_STAGE_DAYS`` entries.
+    """
+    herd_params, finance_params = split_params(params)
+    steps = step_herd_flow(months, step, **{**DEFAULT_STAGE_DAYS, **(stage_days or {})}, **herd_params)
+    return financial_overlay(roll_up(steps), capitalize_interest, **finance_params)
+
+
+def sow_rotation_simulator(
+    total_sows=30,
+    piglets_per_cycle=10,
+    piglet_mortality=0.07,
+    abortion_rate=0.0,
+    sow_feed_price=30,
+    sow_feed_intake=2.8,
+    grower_feed_price=30,
+    fcr=3.1,
+    final_weight=105,
+    sale_price=180,
+    management_fee=0,
+    management_commission=0.0,
+    supervisor_salary=25000,
+    worker_salary=18000,
+    n_workers=2,
+    shed_cost=1_500_000,
+    shed_life_years=10,
+    sow_cost=35000,
+    sow_life_years=4,
+    loan_amount=0,
+    interest_rate=0.1,
+    loan_tenure_years=5,
+    moratorium_months=0,
+    medicine_cost=10000,
+    electricity_cost=5000,
+    land_lease=10000,
+    months=60,
+    step='week',
+    gestation_days=DEFAULT_STAGE_DAYS['gestation_days'],
+    lactation_days=DEFAULT_STAGE_DAYS['lactation_days'],
+    growing_days=DEFAULT_STAGE_DAYS['growing_days'],
+):
+    """Return tuple of ``cohort.sow_rotation_simulator``, simulated in weekly or daily steps."""
+    params = dict(locals())
+    months = params.pop('months')
+    step = params.pop('step')
+    stage_days = {name: params.pop(name) for name in DEFAULT_STAGE_DAYS}
+    r = simulate_arrays(months, step, stage_days=stage_days, **params)
+
+    df_month = monthly_frame(r)
+    df_year = yearly_summary(df_month)
+
+    return (
+        df_month,
+        df_year,
+        float(r['total_sow_cost']),
+        shed_cost,
+        float(r['first_sale_cash_needed']),
+        float(r['total_pigs_sold']),
+        float(r['total_pigs_born']),
+        float(r['animals_left']),
+        float(r['final_cumulative_cash_flow']),
+        float(r['total_interest_paid']),
+    )
@@ -0,0 +1,103 @@
+# -------------------------------
+# Per-phase timing hooks
+# -------------------------------
+"""Where a run spends its time, phase by phase.
+
+Code marks its stages with ``with phase('name'):`` or the ``@timed()``
+decorator. The marks cost a context-variable lookup unless a ``PhaseTimer``
+is active in the current context; inside ``with PhaseTimer() as timer:`` every
+phase is recorded (nested phases included) and can be summarized as a table
+or exported as a Chrome trace (open it in ``chrome://tracing`` or Perfetto).
+
+The active timer and the nesting depth are context variables, so work handed
+to a thread pool is recorded at the depth it was submitted from as long as it
+runs in a copy of the submitting context (``contextvars.copy_context().run``).
+"""
+
+import contextlib
+import contextvars
+import functools
+import json
+import os
+import threading
+import time
+
+_ACTIVE = contextvars.ContextVar('sow_engine_phase_timer', default=None)
+_DEPTH = contextvars.ContextVar('sow_engine_phase_depth', default=0)
+_NO_TIMER = contextlib.nullcontext()
+
+
+class PhaseTimer:
+    """Records ``(name, start_ns, duration_ns, depth, thread_id)`` for every phase run while active."""
+
+    def __init__(self):
+        self.events = []
+        self._origin = time.perf_counter_ns()
+        self._tokens = []
+
+    def __enter__(self):
+        self._tokens.append(_ACTIVE.set(self))
+        return self
+
+    def __exit__(self, *exc_info):
+        _ACTIVE.reset(self._tokens.pop())
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        depth = _DEPTH.get()
+        token = _DEPTH.set(depth + 1)
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            end = time.perf_counter_ns()
+            _DEPTH.reset(token)
+            self.events.append((name, start - self._origin, end - start, depth, threading.get_ident()))
+
+    def summary(self):
+        """DataFrame with one row per phase name: calls, total/mean ms and share of top-level time."""
+        import pandas as pd
+
+        df = pd.DataFrame(self.events, columns=['phase', 'start_ns', 'duration_ns', 'depth', 'thread'])
+        top_level_ns = df.loc[df['depth'] == 0, 'duration_ns'].sum()
+        table = df.groupby('phase', sort=False).agg(
+            depth=('depth', 'min'), calls=('duration_ns', 'size'), total_ns=('duration_ns', 'sum'))
+        table['total_ms'] = table.pop('total_ns') / 1e6
+        table['mean_ms'] = table['total_ms'] / table['calls']
+        table['share_pct'] = table['total_ms'] * 1e6 / top_level_ns * 100 if top_level_ns else 0.0
+        return table.sort_values('total_ms', ascending=False)
+
+    def chrome_trace(self):
+        """Trace Event Format dict of complete ("X") events in microseconds."""
+        pid = os.getpid()
+        return {
+            'traceEvents': [
+                {'name': name, 'ph': 'X', 'ts': start / 1e3, 'dur': duration / 1e3, 'pid': pid, 'tid': thread,
+                 'args': {'depth': depth}}
+                for name, start, duration, depth, thread in self.events
+            ],
+            'displayTimeUnit': 'ms',
+        }
+
+    def write_chrome_trace(self, path):
+        with open(path, 'w') as f:
+            json.dump(self.chrome_trace(), f)
+
+
+def phase(name):
+    """Context manager timing ``name`` in the active ``PhaseTimer``; a no-op when none is active."""
+    timer = _ACTIVE.get()
+    return _NO_TIMER if timer is None else timer.phase(name)
+
+
+def timed(name=None):
+    """Decorator timing every call of the function as phase ``name`` (default: its qualified name)."""
+    def decorate(fn):
+        label = name or fn.__qualname__
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with phase(label):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
@@ -4,264 +4,23 @@
 # -------------------------------
 
 import streamlit as st
-import pandas as pd
+import json
 import math
+import os
 import altair as alt
+import pandas as pd
+
+from sow_engine.cache import LRUCache, params_key
+from sow_engine.chartdata import chart_frame
+from sow_engine.frames import display_frame
+
+from sow_engine.monthly_kpi import result_scalars, results_from_frame, sow_rotation_simulator
+from sow_engine.store import ResultStore
+from sow_engine.timing import PhaseTimer
+from sow_engine.goalseek import goal_seek
+from sow_engine.schedule import optimize_schedule
+from sow_engine.sensitivity import sensitivity, tornado_data
 
-# -------------------------------
-# Sow Rotation Simulator Function
-# -------------------------------
-def sow_rotation_simulator(
-    total_sows=30,
-    piglets_per_cycle=10,
-    piglet_mortality=0.07,
-    abortion_rate=0.0,
-    sow_feed_price=30,
-    sow_feed_intake=2.8,
-    grower_feed_price=30,
-    fcr=3.1,
-    final_weight=105,
-    sale_price=180,
-    management_fee=0,
-    management_commission=0.0,
-    supervisor_salary=25000,
-    worker_salary=18000,
-    n_workers=2,
-    shed_cost=1_500_000,
-    shed_life_years=10,
-    sow_cost=35000,
-    sow_life_years=4,
-    loan_amount=4_000_000,
-    interest_rate=0.121,
-    loan_tenure_years=5,
-    moratorium_months=0,
-    medicine_cost=10000,
-    electricity_cost=5000,
-    land_lease=10000,
-    months=60
-):
-    # ----- Initialize -----
-    current_sows = total_sows
-    monthly_data = []
-
-    shed_dep_rate = 1 / (shed_life_years * 12)
-    sow_dep_rate = 1 / (sow_life_years * 12)
-    total_months = loan_tenure_years * 12
-    monthly_rate = interest_rate / 12
-
-    # EMI calculation
-    emi = 0
-    if loan_amount > 0 and total_months > 0:
-        emi = loan_amount * monthly_rate * (1 + monthly_rate)**total_months / ((1 + monthly_rate)**total_months - 1)
-    loan_balance = loan_amount
-
-    # Sow mating logic
-    average_cycle_length = 3.8 + 1.3 + 0.33
-    sows_to_mate_per_month = total_sows / average_cycle_length
-
-    batches = []
-    ready_for_sale_batches = []
-    total_sow_cost = sow_cost * total_sows
-    total_capital = shed_cost + total_sow_cost  # initial capital
-    total_pigs_born = 0
-    total_pigs_sold = 0
-
-    first_sale_cash_needed = 0
-    first_sale_done = False
-
-    # ----- Monthly Simulation -----
-    for month in range(1, months + 1):
-        # Costs
-        sow_feed_cost = current_sows * sow_feed_intake * 30 * sow_feed_price
-        staff_cost = supervisor_salary + n_workers * worker_salary
-        mgmt_fixed = management_fee
-        other_fixed = medicine_cost + electricity_cost + land_lease
-
-        # Mating & Piglets
-        sows_crossed = 0
-        if month >= 2:
-            sows_to_mate = sows_to_mate_per_month
-            sows_pregnant = sows_to_mate * (1 - abortion_rate)
-            sows_crossed = sows_to_mate
-            if sows_pregnant > 0:
-                farrow_month = month + 4
-                wean_month = farrow_month + 1
-                grower_start_month = wean_month
-                grower_end_month = grower_start_month + 6
-                piglets = sows_pregnant * piglets_per_cycle * (1 - piglet_mortality)
-                total_pigs_born += piglets
-                batches.append({
-                    'batch_id': len(batches) + 1,
-                    'farrow_month': farrow_month,
-                    'wean_month': wean_month,
-                    'grower_start_month': grower_start_month,
-                    'grower_end_month': grower_end_month,
-                    'piglets': piglets,
-                    'grower_feed_per_month': (piglets * fcr * final_weight) / 6,
-                    'sold': False
-                })
-
-        # Lactating piglets
-        piglets_with_sow = sum(batch['piglets'] for batch in batches if batch['farrow_month'] <= month < batch['wean_month'])
-        current_growers = sum(batch['piglets'] for batch in batches if batch['grower_start_month'] <= month < batch['grower_end_month'])
-        grower_feed_cost = sum(batch['grower_feed_per_month'] * grower_feed_price for batch in batches if batch['grower_start_month'] <= month < batch['grower_end_month'])
-
-        # Ready for sale
-        for batch in batches:
-            if batch['grower_end_month'] <= month and not batch['sold'] and batch not in ready_for_sale_batches:
-                ready_for_sale_batches.append(batch)
-
-        sold_pigs = 0
-        revenue = 0
-        if ready_for_sale_batches:
-            pigs_sold_this_month = sum(batch['piglets'] for batch in ready_for_sale_batches)
-            revenue += pigs_sold_this_month * final_weight * sale_price
-            sold_pigs = pigs_sold_this_month
-            total_pigs_sold += sold_pigs
-            for batch in ready_for_sale_batches:
-                batch['sold'] = True
-            ready_for_sale_batches = []
-
-        # Track first sale working capital
-        if not first_sale_done:
-            first_sale_cash_needed += sow_feed_cost + grower_feed_cost + staff_cost + mgmt_fixed + other_fixed
-        if sold_pigs > 0 and not first_sale_done:
-            first_sale_done = True
-
-        mgmt_comm_cost = revenue * management_commission
-        total_operating_cost = sow_feed_cost + grower_feed_cost + staff_cost + mgmt_fixed + mgmt_comm_cost + other_fixed
-        dep = shed_cost * shed_dep_rate + total_sow_cost * sow_dep_rate
-
-        # Loan Payment
-        if month <= moratorium_months:
-            loan_payment = 0
-            loan_balance += loan_balance * monthly_rate
-        elif month <= total_months:
-            interest = loan_balance * monthly_rate
-            principal = emi - interest
-            loan_balance -= principal
-            loan_payment = emi
-        else:
-            loan_payment = 0
-
-        monthly_profit = revenue - total_operating_cost
-        monthly_cash_flow = revenue - total_operating_cost - loan_payment
-
-        monthly_data.append({
-            'Month': month,
-            'Sows_Crossed': round(sows_crossed),
-            'Piglets_Born_Alive': piglets_with_sow,
-            'Growers': current_growers,
-            'Sold_Pigs': sold_pigs,
-            'Sow_Feed_Cost': round(sow_feed_cost),
-            'Grower_Feed_Cost': round(grower_feed_cost),
-            'Staff_Cost': round(staff_cost),
-            'Other_Fixed_Costs': round(other_fixed),
-            'Mgmt_Fee': round(mgmt_fixed),
-            'Mgmt_Comm': round(mgmt_comm_cost),
-            'Total_Operating_Cost': round(total_operating_cost),
-            'Revenue': round(revenue),
-            'Monthly_Profit': round(monthly_profit),
-            'Loan_EMI': round(loan_payment),
-            'Monthly_Cash_Flow': round(monthly_cash_flow),
-            'Depreciation': round(dep)
-        })
-
-    df_month = pd.DataFrame(monthly_data)
-    df_year = df_month.groupby(((df_month['Month']-1)//12)*12).sum()
-    df_year.index = [f"Year {i+1}" for i in range(len(df_year))]
-
-    # Animals left
-    animals_left = int(sum(batch['piglets'] for batch in batches if not batch['sold'] and batch['grower_end_month'] > months))
-
-    # Initial Investment
-    total_sow_cost = total_sows * sow_cost
-    shed_cost_val = shed_cost
-    initial_investment = shed_cost + total_sow_cost 
-
-    # ----- Cumulative Cash Flow (month by month) -----
-    cumulative_cash_flow = [-initial_investment]
-    for val in df_month['Monthly_Cash_Flow']:
-        cumulative_cash_flow.append(cumulative_cash_flow[-1] + val)
-    cumulative_cash_flow = cumulative_cash_flow[1:]
-    df_month['Cumulative_Cash_Flow'] = cumulative_cash_flow
-
-    # Break-even
-    break_even_month = None
-    running_cash = -initial_investment
-    for i, val in enumerate(df_month['Monthly_Cash_Flow']):
-        running_cash += val
-        if running_cash >= 0:
-            break_even_month = i + 1
-            break
-
-    # Profit After Break-even
-    if break_even_month:
-        profit_after_break_even = df_month['Monthly_Profit'].iloc[break_even_month:].sum()
-        months_after_breakeven = len(df_month) - break_even_month
-        avg_profit_after_breakeven = df_month['Monthly_Profit'].iloc[break_even_month:].mean()
-    else:
-        profit_after_break_even = 0
-        avg_profit_after_breakeven = 0
-
-    average_monthly_profit = df_month['Monthly_Profit'].mean()
-
-    # Cash-only CAGR
-    years = months / 12
-    final_cash = cumulative_cash_flow[-1] + initial_investment  # net cash returned
-    realized_cagr = (final_cash / (first_sale_cash_needed + initial_investment)) ** (1 / years) - 1
-
-    # ROI / CAGR
-    final_cumulative_cash_flow = cumulative_cash_flow[-1]
-    roi_cash_pct = final_cumulative_cash_flow / (first_sale_cash_needed + initial_investment) * 100
-    years = months / 12
-    # realized_cagr = (final_cumulative_cash_flow) / first_sale_cash_needed + initial_investment ** (1/years) - 1
-
-        # ROI including remaining assets
-    remaining_shed_value = shed_cost * (1 - months / (shed_life_years * 12))
-    remaining_sow_value = total_sow_cost * (1 - months / (sow_life_years * 12))
-    remaining_animals_value = animals_left * 12000  # approximate value of remaining pigs
-    roi_with_assets_pct = ((final_cumulative_cash_flow + remaining_shed_value + remaining_sow_value + remaining_animals_value) / (first_sale_cash_needed + initial_investment - 1)) * 100
-
-    # Total crossings (optional)
-    total_crossings = df_month['Sows_Crossed'].sum() if 'Sows_Crossed' in df_month.columns else 0
-
-    # Total interest paid
-    loan_balance = loan_amount
-    total_interest_paid = 0
-    for m in range(1, months + 1):
-        monthly_interest = loan_balance * monthly_rate
-        if m <= moratorium_months:
-            loan_balance += monthly_interest
-            loan_payment = 0
-        elif m <= total_months:
-            principal = emi - monthly_interest
-            loan_balance -= principal
-            loan_payment = emi
-        else:
-            monthly_interest = 0
-        total_interest_paid += monthly_interest
-
-    return (
-        df_month,
-        df_year,
-        total_sow_cost,
-        shed_cost_val,
-        first_sale_cash_needed,
-        total_pigs_sold,
-        total_pigs_born,
-        animals_left,
-        cumulative_cash_flow,
-        total_interest_paid,
-        break_even_month,
-        profit_after_break_even,
-        average_monthly_profit,
-        avg_profit_after_breakeven,
-        total_crossings,
-        roi_with_assets_pct,
-        roi_cash_pct,
-        realized_cagr
-    )
 # -------------------------------
 # Streamlit UI
 # -------------------------------
@@ -321,46 +80,96 @@ months = st.sidebar.slider("Simulation Duration (Months)", 12, 120, 60, 12)
 # -------------------------------
 # Run Simulation
 # -------------------------------
-df_month, df_year, total_sow_cost, shed_cost_val, first_sale_cash_needed, total_pigs_sold, total_pigs_born, animals_left, cumulative_cash_flow_scalar, total_interest_paid, break_even_month, profit_after_break_even, average_monthly_profit, avg_profit_after_breakeven, total_crossings, roi_with_assets_pct, roi_cash_pct, realized_cagr = sow_rotation_simulator(
-    total_sows,
-    piglets_per_cycle,
-    piglet_mortality_pct / 100.0,
-    abortion_rate_pct / 100.0,
-    sow_feed_price,
-    sow_feed_intake,
-    grower_feed_price,
-    fcr,
-    final_weight,
-    sale_price,
-    management_fee,
-    management_commission_pct / 100.0,
-    supervisor_salary,
-    worker_salary,
-    n_workers,
-    shed_cost,
-    shed_life_years,
-    sow_cost,
-    sow_life_years,
-    loan_amount,
-    interest_rate_pct / 100.0,
-    loan_tenure_years,
-    moratorium_months,
-    medicine_cost,
-    electricity_cost,
-    land_lease,
-    months
+params = dict(
+    total_sows=total_sows,
+    piglets_per_cycle=piglets_per_cycle,
+    piglet_mortality=piglet_mortality_pct / 100.0,
+    abortion_rate=abortion_rate_pct / 100.0,
+    sow_feed_price=sow_feed_price,
+    sow_feed_intake=sow_feed_intake,
+    grower_feed_price=grower_feed_price,
+    fcr=fcr,
+    final_weight=final_weight,
+    sale_price=sale_price,
+    management_fee=management_fee,
+    management_commission=management_commission_pct / 100.0,
+    supervisor_salary=supervisor_salary,
+    worker_salary=worker_salary,
+    n_workers=n_workers,
+    shed_cost=shed_cost,
+    shed_life_years=shed_life_years,
+    sow_cost=sow_cost,
+    sow_life_years=sow_life_years,
+    loan_amount=loan_amount,
+    interest_rate=interest_rate_pct / 100.0,
+    loan_tenure_years=loan_tenure_years,
+    moratorium_months=moratorium_months,
+    medicine_cost=medicine_cost,
+    electricity_cost=electricity_cost,
+    land_lease=land_lease,
+    months=months,
 )
 
+# Cost columns stacked in the first plot
+cost_components = ["Sow_Feed_Cost", "Grower_Feed_Cost", "Staff_Cost",
+                   "Other_Fixed_Costs", "Mgmt_Fee", "Mgmt_Comm", "Loan_EMI"]
+
+
+@st.cache_resource
+def scenario_cache():
+    # One bounded LRU shared by all sessions; evicts the oldest scenario when full
+    return LRUCache(maxsize=32)
+
+
+@st.cache_resource
+def result_store():
+    # Results on disk survive sessions and restarts; set SOW_RESULT_STORE to move them
+    return ResultStore(os.environ.get("SOW_RESULT_STORE", ".sow_results"))
+
+
+store = result_store()
+
+
+def run_scenario(params):
+    stored = store.get(params, namespace="withgraphs")
+    if stored is not None:
+        results = results_from_frame(*stored)
+    else:
+        results = sow_rotation_simulator(**params)
+        store.put(params, results[0], result_scalars(results), namespace="withgraphs")
+
+    # One compact chart dataset shared by all plots, cached alongside the run
+    df_chart = chart_frame(results[0], cost_components + ["Revenue", "Monthly_Profit"],
+                           ["Cumulative_Cash_Flow"])
+    return results, df_chart
+
+
+cache = scenario_cache()
+# Phases of this rerun, shown in the Performance panel at the bottom
+timer = PhaseTimer()
+with timer, timer.phase("scenario"):
+    results, df_chart = cache.get_or_compute(params_key(params), lambda: run_scenario(params))
+df_month, df_year, total_sow_cost, shed_cost_val, first_sale_cash_needed, total_pigs_sold, total_pigs_born, animals_left, cumulative_cash_flow_scalar, total_interest_paid, break_even_month, profit_after_break_even, average_monthly_profit, avg_profit_after_breakeven, total_crossings, roi_with_assets_pct, roi_cash_pct, realized_cagr = results
+
+with st.sidebar.expander("Debug: Simulation Cache"):
+    stats = cache.stats()
+    st.write(f"Hits: {stats['hits']:,} | Misses: {stats['misses']:,} | Evictions: {stats['evictions']:,}")
+    st.write(f"Cached scenarios: {stats['size']} / {stats['maxsize']}")
+    st.write(f"Stored scenarios: {len(store):,}")
+    if st.button("Clear cache"):
+        cache.clear()
+
 # -------------------------------
 # Display Summaries
 # -------------------------------
 st.subheader("Simulation Results")
 
-st.write("Monthly Summary")
-st.dataframe(df_month.head(120))
+with timer.phase("tables"):
+    st.write("Monthly Summary")
+    st.dataframe(display_frame(df_month.head(120)))
 
-st.write("Yearly Summary")
-st.dataframe(df_year)
+    st.write("Yearly Summary")
+    st.dataframe(display_frame(df_year))
 
 st.subheader("Financial Summary")
 initial_capital = shed_cost_val + total_sow_cost
@@ -398,48 +207,211 @@ st.write("---")
 # -------------------------------
 st.subheader("Simulation Plots")
 
-# -------------------------------
-# Prepare cost data for plots
-# -------------------------------
-cost_components = ["Sow_Feed_Cost", "Grower_Feed_Cost", "Staff_Cost",
-                   "Other_Fixed_Costs", "Mgmt_Fee", "Mgmt_Comm", "Loan_EMI"]
-
-# Plot 1: Revenue vs Total Costs (Stacked Area)
-df_plot1 = df_month[["Month"] + cost_components + ["Revenue"]].copy()
-df_costs_melt = df_plot1.melt(id_vars="Month", value_vars=cost_components, 
-                              var_name="Cost Component", value_name="Value")
-
-area_chart = alt.Chart(df_costs_melt).mark_area(opacity=0.7).encode(
+# Plots 1-3 are one chart so the browser receives the data once;
+# the cost columns are folded into a long series in Vega, not in pandas
+area_chart = alt.Chart().transform_fold(
+    cost_components, as_=["Cost Component", "Value"]
+).mark_area(opacity=0.7).encode(
     x=alt.X("Month:O", title="Month"),
     y=alt.Y("Value:Q", title="Amount (₹)"),
     color=alt.Color("Cost Component:N"),
-    tooltip=["Month", "Cost Component", "Value"]
+    tooltip=["Month:O", "Cost Component:N", "Value:Q"]
 ).properties(height=360)
 
-revenue_line = alt.Chart(df_plot1).mark_line(color="black", strokeWidth=2).encode(
+revenue_line = alt.Chart().mark_line(color="black", strokeWidth=2).encode(
     x=alt.X("Month:O"),
     y=alt.Y("Revenue:Q"),
     tooltip=["Month", "Revenue"]
 )
 
-st.subheader("1) Revenue vs Total Costs (Stacked Area)")
-st.altair_chart(area_chart + revenue_line, use_container_width=True)
-
-# Plot 2: Monthly Profit
-st.subheader("2) Monthly Profit")
-profit_chart = alt.Chart(df_month).mark_bar(color="green").encode(
+profit_chart = alt.Chart().mark_bar(color="green").encode(
     x=alt.X("Month:O", title="Month"),
     y=alt.Y("Monthly_Profit:Q", title="Profit (₹)"),
     tooltip=["Month", "Monthly_Profit"]
-).properties(height=360)
-st.altair_chart(profit_chart, use_container_width=True)
+).properties(height=360, title="2) Monthly Profit")
 
-# Plot 3: Cumulative Cash Flow
-st.subheader("3) Cumulative Cash Flow")
-cum_cash_chart = alt.Chart(df_month).mark_line(color="blue", strokeWidth=3).encode(
+cum_cash_chart = alt.Chart().mark_line(color="blue", strokeWidth=3).encode(
     x=alt.X("Month:O", title="Month"),
     y=alt.Y("Cumulative_Cash_Flow:Q", title="Cumulative Cash Flow (₹)"),
     tooltip=["Month", "Cumulative_Cash_Flow"]
-).properties(height=360)
-st.altair_chart(cum_cash_chart, use_container_width=True)
+).properties(height=360, title="3) Cumulative Cash Flow")
+
+with timer.phase("altair_render"):
+    st.altair_chart(alt.vconcat(
+        alt.layer(area_chart, revenue_line, title="1) Revenue vs Total Costs (Stacked Area)"),
+        profit_chart,
+        cum_cash_chart,
+        data=df_chart,
+    ).resolve_scale(color="independent"), use_container_width=True)
+
+# Plot 4: Sensitivity (Tornado)
+st.subheader("4) Sensitivity (Tornado)")
+sensitivity_outputs = {
+    "Final Cumulative Cash Flow (₹)": "final_cumulative_cash_flow",
+    "Break-even Month": "break_even_month",
+    "ROI (%)": "roi_cash_pct",
+}
+sens_col1, sens_col2 = st.columns(2)
+sensitivity_label = sens_col1.selectbox("Output", list(sensitivity_outputs))
+sensitivity_step_pct = sens_col2.slider("Change per Parameter (±%)", 1, 50, 10, 1)
+sensitivity_step = sensitivity_step_pct / 100.0
+
+# All parameters are perturbed in one batched run, cached like the main scenario
+with timer, timer.phase("sensitivity"):
+    sens_table = cache.get_or_compute(
+        params_key({**params, "step": sensitivity_step}, namespace="sensitivity"),
+        lambda: sensitivity(params, step=sensitivity_step, capitalize_interest=True))
+df_tornado = tornado_data(sens_table, sensitivity_outputs[sensitivity_label], sensitivity_step)
+
+tornado_chart = alt.Chart(df_tornado).mark_bar().encode(
+    x=alt.X("change:Q", title=f"Change in {sensitivity_label}"),
+    y=alt.Y("parameter:N", sort=None, title="Parameter"),
+    color=alt.Color("case:N", title="Input Change"),
+    tooltip=["parameter", "case", "value", "change"]
+).properties(height=max(18 * df_tornado["parameter"].nunique(), 120))
+st.altair_chart(tornado_chart, use_container_width=True)
+
+# Plot 5: Scenario Comparison
+st.subheader("5) Scenario Comparison")
+MAX_PINNED = 4
+pinned = st.session_state.setdefault("pinned_scenarios", {})
+pin_col1, pin_col2, pin_col3 = st.columns([2, 1, 1])
+pin_name = pin_col1.text_input("Scenario Name", value=f"Scenario {len(pinned) + 1}")
+if pin_col2.button("Pin Current Scenario", disabled=len(pinned) >= MAX_PINNED):
+    pinned[pin_name] = dict(params)
+if pin_col3.button("Clear Pinned"):
+    pinned.clear()
+
+shown = st.multiselect("Compare With", list(pinned), default=list(pinned))
+if shown:
+    compared = {"Current": params, **{name: pinned[name] for name in shown}}
+    # Unchanged scenarios are LRU hits; only new ones run, side by side in threads
+    with timer, timer.phase("comparison"):
+        compared_results = cache.get_or_compute_many(
+            [(params_key(p), lambda p=p: run_scenario(p)) for p in compared.values()])
+
+    df_compare = pd.concat(
+        [c[["Month", "Monthly_Profit", "Cumulative_Cash_Flow"]].assign(Scenario=name)
+         for name, (_, c) in zip(compared, compared_results)],
+        ignore_index=True)
+    compare_cash_chart = alt.Chart(df_compare).mark_line(strokeWidth=2).encode(
+        x=alt.X("Month:O", title="Month"),
+        y=alt.Y("Cumulative_Cash_Flow:Q", title="Cumulative Cash Flow (₹)"),
+        color=alt.Color("Scenario:N", sort=list(compared)),
+        tooltip=["Scenario", "Month", "Cumulative_Cash_Flow"]
+    ).properties(height=360)
+    compare_profit_chart = alt.Chart(df_compare).mark_line(strokeWidth=2).encode(
+        x=alt.X("Month:O", title="Month"),
+        y=alt.Y("Monthly_Profit:Q", title="Profit (₹)"),
+        color=alt.Color("Scenario:N", sort=list(compared)),
+        tooltip=["Scenario", "Month", "Monthly_Profit"]
+    ).properties(height=360)
+    st.altair_chart(compare_cash_chart, use_container_width=True)
+    st.altair_chart(compare_profit_chart, use_container_width=True)
+
+    st.dataframe(pd.DataFrame({
+        "Scenario": list(compared),
+        "Break-even Month": [r[10] for r, _ in compared_results],
+        "Final Cumulative Cash Flow (₹)": [round(r[8][-1]) for r, _ in compared_results],
+        "ROI (%)": [round(r[16], 2) for r, _ in compared_results],
+    }).set_index("Scenario"))
+else:
+    st.write(f"Pin up to {MAX_PINNED} scenarios to overlay them on the current one.")
+
+# -------------------------------
+# Goal Seek
+# -------------------------------
+st.subheader("Goal Seek")
+goal_params = {
+    "Total Sows": "total_sows",
+    "Sale Price (₹/kg)": "sale_price",
+    "Loan Amount": "loan_amount",
+    "Piglets per Cycle": "piglets_per_cycle",
+    "Final Weight (kg)": "final_weight",
+    "Feed Conversion Ratio (FCR)": "fcr",
+    "Grower Feed Price (₹/kg)": "grower_feed_price",
+    "Sow Feed Price (₹/kg)": "sow_feed_price",
+}
+# label -> (KPI, default target, scale from the entered number to the KPI unit)
+goal_kpis = {
+    "Break-even by Month": ("break_even_month", 36.0, 1.0),
+    "ROI (%)": ("roi_cash_pct", 20.0, 1.0),
+    "Realized CAGR (%)": ("realized_cagr", 20.0, 0.01),
+    "Final Cumulative Cash Flow (₹)": ("final_cumulative_cash_flow", 0.0, 1.0),
+}
+goal_col1, goal_col2, goal_col3 = st.columns(3)
+goal_param_label = goal_col1.selectbox("Solve For", list(goal_params))
+goal_kpi_label = goal_col2.selectbox("Target KPI", list(goal_kpis))
+goal_kpi, goal_default, goal_scale = goal_kpis[goal_kpi_label]
+goal_target = goal_col3.number_input("Target", value=goal_default, key=f"goal_target_{goal_kpi}")
+
+with timer, timer.phase("goal_seek"):
+    goal = goal_seek(goal_params[goal_param_label], goal_target * goal_scale, goal_kpi,
+                     params=params, capitalize_interest=True)
+if goal.status == "never":
+    st.write(f"{goal_kpi_label} of {goal_target:,.2f} is not reachable by changing {goal_param_label} alone.")
+elif goal.status == "always":
+    st.write(f"{goal_kpi_label} of {goal_target:,.2f} is met for any {goal_param_label} in the search range "
+             f"(from {goal.value:,.2f}).")
+else:
+    st.write(f"{goal_param_label} needed: {goal.value:,.2f} "
+             f"(gives {goal_kpi_label}: {goal.kpi_value / goal_scale:,.2f}, current: {params[goal_params[goal_param_label]]:,.2f})")
 
+# -------------------------------
+# Mating Schedule Optimizer
+# -------------------------------
+st.subheader("Mating Schedule Optimizer")
+st.write("Searches batch mating schedules (start month, sows per batch, months between batches) "
+         "for the current farm; 0 means no limit.")
+sched_col1, sched_col2, sched_col3, sched_col4 = st.columns(4)
+schedule_objective = sched_col1.selectbox("Objective", ["Maximize NPV", "Minimize Peak Working Capital"])
+pen_capacity = sched_col2.number_input("Grower Pen Capacity (Pigs)", 0, 100000, 0, 50)
+cash_limit = sched_col3.number_input("Working Capital Limit (₹)", 0, 500000000, 0, 100000)
+discount_rate_pct = sched_col4.slider("Discount Rate (%/year)", 0.0, 30.0, 12.0, 0.5)
+
+schedule_options = dict(
+    objective="npv" if schedule_objective == "Maximize NPV" else "peak_working_capital",
+    pen_capacity=pen_capacity or None,
+    cash_limit=cash_limit or None,
+    min_npv=None if schedule_objective == "Maximize NPV" else 0.0,
+    discount_rate=discount_rate_pct / 100.0,
+)
+with timer, timer.phase("schedule_optimizer"):
+    schedule = cache.get_or_compute(
+        params_key({**params, **schedule_options}, namespace="schedule"),
+        lambda: optimize_schedule(params, capitalize_interest=True, **schedule_options))
+
+st.write(f"{len(schedule.candidates):,} schedules checked; pruned for sows: {schedule.pruned['sows']:,}, "
+         f"pen capacity: {schedule.pruned['pen_capacity']:,}, cash: {schedule.pruned['cash_limit']:,}.")
+if schedule.best is None:
+    st.write("No schedule meets these limits.")
+else:
+    best = schedule.best
+    st.write(f"Best schedule: mate {best['batch_size']:,.0f} sows every {best['interval']:.0f} month(s) "
+             f"from month {best['start_month']:.0f}.")
+    st.dataframe(pd.DataFrame({
+        "NPV (₹)": [best["npv"], schedule.baseline["npv"]],
+        "Peak Working Capital (₹)": [best["peak_working_capital"], schedule.baseline["peak_working_capital"]],
+        "Peak Growers": [best["peak_growers"], schedule.baseline["peak_growers"]],
+        "Pigs Sold": [best["total_pigs_sold"], schedule.baseline["total_pigs_sold"]],
+        "Meets Limits": [True, schedule.baseline["feasible"]],
+    }, index=["Best Batch Schedule", "Monthly Mating (Current)"]).round(0))
+
+# -------------------------------
+# Saved Scenarios
+# -------------------------------
+st.subheader("Saved Scenarios")
+saved_max_break_even = st.number_input("Break-even by Month (at most)", 1, 240, 30, 1)
+saved = store.query("break_even_month <= ?", [saved_max_break_even], namespace="withgraphs")
+st.write(f"{len(saved):,} saved scenarios break even by month {saved_max_break_even}.")
+st.dataframe(saved.drop(columns=["key"]))
+
+# -------------------------------
+# Performance
+# -------------------------------
+with st.expander("Performance"):
+    st.write("Time spent in each phase of this rerun; simulation phases (loop, loan schedule, "
+             "groupby, KPIs) only appear when the scenario was not already cached.")
+    st.dataframe(timer.summary().round(3))
+    st.download_button("Download Chrome Trace (JSON)", json.dumps(timer.chrome_trace()),
+                       file_name="sow_simulator_trace.json", mime="application/json")
@@ -0,0 +1,70 @@
+import os
+
+import pytest
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# KPI lines the original scripts display with their default inputs
+APP_KPIS = {
+    'Hosh_Sow_rotation_simulator_streamlit.py': [
+        'Total Capital Invested: ₹2,050,000.00',
+        'Cumulative Cash Flow: ₹-103,248.37',
+        'Return on Investment (ROI): -5.04%',
+    ],
+    'hosh_sow_calculator_monthly.py': [
+        'Total Crossings Done: 354',
+        'Total Pigs Born: 3,031',
+        'Total Pigs Sold: 2,466',
+        'Animals Remaining in Shed: 565',
+        'Working Capital till First Sale: ₹4,358,619.06',
+        'Break-even Month: 33',
+        'Average Monthly Profit: ₹150,251',
+        'Total ROI: 334.41%',
+    ],
+    'sowcalcmonthly_withgraphs.py': [
+        'Total Crossings Done: 354',
+        'Animals Remaining in Shed: 565',
+        'Initial Investment (Capital + Working Capital): ₹6,908,619',
+        'Break-even Month (incl. capital): 46',
+        'Average Monthly Profit: ₹184,626',
+        'Total Interest Paid Over Loan Tenure (approx): ₹1,350,803',
+        'ROI : 45.98%',
+        'Realized CAGR (annualized): -3.68%',
+    ],
+}
+
+
+@pytest.fixture(autouse=True)
+def result_store(tmp_path, monkeypatch):
+    monkeypatch.setenv('SOW_RESULT_STORE', str(tmp_path / 'results'))
+    st.cache_data.clear()
+    st.cache_resource.clear()
+
+
+def _run(name):
+    at = AppTest.from_file(os.path.join(ROOT, name), default_timeout=60).run()
+    assert not at.exception, [e.value for e in at.exception]
+    return [m.value for m in at.markdown]
+
+
+@pytest.mark.parametrize('name', sorted(APP_KPIS))
+def test_app_displays_original_kpis(name):
+    shown = _run(name)
+    for line in APP_KPIS[name]:
+        assert line in shown
+
+
+def test_basic_app_runs():
+    _run('basic_sow_calculator.py')
+
+
+def test_graphs_app_kpis_survive_the_result_store():
+    _run('sowcalcmonthly_withgraphs.py')
+    st.cache_data.clear()
+    st.cache_resource.clear()
+    shown = _run('sowcalcmonthly_withgraphs.py')
+    assert 'Stored scenarios: 1' in shown
+    for line in APP_KPIS['sowcalcmonthly_withgraphs.py']:
+        assert line in shown
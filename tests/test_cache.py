@@ -0,0 +1,58 @@
+import numpy as np
+
+from sow_engine.cache import LRUCache, params_key
+
+
+def test_least_recently_used_is_evicted_first():
+    cache = LRUCache(maxsize=2)
+    cache.put('a', 1)
+    cache.put('b', 2)
+    assert cache.get('a') == 1  # 'b' is now the oldest
+    cache.put('c', 3)
+    assert 'b' not in cache
+    assert 'a' in cache and 'c' in cache
+    cache.put('a', 10)  # refreshing a key does not evict
+    assert len(cache) == 2 and cache.evictions == 1
+
+
+def test_counters():
+    cache = LRUCache(maxsize=1)
+    assert cache.get('x', 'missing') == 'missing'
+    assert cache.get_or_compute('x', lambda: 1) == 1
+    assert cache.get_or_compute('x', lambda: 2) == 1
+    cache.put('y', 2)
+    assert cache.stats() == {'hits': 1, 'misses': 2, 'evictions': 1, 'size': 1, 'maxsize': 1}
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_key_ignores_order_and_number_spelling():
+    a = params_key({'total_sows': 30, 'fcr': 3.1, 'months': 60})
+    assert a == params_key({'months': 60.0, 'fcr': 3.1, 'total_sows': np.int64(30)})
+    assert a == params_key({'total_sows': np.float32(30), 'fcr': np.float64(3.1), 'months': 60})
+    assert a != params_key({'total_sows': 31, 'fcr': 3.1, 'months': 60})
+    assert a != params_key({'total_sows': 30, 'fcr': 3.1, 'months': 60}, namespace='other')
+
+
+def test_key_distinguishes_nested_values():
+    assert params_key({'policy': [1, 2]}) == params_key({'policy': (1.0, 2.0)})
+    assert params_key({'policy': [1, 2]}) != params_key({'policy': [2, 1]})
+    assert params_key({'flag': True}) != params_key({'flag': 1})
+
+
+def test_only_the_changed_scenario_is_recomputed():
+    cache = LRUCache(maxsize=8)
+    calls = []
+
+    def items(scenarios):
+        return [(params_key(s), lambda s=s: calls.append(s) or s['sale_price']) for s in scenarios]
+
+    scenarios = [{'sale_price': 160}, {'sale_price': 180}, {'sale_price': 200}]
+    assert cache.get_or_compute_many(items(scenarios)) == [160, 180, 200]
+    assert len(calls) == 3
+
+    calls.clear()
+    scenarios[1] = {'sale_price': 190}
+    assert cache.get_or_compute_many(items(scenarios)) == [160, 190, 200]
+    assert calls == [{'sale_price': 190}]
+    assert cache.hits == 2 and cache.misses == 4
@@ -0,0 +1,33 @@
+import numpy as np
+import pandas as pd
+
+from sow_engine.chartdata import chart_frame
+
+
+def _months(n):
+    month = np.arange(1, n + 1)
+    return pd.DataFrame({'Month': month, 'Revenue': month * 10.0, 'Cumulative_Cash_Flow': month * 100.4})
+
+
+def test_short_horizon_is_sent_month_by_month():
+    df = _months(12)
+    chart = chart_frame(df, ['Revenue'], ['Cumulative_Cash_Flow'], max_points=12)
+    assert chart['Month'].tolist() == list(range(1, 13))
+    assert chart['Revenue'].tolist() == df['Revenue'].astype(int).tolist()
+    assert chart['Cumulative_Cash_Flow'].tolist() == np.round(df['Cumulative_Cash_Flow']).astype(int).tolist()
+
+
+def test_long_horizon_is_bucketed_with_a_ragged_last_bucket():
+    # 10 months into at most 4 points: buckets of 3, 3, 3 and 1 months
+    chart = chart_frame(_months(10), ['Revenue'], ['Cumulative_Cash_Flow'], max_points=4)
+    assert chart['Month'].tolist() == [1, 4, 7, 10]
+    assert chart['Revenue'].tolist() == [20, 50, 80, 100]  # mean of each bucket's flows
+    assert chart['Cumulative_Cash_Flow'].tolist() == [301, 602, 904, 1004]  # last month of each bucket
+    assert chart['Revenue'].dtype == np.int64
+
+
+def test_app_horizons_stay_within_max_points():
+    chart = chart_frame(_months(1200), ['Revenue'], ['Cumulative_Cash_Flow'])
+    assert len(chart) == 120
+    assert chart['Month'].iloc[-1] == 1191
+    assert chart['Cumulative_Cash_Flow'].iloc[-1] == round(1200 * 100.4)
@@ -0,0 +1,11 @@
+from sow_engine import cohort, goalseek
+from sow_engine.cache import LRUCache
+from sow_engine.kpis import compute_kpis
+
+
+def test_goal_seek_survives_eviction_from_a_tiny_cache(monkeypatch):
+    monkeypatch.setattr(goalseek, '_EVAL_CACHE', LRUCache(maxsize=1))
+    result = goalseek.goal_seek('sale_price', 36, kpi='break_even_month')
+    assert result.status == 'solved'
+    r = cohort.simulate_arrays(60, sale_price=result.value)
+    assert compute_kpis(r, 60)['break_even_month'] <= 36
@@ -0,0 +1,23 @@
+import pytest
+
+from sow_engine import cohort, monthly_kpi
+from sow_engine.kpis import compute_kpis
+
+# monthly_kpi with the cohort engine's loan, so both run the same scenario
+PARAMS = dict(loan_amount=0, interest_rate=0.1, months=60)
+
+
+def test_kpis_follow_the_graphs_app_definitions():
+    months = PARAMS['months']
+    arrays = cohort.simulate_arrays(**PARAMS)
+    kpis = compute_kpis(arrays, months)
+    app = monthly_kpi.sow_rotation_simulator(**PARAMS)
+    (_, _, _, _, first_sale_cash_needed, _, _, _, cumulative_cash_flow, _, break_even_month, _,
+     average_monthly_profit, _, _, _, roi_cash_pct, realized_cagr) = app
+
+    assert kpis['first_sale_cash_needed'] == pytest.approx(first_sale_cash_needed)
+    assert kpis['final_cumulative_cash_flow'] == pytest.approx(cumulative_cash_flow[-1])
+    assert kpis['break_even_month'] == break_even_month
+    assert kpis['average_monthly_profit'] == pytest.approx(average_monthly_profit)
+    assert kpis['roi_cash_pct'] == pytest.approx(roi_cash_pct)
+    assert kpis['realized_cagr'] == pytest.approx(realized_cagr)
@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from sow_engine.loans import SCHEDULE_COLUMNS, amortization_schedule, emi, tranche_schedule
+
+
+def reference_schedule(principal, annual_rate, tenure_months, months, moratorium_months=0,
+                       capitalize=False, start_month=1, prepayments=None):
+    """Month-by-month loan, written as plainly as possible."""
+    rate = annual_rate / 12
+    tenure = max(tenure_months, 1)
+    moratorium = min(moratorium_months, tenure - 1)
+    tol = 1e-9 * max(principal, 1.0)
+    out = {name: np.zeros(months) for name in SCHEDULE_COLUMNS}
+    balance, level = principal, 0.0
+    for age in range(1, months - start_month + 2):
+        month = start_month + age - 1
+        if age == moratorium + 1:
+            level = float(emi(balance, rate, tenure - moratorium))
+        if balance <= 0:
+            continue
+        interest = balance * rate
+        owed = balance + interest
+        if age <= moratorium:
+            scheduled = 0.0 if capitalize else interest
+        elif age <= tenure:
+            scheduled = level
+        else:
+            scheduled = 0.0
+        scheduled = min(scheduled, owed)
+        extra = prepayments[month - 1] if prepayments is not None else 0.0
+        prepayment = min(extra, owed - scheduled)
+        payment = scheduled + prepayment
+        balance = max(owed - payment, 0.0)
+        if balance <= tol:
+            balance = 0.0
+        row = dict(payment=payment, interest=interest, principal=payment - interest,
+                   prepayment=prepayment, balance=balance)
+        for name, value in row.items():
+            out[name][month - 1] = value
+    return out
+
+
+PREPAY = np.zeros(60)
+PREPAY[[11, 23, 24]] = [300_000, 500_000, 2_000_000]
+
+CASES = {
+    'plain': dict(principal=4e6, annual_rate=0.121, tenure_months=60, months=72),
+    'moratorium_paid': dict(principal=4e6, annual_rate=0.121, tenure_months=60, months=72, moratorium_months=6),
+    'moratorium_capitalized': dict(principal=4e6, annual_rate=0.121, tenure_months=60, months=72,
+                                   moratorium_months=6, capitalize=True),
+    'prepayments': dict(principal=2e6, annual_rate=0.1, tenure_months=48, months=60, moratorium_months=3,
+                        prepayments=PREPAY),
+    'start_month': dict(principal=1e6, annual_rate=0.09, tenure_months=24, months=36, start_month=7),
+    'start_month_prepayments': dict(principal=2e6, annual_rate=0.1, tenure_months=36, months=60,
+                                    start_month=10, prepayments=PREPAY),
+    'zero_rate': dict(principal=1.2e6, annual_rate=0.0, tenure_months=24, months=36, moratorium_months=4),
+    'moratorium_beyond_tenure': dict(principal=1e6, annual_rate=0.1, tenure_months=12, months=24,
+                                     moratorium_months=30),
+    'moratorium_beyond_horizon': dict(principal=1e6, annual_rate=0.1, tenure_months=60, months=24,
+                                      moratorium_months=30, capitalize=True),
+    'no_loan': dict(principal=0, annual_rate=0.1, tenure_months=60, months=24),
+}
+
+
+@pytest.mark.parametrize('case', sorted(CASES))
+def test_closed_form_matches_month_loop(case):
+    fast = amortization_schedule(**CASES[case])
+    slow = reference_schedule(**CASES[case])
+    for name in SCHEDULE_COLUMNS:
+        np.testing.assert_allclose(fast[name], slow[name], rtol=1e-9, atol=1e-4, err_msg=name)
+
+
+def test_loan_is_repaid_within_tenure():
+    schedule = amortization_schedule(4e6, 0.121, 60, 72, moratorium_months=6, capitalize=True)
+    assert schedule['balance'][59] == 0
+    # capitalized interest shows up as negative principal and is repaid with the rest
+    assert (schedule['principal'][:6] < 0).all()
+    assert schedule['principal'].sum() == pytest.approx(4e6)
+
+
+def test_many_loans_broadcast_like_single_ones():
+    rates = np.array([0.0, 0.08, 0.121])
+    many = amortization_schedule(2e6, rates, 48, 60, moratorium_months=[[0], [6]])
+    for i, moratorium in enumerate([0, 6]):
+        for j, rate in enumerate(rates):
+            single = amortization_schedule(2e6, rate, 48, 60, moratorium_months=moratorium)
+            np.testing.assert_allclose(many['payment'][i, j], single['payment'])
+
+
+def test_tranches_add_up():
+    tranches = [dict(principal=1e6, annual_rate=0.1, tenure_months=24),
+                dict(principal=5e5, annual_rate=0.12, tenure_months=36, start_month=13)]
+    total = tranche_schedule(tranches, 48)
+    parts = [amortization_schedule(months=48, **t) for t in tranches]
+    np.testing.assert_allclose(total['payment'], parts[0]['payment'] + parts[1]['payment'])
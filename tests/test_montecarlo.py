@@ -0,0 +1,31 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sow_engine.montecarlo import monte_carlo
+
+
+@pytest.fixture(scope='module')
+def reference():
+    return monte_carlo(n_replications=250, seed=3, chunk_size=250, workers=1, months=36)
+
+
+@pytest.mark.parametrize('chunk_size', [1, 37, 100, 250, 1_000])
+@pytest.mark.parametrize('workers', [1, 2])
+def test_replications_are_reproducible_and_chunk_independent(reference, chunk_size, workers):
+    result = monte_carlo(n_replications=250, seed=3, chunk_size=chunk_size, workers=workers, months=36)
+    assert result.cumulative_cash_flow.shape == (250, 36)
+    np.testing.assert_array_equal(result.cumulative_cash_flow, reference.cumulative_cash_flow)
+    pd.testing.assert_frame_equal(result.kpis, reference.kpis)
+    assert result.prob_no_break_even == reference.prob_no_break_even
+
+
+def test_seed_changes_the_samples(reference):
+    other = monte_carlo(n_replications=250, seed=4, chunk_size=250, workers=1, months=36)
+    assert not np.array_equal(other.cumulative_cash_flow, reference.cumulative_cash_flow)
+
+
+@pytest.mark.parametrize('n', [0, -1])
+def test_needs_at_least_one_replication(n):
+    with pytest.raises(ValueError, match='n_replications'):
+        monte_carlo(n_replications=n)
@@ -0,0 +1,25 @@
+import numpy as np
+import pytest
+
+from sow_engine import cohort, parity
+
+FLAT_HERD = dict(cull_rates=(0.0,) * 8, litter_factors=(1.0,) * 8, sow_mortality=0.0)
+
+
+@pytest.mark.parametrize('months', [60, 120])
+def test_no_culling_reproduces_flat_model(months):
+    flat = cohort.sow_rotation_simulator(months=months)
+    herd = parity.sow_rotation_simulator(months=months, herd_model=FLAT_HERD)
+    for name in ('Sows_Crossed', 'Sold_Pigs', 'Cumulative_Cash_Flow'):
+        np.testing.assert_allclose(herd[0][name], flat[0][name], rtol=1e-9, atol=1e-6)
+
+
+def test_last_parity_cull_rate_is_honoured():
+    kept = parity.herd_frame(120, herd_model=dict(cull_rates=(0.1,) * 8))
+    culled = parity.herd_frame(120, herd_model=dict(cull_rates=(0.1,) * 7 + (1.0,)))
+    assert kept['Parity_8'].iloc[-1] > culled['Parity_8'].iloc[-1]
+
+
+def test_herd_size_is_constant():
+    states, _, _ = parity.herd_projection(120)
+    np.testing.assert_allclose(states.sum(axis=1), 1.0)
@@ -0,0 +1,28 @@
+import numpy as np
+
+from sow_engine.cohort import DEFAULT_PARAMS, simulate_arrays
+from sow_engine.loans import amortization_schedule
+from sow_engine.portfolio import farm_frame, simulate_portfolio
+
+FARMS = {'farm': ['a', 'b'], 'start_month': [1, 4], 'loan_amount': [0, 2e6],
+         'interest_rate': [0.1, 0.12], 'moratorium_months': [0, 6]}
+
+
+def test_farms_land_on_their_start_month_with_their_loan():
+    result = simulate_portfolio(FARMS, months=36, workers=1)
+    b = farm_frame(result, 'b')
+    assert (b.loc[:2, ['Revenue', 'Loan_EMI', 'Loan_Balance']] == 0).all().all()
+
+    solo = simulate_arrays(33, loan_amount=2e6, interest_rate=0.12, moratorium_months=6)
+    loan = amortization_schedule(2e6, 0.12, DEFAULT_PARAMS['loan_tenure_years'] * 12, 33, 6)
+    np.testing.assert_allclose(b['Loan_Interest'].to_numpy()[3:], loan['interest'])
+    np.testing.assert_allclose(b['Loan_Balance'].to_numpy()[3:], loan['balance'])
+    np.testing.assert_allclose(b['Revenue'].to_numpy()[3:], solo['Revenue'])
+
+
+def test_workers_match_in_process_and_consolidate():
+    serial = simulate_portfolio(FARMS, months=36, workers=1)
+    pooled = simulate_portfolio(FARMS, months=36, workers=2, chunk_size=1)
+    for name, values in serial.per_farm.items():
+        np.testing.assert_allclose(pooled.per_farm[name], values)
+    np.testing.assert_allclose(serial.consolidated['Revenue'], serial.per_farm['Revenue'].sum(axis=0))
@@ -0,0 +1,84 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sow_engine import cohort, monthly_kpi
+from sow_engine.runner import engine_defaults, run_chunk, run_file
+
+ROWS = [
+    {'sale_price': 190, 'fcr': 3.0},
+    {'total_sows': 60, 'loan_amount': 1_000_000, 'moratorium_months': 6},
+    {'interest_rate': 0.09, 'months': 36},
+]
+
+
+@pytest.fixture
+def scenarios(tmp_path):
+    path = tmp_path / 'scenarios.csv'
+    pd.DataFrame(ROWS).to_csv(path, index=False)
+    return path
+
+
+def _given(row):
+    row = {k: v for k, v in row.items() if not pd.isna(v)}
+    if 'months' in row:
+        row['months'] = int(row['months'])
+    return row
+
+
+def test_monthly_kpi_engine_uses_its_own_defaults():
+    defaults = engine_defaults('monthly_kpi')
+    assert defaults['loan_amount'] == 4_000_000 and defaults['interest_rate'] == 0.121
+    kpis, _ = run_chunk(pd.DataFrame([{'sale_price': 190}]), engine='monthly_kpi', columns=[])
+    direct = monthly_kpi.result_scalars(monthly_kpi.sow_rotation_simulator(sale_price=190))
+    assert kpis.loc[0, 'loan_amount'] == 4_000_000
+    assert kpis.loc[0, 'break_even_month'] == direct['break_even_month']
+    assert kpis.loc[0, 'roi_cash_pct'] == pytest.approx(direct['roi_cash_pct'])
+
+
+def test_run_file_monthly_kpi_matches_direct_calls(scenarios, tmp_path):
+    out = tmp_path / 'out'
+    assert run_file(str(scenarios), str(out), engine='monthly_kpi', workers=1, chunk_size=2, progress=None) == 3
+    kpis = pd.read_csv(out / 'kpis.csv')
+    monthly = pd.read_csv(out / 'monthly.csv')
+    for i, row in enumerate(pd.DataFrame(ROWS).to_dict('records')):
+        results = monthly_kpi.sow_rotation_simulator(**_given(row))
+        direct = monthly_kpi.result_scalars(results)
+        for name in ('final_cumulative_cash_flow', 'total_interest_paid', 'roi_cash_pct', 'total_crossings'):
+            assert kpis.loc[i, name] == pytest.approx(direct[name]), name
+        got = monthly.loc[monthly['scenario'] == i, 'Cumulative_Cash_Flow'].to_numpy()
+        np.testing.assert_allclose(got, results[0]['Cumulative_Cash_Flow'].to_numpy())
+
+
+def test_run_file_cohort_matches_direct_calls(scenarios, tmp_path):
+    out = tmp_path / 'out'
+    run_file(str(scenarios), str(out), workers=2, chunk_size=2, progress=None)
+    kpis = pd.read_csv(out / 'kpis.csv')
+    monthly = pd.read_csv(out / 'monthly.csv')
+    assert kpis['scenario'].tolist() == [0, 1, 2]
+    for i, row in enumerate(pd.DataFrame(ROWS).to_dict('records')):
+        row = _given(row)
+        df_month = cohort.sow_rotation_simulator(**row)[0]
+        got = monthly[monthly['scenario'] == i]
+        assert len(got) == row.get('months', 60)
+        np.testing.assert_allclose(got['Cumulative_Cash_Flow'].to_numpy(),
+                                   df_month['Cumulative_Cash_Flow'].to_numpy())
+
+
+def test_unknown_parameter_is_rejected():
+    with pytest.raises(ValueError, match='bogus'):
+        run_chunk(pd.DataFrame([{'bogus': 1}]), engine='monthly_kpi')
+
+
+@pytest.mark.parametrize('engine', ['cohort', 'monthly_kpi'])
+def test_columns_keep_one_dtype_across_chunks(engine, tmp_path):
+    path = tmp_path / 'blanks.csv'
+    # the first chunk has blanks, the second does not
+    path.write_text('total_sows,sale_price,fcr,months\n30,190,,\n40,,3,36\n50,200,3.2,24\n60,210,3,24\n')
+    out = tmp_path / 'out'
+    run_file(str(path), str(out), engine=engine, workers=1, chunk_size=2, progress=None)
+    kpis = pd.read_csv(out / 'kpis.csv', dtype=str)
+    assert kpis['total_sows'].tolist() == ['30', '40', '50', '60']
+    assert kpis['sale_price'].tolist() == ['190', '180', '200', '210']
+    assert kpis['fcr'].tolist() == ['3.1', '3.0', '3.2', '3.0']
+    assert kpis['months'].tolist() == ['60', '36', '24', '24']
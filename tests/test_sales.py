@@ -0,0 +1,44 @@
+import numpy as np
+import pytest
+
+from sow_engine import cohort
+from sow_engine.sales import (Capacity, EveryNMonths, MinimumLot, PriceTriggered, SalePolicy, SellAll,
+                              TargetWeight, apply_sale_policy, seasonal_price_index)
+
+
+def test_sell_all_matches_default_model():
+    plain = cohort.sow_rotation_simulator()
+    with_policy = cohort.sow_rotation_simulator(sale_policy=SellAll())
+    np.testing.assert_allclose(with_policy[0]['Cumulative_Cash_Flow'], plain[0]['Cumulative_Cash_Flow'])
+
+
+@pytest.mark.parametrize('policy', [
+    EveryNMonths(2, 13),
+    MinimumLot(200),
+    Capacity(300),
+    PriceTriggered(1.05, seasonal_price_index(60)),
+])
+def test_timing_policies_sell_at_market_weight_by_default(policy):
+    herd = cohort.herd_flow(60, sale_policy=policy)
+    sold = herd['Sold_Pigs'].sum()
+    assert herd['sold_kg'].sum() == pytest.approx(sold * 105)
+
+
+def test_held_pigs_stop_growing_at_max_weight():
+    ready = np.zeros(24)
+    ready[0] = 100.0
+    policy = EveryNMonths(20, first_month=20, growth_kg_per_day=1.0)
+    out = apply_sale_policy(ready, np.zeros(24), policy, np.array([105.0]), np.array([3.0]))
+    assert out['sold'].sum() == pytest.approx(100.0)
+    assert out['sold_kg'].sum() == pytest.approx(100.0 * policy.max_weight_kg)
+    assert out['extra_feed_kg'].sum() == pytest.approx(100.0 * (policy.max_weight_kg - 105) * 3.0)
+
+
+def test_target_weight_grows_to_target():
+    herd = cohort.herd_flow(60, sale_policy=TargetWeight(126))
+    assert herd['sold_kg'].sum() / herd['Sold_Pigs'].sum() == pytest.approx(126, abs=1e-6)
+
+
+def test_policies_must_define_sell():
+    with pytest.raises(TypeError):
+        SalePolicy()
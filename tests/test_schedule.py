@@ -0,0 +1,24 @@
+import numpy as np
+
+from sow_engine.schedule import optimize_schedule, schedule_grid
+
+CANDIDATES = schedule_grid(30, start_months=[2, 4], intervals=[1, 2, 3], batch_sizes=[2, 4, 6, 8])
+
+
+def test_empty_candidates_give_no_best_schedule():
+    result = optimize_schedule(candidates=CANDIDATES.iloc[:0])
+    assert result.best is None
+    assert result.candidates.empty and 'npv' in result.candidates.columns
+    assert result.pruned == {'sows': 0, 'pen_capacity': 0, 'cash_limit': 0}
+
+
+def test_pen_capacity_prune_keeps_metrics_of_survivors():
+    free = optimize_schedule(candidates=CANDIDATES, chunk_size=7).candidates
+    capacity = float(np.nanmedian(free['peak_growers']))
+    capped = optimize_schedule(candidates=CANDIDATES, pen_capacity=capacity, chunk_size=7)
+    table = capped.candidates
+    fits = table['peak_growers'] <= capacity
+    assert capped.pruned['pen_capacity'] == int((free['peak_growers'] > capacity).sum())
+    np.testing.assert_allclose(table.loc[fits, 'npv'], free.loc[fits, 'npv'])
+    assert table.loc[~fits, 'npv'].isna().all()
+    assert capped.best['peak_growers'] <= capacity
@@ -0,0 +1,41 @@
+import pandas as pd
+import pytest
+
+from sow_engine.batch import simulate_batch
+from sow_engine.cohort import DEFAULT_PARAMS
+from sow_engine.sensitivity import COUNT_PARAMS, SENSITIVITY_OUTPUTS, sensitivity, tornado_data
+
+PARAMS = {'months': 72, 'loan_amount': 2e6, 'moratorium_months': 6, 'n_workers': 2}
+
+
+@pytest.fixture(scope='module')
+def table():
+    return sensitivity(PARAMS)
+
+
+def test_base_row_matches_simulate_batch(table):
+    base = {**DEFAULT_PARAMS, **PARAMS}
+    months = base.pop('months')
+    kpis = simulate_batch(pd.DataFrame([base]), months, columns=[]).kpis.iloc[0]
+    for output in SENSITIVITY_OUTPUTS:
+        assert (table[f'{output}_base'] == kpis[output]).all()
+
+
+def test_counts_move_by_whole_units(table):
+    counts = table.loc[table.index.intersection(COUNT_PARAMS)]
+    assert len(counts) == 7
+    for side in ('low_value', 'high_value'):
+        assert (counts[side] == counts[side].round()).all()
+        assert (counts[side] != counts['base_value']).all()
+    assert tuple(table.loc['n_workers', ['low_value', 'high_value']]) == (1, 3)
+    assert tuple(table.loc['moratorium_months', ['low_value', 'high_value']]) == (5, 7)
+
+
+def test_tornado_orders_parameters_by_swing(table):
+    output = 'roi_cash_pct'
+    data = tornado_data(table, output)
+    swing = (table[f'{output}_high'] - table[f'{output}_low']).abs().sort_values(ascending=False, kind='stable')
+    assert list(dict.fromkeys(data['parameter'])) == list(swing.index)
+    low = data[data['case'] == '-10%'].set_index('parameter')
+    assert low.loc['sale_price', 'change'] == pytest.approx(
+        table.loc['sale_price', f'{output}_low'] - table.loc['sale_price', f'{output}_base'])
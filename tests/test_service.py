@@ -0,0 +1,90 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from sow_engine import cohort, monthly_kpi
+from sow_engine.service import SimulationService, simulation_request
+
+
+def _run(coro_fn):
+    async def main():
+        service = SimulationService(workers=2, executor=ThreadPoolExecutor(2))
+        try:
+            return await coro_fn(service)
+        finally:
+            service.close()
+    return asyncio.run(main())
+
+
+def _post(service, request):
+    async def call():
+        status, payload = await service.dispatch('POST', '/simulate', json.dumps(request).encode())
+        return status, json.loads(payload) if isinstance(payload, bytes) else payload
+    return call()
+
+
+def test_monthly_kpi_request_matches_direct_call():
+    status, body = _run(lambda service: _post(service, {'engine': 'monthly_kpi', 'columns': []}))
+    direct = monthly_kpi.result_scalars(monthly_kpi.sow_rotation_simulator())
+    assert status == 200
+    assert body['params']['loan_amount'] == 4_000_000
+    assert body['kpis']['break_even_month'] == direct['break_even_month']
+    assert body['kpis']['roi_cash_pct'] == pytest.approx(direct['roi_cash_pct'])
+
+
+def test_cohort_request_matches_direct_call():
+    request = {'params': {'sale_price': 190, 'total_sows': 60}, 'months': 36, 'columns': ['Cumulative_Cash_Flow']}
+    status, body = _run(lambda service: _post(service, request))
+    df_month = cohort.sow_rotation_simulator(sale_price=190, total_sows=60, months=36)[0]
+    assert status == 200
+    assert body['monthly']['Cumulative_Cash_Flow'] == pytest.approx(df_month['Cumulative_Cash_Flow'].tolist())
+
+
+def test_identical_concurrent_requests_are_computed_once():
+    async def burst(service):
+        responses = await asyncio.gather(*(_post(service, {'params': {'fcr': 2.9}, 'columns': []}) for _ in range(5)))
+        await _post(service, {'params': {'fcr': 2.9}, 'columns': []})
+        return responses, service.stats()
+
+    responses, stats = _run(burst)
+    assert all(status == 200 for status, _ in responses)
+    assert stats['computed'] == 1 and stats['coalesced'] == 4 and stats['cache']['hits'] == 1
+
+
+@pytest.mark.parametrize('request_body', [
+    {'params': {'total_sows': -5}},
+    {'params': {'piglet_mortality': 1.5}},
+    {'params': {'fcr': 'x'}},
+    {'params': {'bogus': 1}},
+    {'months': 0},
+    {'engine': 'nope'},
+])
+def test_invalid_requests_are_rejected(request_body):
+    status, body = _run(lambda service: _post(service, request_body))
+    assert status == 400 and 'error' in body
+
+
+def test_query_string_keeps_integers():
+    _, _, _, params, _, _ = simulation_request({'total_sows': '60', 'fcr': '2.9'}, flat=True)
+    assert params['total_sows'] == 60 and isinstance(params['total_sows'], int)
+    assert params['fcr'] == 2.9
+
+
+def test_http_round_trip():
+    async def round_trip(service):
+        server = await asyncio.start_server(service.handle, '127.0.0.1', 0)
+        async with server:
+            port = server.sockets[0].getsockname()[1]
+            reader, writer = await asyncio.open_connection('127.0.0.1', port)
+            writer.write(b'GET /simulate?sale_price=190&columns= HTTP/1.1\r\nHost: x\r\nConnection: close\r\n\r\n')
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+        head, _, body = response.partition(b'\r\n\r\n')
+        return head, json.loads(body)
+
+    head, body = _run(round_trip)
+    assert head.startswith(b'HTTP/1.1 200')
+    assert body['params']['sale_price'] == 190 and body['monthly'] == {}
@@ -0,0 +1,54 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from sow_engine import monthly_kpi
+from sow_engine.batch import parameter_grid, simulate_batch
+from sow_engine.store import ResultStore
+
+PARAMS = {'total_sows': 40, 'sale_price': 185, 'months': 36}
+
+
+@pytest.fixture
+def store(tmp_path):
+    store = ResultStore(tmp_path / 'results')
+    yield store
+    store.close()
+
+
+def test_monthly_kpi_round_trip(store):
+    results = monthly_kpi.sow_rotation_simulator(**PARAMS)
+    store.put(PARAMS, results[0], monthly_kpi.result_scalars(results), namespace='withgraphs')
+    df_month, scalars = store.get(PARAMS, namespace='withgraphs')
+    pd.testing.assert_frame_equal(df_month, results[0], check_dtype=False)
+
+    reloaded = monthly_kpi.results_from_frame(df_month, scalars)
+    for fresh, stored in zip(results[2:], reloaded[2:]):
+        if isinstance(fresh, np.ndarray):
+            np.testing.assert_allclose(stored, fresh)
+        else:
+            assert stored == pytest.approx(fresh)
+            assert isinstance(stored, int) == isinstance(fresh, (int, np.integer))
+
+
+def test_batch_round_trip_and_query(store):
+    result = simulate_batch(parameter_grid(sale_price=[160, 200]), months=48)
+    keys = store.put_batch(result, months=48)
+    df_month, scalars = store.get_key(keys[1])
+    np.testing.assert_allclose(df_month['Cumulative_Cash_Flow'], result.monthly['Cumulative_Cash_Flow'][1])
+    assert scalars['break_even_month'] == result.kpis['break_even_month'].iloc[1]
+    found = store.query('final_cumulative_cash_flow > ?', [result.kpis['final_cumulative_cash_flow'].iloc[0]])
+    assert found['key'].tolist() == [keys[1]]
+
+
+def test_other_model_version_is_invalidated(tmp_path):
+    results = monthly_kpi.sow_rotation_simulator(**PARAMS)
+    old = ResultStore(tmp_path / 'results', model_version=1)
+    old.put(PARAMS, results[0], monthly_kpi.result_scalars(results))
+    old.close()
+
+    current = ResultStore(tmp_path / 'results', model_version=2)
+    assert current.get(PARAMS) is None
+    assert len(current) == 0
+    assert list((tmp_path / 'results' / 'arrays').iterdir()) == []
+    current.close()
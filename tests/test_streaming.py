@@ -0,0 +1,23 @@
+import pandas as pd
+import pytest
+
+from sow_engine import monthly, monthly_kpi
+from sow_engine.streaming import collect
+
+
+@pytest.mark.parametrize('module', [monthly, monthly_kpi])
+@pytest.mark.parametrize('chunk_months', [1, 7, 30, 500])
+def test_chunks_cover_every_month_once(module, chunk_months):
+    chunks, _ = collect(module.iter_monthly_chunks(months=30, chunk_months=chunk_months))
+    assert [len(chunk['Month']) for chunk in chunks][:-1] == [chunk_months] * (len(chunks) - 1)
+    months = pd.concat([pd.Series(chunk['Month']) for chunk in chunks], ignore_index=True)
+    assert months.tolist() == list(range(1, 31))
+
+
+@pytest.mark.parametrize('module', [monthly, monthly_kpi])
+@pytest.mark.parametrize('chunk_months', [0, -12])
+def test_chunk_months_must_be_positive(module, chunk_months):
+    with pytest.raises(ValueError, match='chunk_months'):
+        next(module.iter_monthly_chunks(months=30, chunk_months=chunk_months))
+    with pytest.raises(ValueError, match='chunk_months'):
+        next(module.iter_monthly_records(months=30, chunk_months=chunk_months))
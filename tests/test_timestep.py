@@ -0,0 +1,47 @@
+import numpy as np
+import pytest
+
+from sow_engine import cohort, timestep
+
+# Head counts and money that the daily steps book in the same month as the monthly engine
+SAME_MONTH = ('Sows_Crossed', 'Sold_Pigs', 'Revenue', 'Sow_Feed_Cost', 'Staff_Cost', 'Loan_EMI')
+SAME_TOTALS = ('total_pigs_sold', 'total_pigs_born', 'animals_left')
+
+
+@pytest.mark.parametrize('months', [24, 60, 120])
+def test_daily_roll_up_matches_monthly_timetable(months):
+    monthly = cohort.simulate_arrays(months)
+    daily = timestep.simulate_arrays(months, 'day')
+    for name in SAME_MONTH + SAME_TOTALS:
+        np.testing.assert_allclose(daily[name], monthly[name], rtol=1e-6, atol=1e-3, err_msg=name)
+
+
+@pytest.mark.parametrize('months', [24, 60, 120])
+def test_daily_cash_gap_is_the_later_grower_feed(months):
+    monthly = cohort.simulate_arrays(months)
+    daily = timestep.simulate_arrays(months, 'day')
+    feed_gap = monthly['Grower_Feed_Cost'].sum() - daily['Grower_Feed_Cost'].sum()
+    cash_gap = daily['final_cumulative_cash_flow'] - monthly['final_cumulative_cash_flow']
+    assert cash_gap == pytest.approx(feed_gap, rel=1e-5)
+    # about half a month of grower feed for the standing herd, whatever the horizon
+    assert cash_gap == pytest.approx(242_500, rel=0.01)
+
+
+def test_weekly_roll_up_stays_close_to_monthly():
+    monthly = cohort.simulate_arrays(60)
+    weekly = timestep.simulate_arrays(60, 'week')
+    for name in ('Sows_Crossed', 'Sold_Pigs', 'Revenue', 'Grower_Feed_Cost'):
+        assert weekly[name].sum() == pytest.approx(monthly[name].sum(), rel=0.01), name
+    assert weekly['final_cumulative_cash_flow'] == pytest.approx(monthly['final_cumulative_cash_flow'], rel=0.05)
+
+
+def test_shorter_stages_sell_earlier():
+    default = timestep.simulate_arrays(36, 'week')
+    batch = timestep.simulate_arrays(36, 'week', stage_days=dict(gestation_days=114, lactation_days=28,
+                                                                 growing_days=154))
+    assert np.argmax(batch['Sold_Pigs'] > 0) < np.argmax(default['Sold_Pigs'] > 0)
+
+
+def test_unknown_step_is_rejected():
+    with pytest.raises(ValueError, match='step'):
+        timestep.simulate_arrays(12, 'hour')
@@ -0,0 +1,61 @@
+import threading
+import time
+
+from sow_engine.cache import LRUCache
+from sow_engine.timing import PhaseTimer, phase, timed
+
+
+@timed('work')
+def _work():
+    time.sleep(0.001)
+
+
+def test_phases_are_recorded_only_while_active():
+    _work()
+    timer = PhaseTimer()
+    with timer, timer.phase('run'):
+        with phase('inner'):
+            _work()
+        _work()
+    _work()
+    assert [(name, depth) for name, _, _, depth, _ in timer.events] == [
+        ('work', 2), ('inner', 1), ('work', 1), ('run', 0)]
+
+
+def test_summary_and_chrome_trace():
+    timer = PhaseTimer()
+    with timer, timer.phase('run'):
+        _work()
+        _work()
+    table = timer.summary()
+    assert list(table.index) == ['run', 'work']
+    assert table.loc['work', 'calls'] == 2 and table.loc['work', 'depth'] == 1
+    assert table.loc['run', 'share_pct'] == 100
+    assert table.loc['work', 'total_ms'] <= table.loc['run', 'total_ms']
+
+    events = timer.chrome_trace()['traceEvents']
+    assert [e['name'] for e in events] == ['work', 'work', 'run']
+    assert all(e['ph'] == 'X' and e['dur'] > 0 for e in events)
+    run = events[-1]
+    assert all(run['ts'] <= e['ts'] and e['ts'] + e['dur'] <= run['ts'] + run['dur'] for e in events)
+
+
+def test_pool_workers_record_at_their_submitting_depth():
+    timer = PhaseTimer()
+    barrier = threading.Barrier(3)
+
+    def compute(i):
+        barrier.wait()  # all workers inside their phases at once
+        with phase('scenario'):
+            _work()
+        return i
+
+    cache = LRUCache()
+    with timer, timer.phase('comparison'):
+        assert cache.get_or_compute_many([(i, lambda i=i: compute(i)) for i in range(3)]) == [0, 1, 2]
+
+    depths = {}
+    for name, _, _, depth, thread in timer.events:
+        depths.setdefault(name, set()).add(depth)
+    assert depths == {'comparison': {0}, 'scenario': {1}, 'work': {2}}
+    assert len({thread for name, *_, thread in timer.events if name == 'scenario'}) == 3